@@ -0,0 +1,53 @@
+"""
+Exports companies, analytics and ratios in a columnar format, e.g. for an
+offline analysis: export-ratios --format parquet ratios.parquet
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+
+from dishka import make_async_container
+
+from src.companies.db.daos import CompanyDAO
+from src.companies.schemas import get_ratios_arrow_schema
+from src.core.db.sessions import DBSession
+from src.core.schemas import ColumnarFormat
+from src.core.utils.exports import to_columnar
+from src.core.utils.paginators import Query
+from src.main import get_prod_deps
+
+
+async def export_ratios(path: Path, format_: ColumnarFormat) -> None:
+    container = make_async_container(*get_prod_deps())
+    try:
+        company_dao = await container.get(CompanyDAO[DBSession, Query])
+        async with container() as sub_container:
+            session = await sub_container.get(DBSession)
+            with path.open("wb") as file:
+                async for chunk in to_columnar(
+                    company_dao.export_ratios(session),
+                    get_ratios_arrow_schema(),
+                    format_,
+                ):
+                    file.write(chunk)
+    finally:
+        await container.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--format",
+        type=ColumnarFormat,
+        choices=tuple(ColumnarFormat),
+        default=ColumnarFormat.PARQUET,
+    )
+    args = parser.parse_args()
+
+    asyncio.run(export_ratios(args.path, args.format))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,80 @@
+import hashlib
 from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Collection,
+    Iterable,
+    Mapping,
+    Sequence,
+)
 from dataclasses import dataclass
-from typing import override
+from decimal import Decimal
+from functools import partial
+from itertools import batched, chain
+from typing import Any, ClassVar, override
 
-from fastcrud import FastCRUD
-from sqlalchemy import Select, select
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import selectinload
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    ColumnExpressionArgument,
+    Integer,
+    Numeric,
+    Row,
+    Select,
+    Text,
+    and_,
+    case,
+    cast,
+    column,
+    func,
+    literal,
+    outerjoin,
+    select,
+    table,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
+from sqlalchemy.orm import load_only, selectinload
 
-from src.companies.db.models import SQLAlchemyCompany
+from src.analytics.db.models import SQLAlchemyAnalytics, SQLAlchemyRatio
+from src.analytics.schemas import Analytics, Deviation, Ratio
+from src.companies.db.models import SQLAlchemyCompany, companies_users
 from src.companies.schemas import (
+    CompaniesSearch,
+    CompaniesWriteSummary,
     CompanyCreate,
+    CompanyFieldset,
+    CompanyKey,
     CompanyRead,
+    CompanyRecord,
+    CompanyRelationship,
     CompanySearch,
+    CompanyUsersSearch,
+    CompanyVersion,
+    UserCompaniesOffsetSearch,
     UserCompaniesSearch,
 )
 from src.core.db.sessions import DBSession, SQLAlchemySession
-from src.core.errors import DBResponseError
 from src.core.schemas import (
     BaseCursorPage,
     BaseOffsetPage,
-    CursorSortingSearch,
+    OrderBy,
+    Schema,
+    Tagged,
+    get_subset,
 )
+from src.core.settings import PaginationSettings
+from src.core.utils.caches import Cache
 from src.core.utils.paginators import (
     DBPaginator,
     Query,
 )
 from src.users.db.models import SQLAlchemyUser
+from src.users.schemas import UserRead
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
@@ -40,6 +89,14 @@ class CompanyDAO[SessionT: DBSession, QueryT: Query](ABC):
     ) -> CompanyRead | None:
         pass
 
+    @abstractmethod
+    async def read_many(
+        self,
+        session: SessionT,
+        companies: Sequence[CompanySearch],
+    ) -> dict[CompanyKey, CompanyRead]:
+        pass
+
     @abstractmethod
     async def write_one(
         self,
@@ -48,59 +105,153 @@ class CompanyDAO[SessionT: DBSession, QueryT: Query](ABC):
     ) -> CompanyRead | None:
         pass
 
+    @abstractmethod
+    async def write_many(
+        self,
+        session: SessionT,
+        companies: Iterable[CompanyCreate],
+    ) -> CompaniesWriteSummary:
+        pass
+
     @abstractmethod
     async def read_by_user(
         self,
         session: SessionT,
         clauses: UserCompaniesSearch,
-    ) -> BaseOffsetPage[CompanyRead]:
+    ) -> BaseCursorPage[Schema]:
+        pass
+
+    @abstractmethod
+    async def read_by_user_offset(
+        self,
+        session: SessionT,
+        clauses: UserCompaniesOffsetSearch,
+    ) -> BaseOffsetPage[Schema]:
         pass
 
     @abstractmethod
     async def read_all(
         self,
         session: SessionT,
-        clauses: CursorSortingSearch,
-    ) -> BaseCursorPage[CompanyRead]:
+        clauses: CompaniesSearch,
+    ) -> BaseCursorPage[Schema]:
+        pass
+
+    @abstractmethod
+    async def read_users(
+        self,
+        session: SessionT,
+        clauses: CompanyUsersSearch,
+    ) -> BaseCursorPage[UserRead] | None:
         pass
 
+    @abstractmethod
+    def export(
+        self,
+        session: SessionT,
+        fieldset: CompanyFieldset,
+    ) -> AsyncIterator[Sequence[Schema]]:
+        """
+        Streams all the companies in batches, so memory does not depend on
+        their number.
+        """
 
-# None is acceptable in accordance with the lib's coding style when the schema
-# is absent or unknown:
-# https://benavlabs.github.io/fastcrud/api/fastcrud/#__span-23-3.
-type CompanyCrud = FastCRUD[  # type: ignore[type-var]
-    SQLAlchemyCompany,
-    CompanyCreate,
-    None,  # pyright: ignore[reportInvalidTypeArguments]
-    None,  # pyright: ignore[reportInvalidTypeArguments]
-    None,  # pyright: ignore[reportInvalidTypeArguments]
-    CompanyRead,
-]
+    @abstractmethod
+    def export_ratios(
+        self,
+        session: SessionT,
+    ) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        """
+        Streams the flat join of companies, analytics and ratios in batches
+        of rows, whose values follow the columns of get_ratios_arrow_schema.
+        """
+
+    @abstractmethod
+    async def read_by_user_json(
+        self,
+        session: SessionT,
+        clauses: UserCompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        """
+        The content is omitted when one of the given tags is still current.
+        """
+
+    @abstractmethod
+    async def read_all_json(
+        self,
+        session: SessionT,
+        clauses: CompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        """
+        The content is omitted when one of the given tags is still current.
+        """
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
 class SQLAlchemyCompanyDAO(
     CompanyDAO[SQLAlchemySession, Select[tuple[SQLAlchemyCompany]]]
 ):
-    _crud: CompanyCrud  # type: ignore[type-var] # None is acceptable in accordance with the lib's coding style when the schema is absent or unknown: https://benavlabs.github.io/fastcrud/api/fastcrud/#__span-23-3.
+    _settings: PaginationSettings
+
+    # Everything except relationships, which are loaded separately (or are
+    # known to be empty for a new company).
+    COLUMNS: ClassVar = (
+        SQLAlchemyCompany.name,
+        SQLAlchemyCompany.brn,
+        SQLAlchemyCompany.country,
+        SQLAlchemyCompany.score,
+        SQLAlchemyCompany.created_at,
+    )
+    # Users are not loaded through the relationship, since a company may be
+    # shared by too many of them: only a preview and a count are read.
+    ANALYTICS_LOADER: ClassVar = selectinload(
+        SQLAlchemyCompany.analytics
+    ).selectinload(SQLAlchemyAnalytics.ratios)
+    # asyncpg limits a query to 32767 params, two of which are taken by each
+    # key.
+    KEYS_PER_QUERY: ClassVar = 10_000
+    STAGING: ClassVar = table(
+        "companies_staging",
+        column("name"),
+        column("brn"),
+        column("country"),
+    )
 
-    @CompanyRead.from_instance_or_none  # type: ignore[arg-type] # MyPy doesn't support CoroutineType properly (unlike Pyright): https://github.com/python/mypy/issues/18635.
     @override
     async def read_one(
         self,
         session: SQLAlchemySession,
         company: CompanySearch,
-    ) -> SQLAlchemyCompany | None:
-        query = (
-            select(SQLAlchemyCompany)
-            .options(selectinload("*"))
-            .where(
-                SQLAlchemyCompany.brn == company.brn,
-                SQLAlchemyCompany.country == str(company.country),
-            )
-        )
+    ) -> CompanyRead | None:
+        found = await self._read(session, self._by_key(company))
 
-        return (await session.execute(query)).scalar_one_or_none()
+        return found[0] if found else None
+
+    @override
+    async def read_many(
+        self,
+        session: SQLAlchemySession,
+        companies: Sequence[CompanySearch],
+    ) -> dict[CompanyKey, CompanyRead]:
+        """
+        Relationships are loaded once for a whole batch of keys, so the number
+        of round trips does not depend on the number of companies.
+        """
+        keys = {(company.brn, str(company.country)) for company in companies}
+        found: dict[CompanyKey, CompanyRead] = {}
+
+        for batch in batched(keys, self.KEYS_PER_QUERY):
+            for company in await self._read(
+                session,
+                tuple_(SQLAlchemyCompany.brn, SQLAlchemyCompany.country).in_(
+                    batch
+                ),
+            ):
+                found[company.brn, company.country] = company
+
+        return found
 
     @CompanyRead.from_instance_or_none  # type: ignore[arg-type] # MyPy doesn't support CoroutineType properly (unlike Pyright): https://github.com/python/mypy/issues/18635.
     @override
@@ -108,64 +259,967 @@ class SQLAlchemyCompanyDAO(
         self,
         session: SQLAlchemySession,
         company: CompanyCreate,
-    ) -> SQLAlchemyCompany | None:
-        created = await self._crud.create(
-            db=session,
-            object=company,
-            commit=False,
+    ) -> dict[str, Any] | None:
+        """
+        Takes a single round trip, as the conflict is resolved by the DB and
+        the result is built from the returned row instead of ORM refreshing.
+        """
+        query = (
+            insert(SQLAlchemyCompany)
+            .values(company.model_dump())
+            .on_conflict_do_nothing(
+                index_elements=(
+                    SQLAlchemyCompany.brn,
+                    SQLAlchemyCompany.country,
+                )
+            )
+            .returning(*self.COLUMNS)
         )
 
-        try:
-            await session.flush()
-        except DBResponseError as exc:
-            if isinstance(exc.original, IntegrityError):
-                return None
-            raise
+        created = (await session.execute(query)).one_or_none()
+        if created is None:
+            return None
 
-        await session.refresh(created)
-        await session.load_all(created)
-        return created
+        return {
+            **created._asdict(),
+            "analytics": [],
+            "users": [],
+            "users_count": 0,
+        }
 
-    @BaseOffsetPage[CompanyRead].from_instance  # type: ignore[arg-type] # MyPy doesn't support CoroutineType properly (unlike Pyright): https://github.com/python/mypy/issues/18635.
     @override
-    async def read_by_user(
+    async def write_many(
         self,
         session: SQLAlchemySession,
-        clauses: UserCompaniesSearch,
-    ) -> BaseOffsetPage[CompanyRead]:
-        query = (
+        companies: Iterable[CompanyCreate],
+    ) -> CompaniesWriteSummary:
+        """
+        COPY cannot resolve conflicts by itself, so companies are loaded into a
+        staging table first and then merged by a single statement.
+        """
+        staging = self.STAGING
+        columns = tuple(staging.columns.keys())
+
+        # Types (including the countries enum) are inherited from the source.
+        await session.execute(
+            text(
+                "CREATE TEMPORARY TABLE companies_staging ON COMMIT DROP AS "
+                "SELECT name, brn, country FROM companies WITH NO DATA"
+            )
+        )
+        copied = await session.copy_records(
+            staging.name,
             (
-                select(SQLAlchemyCompany).where(
-                    SQLAlchemyCompany.users.any(
-                        SQLAlchemyUser.nickname == clauses.user_nickname  # type: ignore[arg-type] # pyright: ignore[reportArgumentType] # A type checkers limitation when dealing with any().
-                    )
+                (company.name, company.brn, str(company.country))
+                for company in companies
+            ),
+            columns=columns,
+        )
+
+        merged = (
+            insert(SQLAlchemyCompany)
+            .from_select(
+                columns,
+                # Duplicates may also be found within the companies themselves.
+                select(staging).distinct(staging.c.brn, staging.c.country),
+            )
+            .on_conflict_do_nothing(
+                index_elements=(
+                    SQLAlchemyCompany.brn,
+                    SQLAlchemyCompany.country,
                 )
-            ).options(selectinload("*"))
-        ).order_by(getattr(SQLAlchemyCompany.score, clauses.order_by)())
+            )
+            .returning(SQLAlchemyCompany.id)
+            .cte()
+        )
+        inserted = (
+            await session.execute(select(func.count()).select_from(merged))
+        ).scalar_one()
+        # Allows to call the method several times within a transaction.
+        await session.execute(text("DROP TABLE companies_staging"))
 
-        return await self._paginator.paginate_offset(
+        return CompaniesWriteSummary(
+            inserted=inserted,
+            duplicates=copied - inserted,
+        )
+
+    @staticmethod
+    def _by_key(
+        company: CompanySearch | CompanyCreate,
+    ) -> ColumnElement[bool]:
+        return and_(
+            SQLAlchemyCompany.brn == company.brn,
+            SQLAlchemyCompany.country == str(company.country),
+        )
+
+    async def _read(
+        self,
+        session: SQLAlchemySession,
+        *clauses: ColumnExpressionArgument[bool],
+    ) -> list[CompanyRead]:
+        """
+        Reads whole companies, whose users are previewed just like in
+        listings.
+        """
+        fieldset = CompanyFieldset()
+        query = (
+            self._select(fieldset)
+            .where(*clauses)
+            # The instances may already be in the identity map, but outdated.
+            .execution_options(populate_existing=True)
+        )
+
+        return await self._hydrate(
+            session,
+            self._get_records(await session.execute(query), fieldset),
+            fieldset,
+            CompanyRead,
+        )
+
+    def _select(self, fieldset: CompanyFieldset) -> Select[Any]:
+        query = select(SQLAlchemyCompany).options(
+            load_only(
+                SQLAlchemyCompany.id,
+                *(
+                    getattr(SQLAlchemyCompany, column)
+                    for column in fieldset.columns
+                ),
+            )
+        )
+        if CompanyRelationship.ANALYTICS in fieldset.include:
+            query = query.options(self.ANALYTICS_LOADER)
+
+        return query
+
+    @staticmethod
+    def _get_record_schema(fieldset: CompanyFieldset) -> type[Schema]:
+        return get_subset(
+            CompanyRecord,
+            fieldset.columns
+            | {"id"}
+            | (fieldset.include & {CompanyRelationship.ANALYTICS}),
+        )
+
+    def _get_records(
+        self, rows: Iterable[Row[Any]], fieldset: CompanyFieldset
+    ) -> list[Schema]:
+        schema = self._get_record_schema(fieldset)
+        return [schema.model_validate(company) for (company,) in rows]
+
+    @staticmethod
+    def _by_user(nickname: str) -> ColumnElement[bool]:
+        return SQLAlchemyCompany.users.any(
+            SQLAlchemyUser.nickname == nickname  # type: ignore[arg-type] # pyright: ignore[reportArgumentType] # A type checkers limitation when dealing with any().
+        )
+
+    async def _paginate_offset(
+        self,
+        session: SQLAlchemySession,
+        query: Select[Any],
+        clauses: UserCompaniesOffsetSearch,
+        **kwargs: Any,
+    ) -> BaseOffsetPage[Schema]:
+        page = await self._paginator.paginate_offset(
             session=session,
             query=query,
             search=clauses,
-            return_schema=CompanyRead,
+            return_schema=self._get_record_schema(clauses),
+            **kwargs,
+        )
+        schema = clauses.get_schema()
+
+        return BaseOffsetPage[schema].model_construct(  # type: ignore[valid-type] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+            **dict(
+                page,
+                items=await self._hydrate(session, page.items, clauses, schema),
+            )
+        )
+
+    async def _paginate_cursor(
+        self,
+        session: SQLAlchemySession,
+        query: Select[Any],
+        clauses: UserCompaniesSearch | CompaniesSearch,
+        **kwargs: Any,
+    ) -> BaseCursorPage[Schema]:
+        page = await self._paginator.paginate_cursor(
+            session=session,
+            query=query,
+            search=clauses,
+            return_schema=self._get_record_schema(clauses),
+            **kwargs,
+        )
+        schema = clauses.get_schema()
+
+        return BaseCursorPage[schema].model_construct(  # type: ignore[valid-type] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+            **dict(
+                page,
+                items=await self._hydrate(session, page.items, clauses, schema),
+            )
+        )
+
+    async def _hydrate[SchemaT: Schema](
+        self,
+        session: SQLAlchemySession,
+        companies: Sequence[Schema],
+        fieldset: CompanyFieldset,
+        schema: type[SchemaT],
+    ) -> list[SchemaT]:
+        """
+        Records come from the DB constraints, so the schemas are constructed
+        without validation.
+        """
+        if not companies:
+            return []
+        records = [dict(company) for company in companies]
+        ids = [record.pop("id") for record in records]
+
+        relationships = await self._read_relationships(session, ids, fieldset)
+        for id_, record in zip(ids, records, strict=True):
+            for field, values in relationships.items():
+                record[field] = values[id_]
+
+        return [
+            schema.model_construct(**record)  # type: ignore[misc] # The Pydantic plugin of MyPy resolves the constructor of a type variable to its bound.
+            for record in records
+        ]
+
+    async def _read_relationships(
+        self,
+        session: SQLAlchemySession,
+        ids: list[int],
+        fieldset: CompanyFieldset,
+    ) -> dict[str, Mapping[int, Any]]:
+        relationships: dict[str, Mapping[int, Any]] = {}
+        if CompanyRelationship.USERS in fieldset.include:
+            (
+                relationships["users_count"],
+                relationships[CompanyRelationship.USERS],
+            ) = await self._read_users(session, ids)
+
+        return relationships
+
+    async def _read_users(
+        self, session: SQLAlchemySession, ids: list[int]
+    ) -> tuple[defaultdict[int, int], defaultdict[int, list[UserRead]]]:
+        """
+        Counts are grouped by the link table alone, while only the first users
+        of each company are read.
+        """
+        links = companies_users.c
+        counts_query = (
+            select(links.companies, func.count())
+            .where(links.companies.in_(ids))
+            .group_by(links.companies)
+        )
+        counts = defaultdict(
+            int, (await session.execute(counts_query)).tuples().all()
         )
 
-    @BaseCursorPage[CompanyRead].from_instance  # type: ignore[arg-type] # MyPy doesn't support CoroutineType properly (unlike Pyright): https://github.com/python/mypy/issues/18635.
+        users: defaultdict[int, list[UserRead]] = defaultdict(list)
+        if not self._settings.users_preview:
+            return counts, users
+
+        ranked = (
+            select(
+                links.companies,
+                *(
+                    SQLAlchemyUser.__table__.c[field]
+                    for field in UserRead.model_fields
+                ),
+                func.row_number()
+                .over(
+                    partition_by=links.companies,
+                    order_by=SQLAlchemyUser.nickname,
+                )
+                .label("position"),
+            )
+            .join(companies_users, links.users == SQLAlchemyUser.id)
+            .where(links.companies.in_(ids))
+            .subquery()
+        )
+        preview_query = (
+            select(
+                ranked.c.companies,
+                *(ranked.c[field] for field in UserRead.model_fields),
+            )
+            .where(ranked.c.position <= self._settings.users_preview)
+            .order_by(ranked.c.companies, ranked.c.position)
+        )
+        for row in await session.execute(preview_query):
+            user = row._asdict()
+            users[user.pop("companies")].append(
+                UserRead.model_construct(**user)
+            )
+
+        return counts, users
+
+    @staticmethod
+    def _score_key() -> ColumnElement[Decimal | None]:
+        """
+        Keyset pagination cannot seek through NULLs, so companies without a
+        score are placed below the lowest possible one.
+        """
+        return func.coalesce(SQLAlchemyCompany.score, -1)
+
+    @classmethod
+    def _by_score(cls, order_by: OrderBy) -> tuple[ColumnElement[Any], ...]:
+        # The ID makes the seek key unique, since the score is not.
+        return (
+            getattr(cls._score_key(), order_by)(),
+            getattr(SQLAlchemyCompany.id, order_by)(),
+        )
+
+    @override
+    async def read_by_user(
+        self,
+        session: SQLAlchemySession,
+        clauses: UserCompaniesSearch,
+    ) -> BaseCursorPage[Schema]:
+        query = (
+            self._select(clauses)
+            .where(self._by_user(clauses.user_nickname))
+            .order_by(*self._by_score(clauses.order_by))
+        )
+
+        return await self._paginate_cursor(session, query, clauses)
+
+    @override
+    async def read_by_user_offset(
+        self,
+        session: SQLAlchemySession,
+        clauses: UserCompaniesOffsetSearch,
+    ) -> BaseOffsetPage[Schema]:
+        query = (
+            self._select(clauses)
+            .where(self._by_user(clauses.user_nickname))
+            .order_by(*self._by_score(clauses.order_by))
+        )
+
+        return await self._paginate_offset(session, query, clauses)
+
     @override
     async def read_all(
         self,
         session: SQLAlchemySession,
-        clauses: CursorSortingSearch,
-    ) -> BaseCursorPage[CompanyRead]:
+        clauses: CompaniesSearch,
+    ) -> BaseCursorPage[Schema]:
+        query = self._select(clauses).order_by(
+            getattr(SQLAlchemyCompany.created_at, clauses.order_by)()
+        )
+
+        # The listing is not filtered, so its total is shared by all users.
+        return await self._paginate_cursor(
+            session, query, clauses, is_total_cached=True
+        )
+
+    @override
+    async def read_users(
+        self,
+        session: SQLAlchemySession,
+        clauses: CompanyUsersSearch,
+    ) -> BaseCursorPage[UserRead] | None:
+        """
+        An empty page may also mean that the company does not exist, which is
+        checked only then.
+        """
+        query = (
+            select(
+                *(
+                    SQLAlchemyUser.__table__.c[field]
+                    for field in UserRead.model_fields
+                )
+            )
+            .join(companies_users, companies_users.c.users == SQLAlchemyUser.id)
+            .join(
+                SQLAlchemyCompany,
+                SQLAlchemyCompany.id == companies_users.c.companies,
+            )
+            .where(self._by_key(clauses))
+            .order_by(SQLAlchemyUser.nickname)
+        )
+        page = await self._paginator.paginate_cursor(
+            session=session, query=query, search=clauses, return_schema=UserRead
+        )
+
+        if not page.items:
+            exists = (
+                await session.execute(
+                    select(SQLAlchemyCompany.id).where(self._by_key(clauses))
+                )
+            ).first()
+            if exists is None:
+                return None
+        return BaseCursorPage[UserRead].model_validate(page)
+
+    @override
+    async def export(
+        self,
+        session: SQLAlchemySession,
+        fieldset: CompanyFieldset,
+    ) -> AsyncIterator[Sequence[Schema]]:
+        """
+        Rows are fetched through a server-side cursor, and relationships are
+        loaded for each fetched batch as for a page.
+        """
+        query = (
+            self._select(fieldset)
+            .order_by(SQLAlchemyCompany.id)
+            .execution_options(yield_per=self._settings.export_size)
+        )
+        schema = fieldset.get_schema()
+
+        async for rows in session.stream_partitions(query):
+            yield await self._hydrate(
+                session, self._get_records(rows, fieldset), fieldset, schema
+            )
+
+    @override
+    async def export_ratios(
+        self,
+        session: SQLAlchemySession,
+    ) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        """
+        Decimals are rounded by the DB to the scale of the columnar type, which
+        rejects lossy conversions.
+        """
         query = (
-            (select(SQLAlchemyCompany))
-            .options(selectinload("*"))
-            .order_by(getattr(SQLAlchemyCompany.created_at, clauses.order_by)())
+            select(
+                SQLAlchemyCompany.brn,
+                cast(SQLAlchemyCompany.country, Text),
+                SQLAlchemyCompany.name,
+                SQLAlchemyCompany.score,
+                SQLAlchemyCompany.created_at,
+                SQLAlchemyAnalytics.name,
+                SQLAlchemyRatio.name,
+                cast(SQLAlchemyRatio.value, Numeric(38, 10)),
+                # Enums are stored by names rather than by values.
+                case(
+                    *(
+                        (SQLAlchemyRatio.deviation == member, member.value)
+                        for member in Deviation
+                    )
+                ),
+            )
+            .outerjoin(
+                SQLAlchemyAnalytics,
+                SQLAlchemyAnalytics.company_id == SQLAlchemyCompany.id,
+            )
+            .outerjoin(
+                SQLAlchemyRatio,
+                SQLAlchemyRatio.analytics_id == SQLAlchemyAnalytics.id,
+            )
+            .order_by(
+                SQLAlchemyCompany.id,
+                SQLAlchemyAnalytics.name,
+                SQLAlchemyRatio.name,
+            )
+            .execution_options(yield_per=self._settings.export_size)
+        )
+
+        async for rows in session.stream_partitions(query):
+            yield rows
+
+    @override
+    async def read_by_user_json(
+        self,
+        session: SQLAlchemySession,
+        clauses: UserCompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        query = (
+            select(SQLAlchemyCompany.id, SQLAlchemyCompany.version)
+            .where(self._by_user(clauses.user_nickname))
+            .order_by(*self._by_score(clauses.order_by))
+        )
+
+        return await self._paginate_json(session, query, clauses, etags)
+
+    @override
+    async def read_all_json(
+        self,
+        session: SQLAlchemySession,
+        clauses: CompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        query = select(
+            SQLAlchemyCompany.id, SQLAlchemyCompany.version
+        ).order_by(getattr(SQLAlchemyCompany.created_at, clauses.order_by)())
+
+        return await self._paginate_json(
+            session, query, clauses, etags, is_total_cached=True
         )
 
-        return await self._paginator.paginate_cursor(
+    async def _paginate_json(
+        self,
+        session: SQLAlchemySession,
+        query: Select[Any],
+        clauses: UserCompaniesSearch | CompaniesSearch,
+        etags: Collection[str],
+        **kwargs: Any,
+    ) -> Tagged:
+        """
+        Only IDs and versions are paginated, while the items are serialized by
+        the DB, so Python neither validates nor encodes them. The tag is
+        derived from the versions, so an unchanged page is not even read.
+        """
+        page = await self._paginator.paginate_cursor(
             session=session,
             query=query,
             search=clauses,
-            return_schema=CompanyRead,
+            return_schema=CompanyVersion,
+            **kwargs,
+        )
+        # The page itself is small, so it is encoded as usual. Only declared
+        # fields are sent, while the paginator may set its own ones.
+        meta = page.model_dump_json(
+            by_alias=True,
+            include=set(BaseCursorPage.model_fields) - {"items"},
+        )
+
+        etag = self._get_etag(clauses, meta, page.items)
+        if Tagged.is_current(etag, etags):
+            return Tagged(etag=etag)
+
+        items = "[]"
+        if page.items:
+            items = (
+                await session.execute(
+                    self._select_json(
+                        [company.id for company in page.items], clauses
+                    )
+                )
+            ).scalar_one()
+
+        return Tagged(
+            etag=etag, content=f'{{"items":{items},{meta[1:]}'.encode()
+        )
+
+    def _get_etag(
+        self,
+        clauses: UserCompaniesSearch | CompaniesSearch,
+        meta: str,
+        companies: Sequence[CompanyVersion],
+    ) -> str:
+        """
+        The content is fully determined by the clauses, the page itself and
+        the versions of its companies.
+        """
+        digest = hashlib.sha1(clauses.model_dump_json().encode())  # noqa: S324 # Is not used for security purposes.
+        digest.update(f"{meta}{self._settings.users_preview}".encode())
+        for company in companies:
+            digest.update(f":{company.id}-{company.version}".encode())
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def _to_json(
+        schema: type[Schema], **fields: ColumnExpressionArgument[Any]
+    ) -> ColumnElement[Any]:
+        """
+        Keys are taken from the schema aliases to be the same as the ones
+        produced by Pydantic.
+        """
+        return func.json_build_object(
+            *chain.from_iterable(
+                (schema.model_fields[field].alias or field, value)
+                for field, value in fields.items()
+            )
+        )
+
+    @staticmethod
+    def _to_json_list(
+        item: ColumnElement[Any], *order_by: ColumnExpressionArgument[Any]
+    ) -> ColumnElement[Any]:
+        return func.coalesce(
+            func.json_agg(aggregate_order_by(item, *order_by)),
+            func.json_build_array(),
         )
+
+    def _select_json(
+        self, ids: list[int], fieldset: CompanyFieldset
+    ) -> Select[tuple[str]]:
+        """
+        Values are formatted as Pydantic does it in JSON mode: decimals are
+        strings, timestamps are in ISO 8601 and enums are values.
+        """
+        users = SQLAlchemyUser.__table__.c
+        links = companies_users.c
+        preview = (
+            select(*(users[field] for field in UserRead.model_fields))
+            .join_from(SQLAlchemyUser, companies_users, links.users == users.id)
+            .where(links.companies == SQLAlchemyCompany.id)
+            .order_by(users.nickname)
+            .limit(self._settings.users_preview)
+            .correlate(SQLAlchemyCompany)
+            .subquery()
+        )
+        counts = (
+            select(links.companies, func.count().label("count"))
+            .where(links.companies.in_(ids))
+            .group_by(links.companies)
+            .subquery()
+        )
+        ratios = (
+            select(
+                self._to_json_list(
+                    self._to_json(
+                        Ratio,
+                        name=SQLAlchemyRatio.name,
+                        value=cast(SQLAlchemyRatio.value, Text),
+                        deviation=case(
+                            {member: member.value for member in Deviation},
+                            value=SQLAlchemyRatio.deviation,
+                        ),
+                    ),
+                    SQLAlchemyRatio.name,
+                )
+            )
+            .where(SQLAlchemyRatio.analytics_id == SQLAlchemyAnalytics.id)
+            .scalar_subquery()
+        )
+        created_at = func.timezone("UTC", SQLAlchemyCompany.created_at)
+        fields: dict[str, ColumnExpressionArgument[Any]] = {
+            "name": SQLAlchemyCompany.name,
+            "brn": SQLAlchemyCompany.brn,
+            "country": cast(SQLAlchemyCompany.country, Text),
+            "score": cast(SQLAlchemyCompany.score, Text),
+            "created_at": func.to_char(
+                created_at,
+                # The fraction is omitted when it is zero.
+                case(
+                    (
+                        func.date_trunc("second", created_at) == created_at,
+                        'YYYY-MM-DD"T"HH24:MI:SS"Z"',
+                    ),
+                    else_='YYYY-MM-DD"T"HH24:MI:SS.US"Z"',
+                ),
+            ),
+            "analytics": select(
+                self._to_json_list(
+                    self._to_json(
+                        Analytics, name=SQLAlchemyAnalytics.name, ratios=ratios
+                    ),
+                    SQLAlchemyAnalytics.name,
+                )
+            )
+            .where(SQLAlchemyAnalytics.company_id == SQLAlchemyCompany.id)
+            .scalar_subquery(),
+            "users": select(
+                self._to_json_list(
+                    self._to_json(
+                        UserRead,
+                        **{
+                            field: preview.c[field]
+                            for field in UserRead.model_fields
+                        },
+                    ),
+                    preview.c.nickname,
+                )
+            ).scalar_subquery(),
+            "users_count": func.coalesce(counts.c.count, 0),
+        }
+        requested = fieldset.get_schema().model_fields.keys()
+        company = self._to_json(
+            CompanyRead,
+            **{
+                field: value
+                for field, value in fields.items()
+                if field in requested
+            },
+        )
+
+        query = select(
+            cast(
+                self._to_json_list(
+                    company,
+                    func.array_position(
+                        literal(ids, ARRAY(Integer)), SQLAlchemyCompany.id
+                    ),
+                ),
+                Text,
+            )
+        ).where(SQLAlchemyCompany.id.in_(ids))
+        if "users_count" in requested:
+            query = query.select_from(
+                outerjoin(
+                    SQLAlchemyCompany,
+                    counts,
+                    counts.c.companies == SQLAlchemyCompany.id,
+                )
+            )
+
+        return query
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class SQLAlchemyProjectedCompanyDAO(SQLAlchemyCompanyDAO):
+    """
+    Builds listings straight from rows: only the columns needed by the schema
+    are selected, so neither ORM instances nor the identity map are involved.
+    Relationships are loaded by a single query each for the whole page.
+    """
+
+    @override
+    def _select(self, fieldset: CompanyFieldset) -> Select[Any]:
+        return select(
+            SQLAlchemyCompany.id,
+            *(
+                getattr(SQLAlchemyCompany, column)
+                for column in fieldset.columns
+            ),
+        )
+
+    @override
+    @staticmethod
+    def _get_record_schema(fieldset: CompanyFieldset) -> type[Schema]:
+        return get_subset(CompanyRecord, fieldset.columns | {"id"})
+
+    @override
+    def _get_records(
+        self, rows: Iterable[Row[Any]], fieldset: CompanyFieldset
+    ) -> list[Schema]:
+        schema = self._get_record_schema(fieldset)
+        return [schema.model_validate(row) for row in rows]
+
+    @override
+    async def _read_relationships(
+        self,
+        session: SQLAlchemySession,
+        ids: list[int],
+        fieldset: CompanyFieldset,
+    ) -> dict[str, Mapping[int, Any]]:
+        # Zero-argument super() is not supported by slotted dataclasses.
+        relationships = await SQLAlchemyCompanyDAO._read_relationships(  # noqa: SLF001 # The parent implementation.
+            self, session, ids, fieldset
+        )
+        if CompanyRelationship.ANALYTICS in fieldset.include:
+            relationships[
+                CompanyRelationship.ANALYTICS
+            ] = await self._read_analytics(session, ids)
+
+        return relationships
+
+    @staticmethod
+    async def _read_analytics(
+        session: SQLAlchemySession, ids: list[int]
+    ) -> defaultdict[int, list[Analytics]]:
+        query = (
+            select(
+                SQLAlchemyAnalytics.company_id,
+                SQLAlchemyAnalytics.id,
+                SQLAlchemyAnalytics.name,
+                *(
+                    SQLAlchemyRatio.__table__.c[field].label(f"ratio_{field}")
+                    for field in Ratio.model_fields
+                ),
+            )
+            .outerjoin(SQLAlchemyAnalytics.ratios)
+            .where(SQLAlchemyAnalytics.company_id.in_(ids))
+            .order_by(
+                SQLAlchemyAnalytics.name,
+                SQLAlchemyAnalytics.id,
+                SQLAlchemyRatio.name,
+            )
+        )
+
+        analytics: defaultdict[int, list[Analytics]] = defaultdict(list)
+        reports: dict[int, Analytics] = {}
+        for row in await session.execute(query):
+            if (report := reports.get(row.id)) is None:
+                report = reports[row.id] = Analytics.model_construct(
+                    name=row.name, ratios=[]
+                )
+                analytics[row.company_id].append(report)
+            if row.ratio_name is not None:
+                ratio = row._asdict()
+                report.ratios.append(
+                    Ratio.model_construct(
+                        **{
+                            field: ratio[f"ratio_{field}"]
+                            for field in Ratio.model_fields
+                        }
+                    )
+                )
+
+        return analytics
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class CachedCompanyDAO[SessionT: DBSession, QueryT: Query](
+    CompanyDAO[SessionT, QueryT]
+):
+    """
+    Serves reads from the cache, which is invalidated as a whole once writes
+    are committed, since a new company may appear in any listing. Links to
+    users are not written here, so listings by user may be outdated for the
+    cache time.
+    """
+
+    _dao: CompanyDAO[SessionT, QueryT]
+    _cache: Cache
+
+    NAMESPACE: ClassVar = "companies"
+
+    async def _get_or_set(
+        self, key: str, compute: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        return await self._cache.get_or_set(self.NAMESPACE, key, compute)
+
+    def _invalidate(self, session: SessionT) -> None:
+        # Reads made before the commit would otherwise cache the old rows.
+        session.after_commit(partial(self._cache.invalidate, self.NAMESPACE))
+
+    @staticmethod
+    async def _dump(read: Awaitable[Schema | None]) -> bytes:
+        model = await read
+        return b"null" if model is None else model.model_dump_json().encode()
+
+    @staticmethod
+    async def _dump_tagged(read: Awaitable[Tagged]) -> bytes:
+        # The content is always cached, as it is requested without tags.
+        return (await read).to_bytes()
+
+    @override
+    async def read_one(
+        self,
+        session: SessionT,
+        company: CompanySearch,
+    ) -> CompanyRead | None:
+        cached = await self._get_or_set(
+            self._cache.get_key("read_one", company),
+            lambda: self._dump(self._dao.read_one(session, company)),
+        )
+
+        return (
+            None
+            if cached == b"null"
+            else CompanyRead.model_validate_json(cached)
+        )
+
+    @override
+    async def read_many(
+        self,
+        session: SessionT,
+        companies: Sequence[CompanySearch],
+    ) -> dict[CompanyKey, CompanyRead]:
+        return await self._dao.read_many(session, companies)
+
+    @override
+    async def write_one(
+        self,
+        session: SessionT,
+        company: CompanyCreate,
+    ) -> CompanyRead | None:
+        created = await self._dao.write_one(session, company)
+        if created is not None:
+            self._invalidate(session)
+
+        return created
+
+    @override
+    async def write_many(
+        self,
+        session: SessionT,
+        companies: Iterable[CompanyCreate],
+    ) -> CompaniesWriteSummary:
+        summary = await self._dao.write_many(session, companies)
+        if summary.inserted:
+            self._invalidate(session)
+
+        return summary
+
+    @override
+    async def read_by_user(
+        self,
+        session: SessionT,
+        clauses: UserCompaniesSearch,
+    ) -> BaseCursorPage[Schema]:
+        cached = await self._get_or_set(
+            self._cache.get_key("read_by_user", clauses),
+            lambda: self._dump(self._dao.read_by_user(session, clauses)),
+        )
+
+        return BaseCursorPage[clauses.get_schema()].model_validate_json(cached)  # type: ignore[misc, no-any-return] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+
+    @override
+    async def read_by_user_offset(
+        self,
+        session: SessionT,
+        clauses: UserCompaniesOffsetSearch,
+    ) -> BaseOffsetPage[Schema]:
+        cached = await self._get_or_set(
+            self._cache.get_key("read_by_user_offset", clauses),
+            lambda: self._dump(self._dao.read_by_user_offset(session, clauses)),
+        )
+
+        return BaseOffsetPage[clauses.get_schema()].model_validate_json(cached)  # type: ignore[misc, no-any-return] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+
+    @override
+    async def read_all(
+        self,
+        session: SessionT,
+        clauses: CompaniesSearch,
+    ) -> BaseCursorPage[Schema]:
+        cached = await self._get_or_set(
+            self._cache.get_key("read_all", clauses),
+            lambda: self._dump(self._dao.read_all(session, clauses)),
+        )
+
+        return BaseCursorPage[clauses.get_schema()].model_validate_json(cached)  # type: ignore[misc, no-any-return] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+
+    @override
+    async def read_users(
+        self,
+        session: SessionT,
+        clauses: CompanyUsersSearch,
+    ) -> BaseCursorPage[UserRead] | None:
+        return await self._dao.read_users(session, clauses)
+
+    @override
+    def export(
+        self,
+        session: SessionT,
+        fieldset: CompanyFieldset,
+    ) -> AsyncIterator[Sequence[Schema]]:
+        # The whole table is not worth caching.
+        return self._dao.export(session, fieldset)
+
+    @override
+    def export_ratios(
+        self,
+        session: SessionT,
+    ) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        return self._dao.export_ratios(session)
+
+    @override
+    async def read_by_user_json(
+        self,
+        session: SessionT,
+        clauses: UserCompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        cached = await self._get_or_set(
+            self._cache.get_key("read_by_user_json", clauses),
+            lambda: self._dump_tagged(
+                self._dao.read_by_user_json(session, clauses)
+            ),
+        )
+
+        return Tagged.from_bytes(cached, etags)
+
+    @override
+    async def read_all_json(
+        self,
+        session: SessionT,
+        clauses: CompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        cached = await self._get_or_set(
+            self._cache.get_key("read_all_json", clauses),
+            lambda: self._dump_tagged(
+                self._dao.read_all_json(session, clauses)
+            ),
+        )
+
+        return Tagged.from_bytes(cached, etags)
@@ -17,6 +17,7 @@ from sqlalchemy import (
     String,
     Table,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy import Enum as SQL_Enum
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -65,6 +66,8 @@ class SQLAlchemyCompany(SQLAlchemyIDModel):
             "brn": "Stands for business registration number — a unique "
             "identifier assigned to a company by the government.",
             "score": "Average financial rating across all analytical reports.",
+            "version": "Is incremented by the DB on any change of the company "
+            "or its analytics, ratios and users.",
         }
     )
 
@@ -92,6 +95,11 @@ class SQLAlchemyCompany(SQLAlchemyIDModel):
         UTCDateTime(),
         server_default=utcnow(),
     )
+    version: Mapped[int] = mapped_column(
+        server_default=text("1"),
+        doc=docs["version"],
+        comment=docs["version"],
+    )
 
     analytics: Mapped[list[SQLAlchemyAnalytics]] = relationship(
         SQLAlchemyAnalytics,
@@ -1,33 +1,74 @@
 from typing import Any, cast
 
-from dishka import AnyOf, Provider, Scope, provide
+from dishka import Provider, Scope, provide
 from fastapi import Request
-from fastcrud import FastCRUD
 from sqlalchemy import Select
 
-from src.companies.db.daos import CompanyCrud, CompanyDAO, SQLAlchemyCompanyDAO
-from src.companies.db.models import SQLAlchemyCompany
+from src.companies.db.daos import (
+    CachedCompanyDAO,
+    CompanyDAO,
+    SQLAlchemyCompanyDAO,
+    SQLAlchemyProjectedCompanyDAO,
+)
 from src.companies.service import CompanyService
 from src.core.asgi import ExtendedRequest
+from src.core.db.listeners import AsyncpgListener, DBListener
 from src.core.db.sessions import DBSession, SQLAlchemySession
 from src.core.deps.base import BaseProvider
+from src.core.settings import (
+    DBCredentials,
+    PaginationSettings,
+    ReadCacheSettings,
+)
+from src.core.utils.caches import Cache
+from src.core.utils.loggers import Logger
 from src.core.utils.paginators import DBPaginator, Query
 
 
 class SQLAlchemyCompanyDAOProvider(BaseProvider):
     @provide
-    def get_fastcrud(
-        self,
-    ) -> CompanyCrud:  # type: ignore[type-var] # None is acceptable in accordance with the lib's coding style when the schema is absent or unknown: https://benavlabs.github.io/fastcrud/api/fastcrud/#__span-23-3.
-        return FastCRUD(model=SQLAlchemyCompany)
-
-    @provide(provides=AnyOf[CompanyDAO[DBSession, Query], SQLAlchemyCompanyDAO])
     def get_dao(
         self,
+        settings: PaginationSettings,
         paginator: DBPaginator[SQLAlchemySession, Select[Any]],
-        crud: CompanyCrud,
     ) -> SQLAlchemyCompanyDAO:
-        return SQLAlchemyCompanyDAO(_paginator=paginator, _crud=crud)
+        if settings.is_projected:
+            return SQLAlchemyProjectedCompanyDAO(
+                _paginator=paginator, _settings=settings
+            )
+        return SQLAlchemyCompanyDAO(_paginator=paginator, _settings=settings)
+
+    @provide(provides=CompanyDAO[DBSession, Query])
+    def get_cached_dao(
+        self,
+        settings: ReadCacheSettings,
+        paginator: DBPaginator[SQLAlchemySession, Select[Any]],
+        dao: SQLAlchemyCompanyDAO,
+        cache: Cache,
+    ) -> CompanyDAO[SQLAlchemySession, Select[Any]]:
+        if not settings.time:
+            return dao
+        return CachedCompanyDAO[SQLAlchemySession, Select[Any]](
+            _paginator=paginator, _dao=dao, _cache=cache
+        )
+
+    @provide(provides=DBListener)
+    def get_listener(
+        self,
+        credentials: DBCredentials,
+        settings: ReadCacheSettings,
+        cache: Cache,
+        logger: Logger,
+    ) -> AsyncpgListener:
+        # When nothing is cached, there is nothing to invalidate.
+        return AsyncpgListener(
+            _credentials=credentials,
+            _cache=cache,
+            _logger=logger,
+            _channels=frozenset(
+                {CachedCompanyDAO.NAMESPACE} if settings.time else ()
+            ),
+        )
 
 
 class CompanyServiceProvider(BaseProvider):
@@ -1,25 +1,75 @@
 # pyright: reportUnusedFunction=false
 
+from collections.abc import Awaitable, Callable
+from functools import partial
 from typing import Annotated
 
 from dishka import FromDishka
-from fastapi import Depends, Query
+from fastapi import (
+    Body,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic_extra_types.country import CountryShortName
 
 from src.companies.schemas import (
+    MAX_BULK_SIZE,
     AllCompaniesSearch,
+    BaseBRN,
+    CompaniesExportSearch,
+    CompaniesSearch,
+    CompaniesWriteSummary,
+    CompanyCreate,
+    CompanyFieldset,
     CompanyRead,
+    CompanySearch,
+    CompanyUsersQuerySearch,
+    CompanyUsersSearch,
+    MyCompaniesOffsetSearch,
+    MyCompaniesSearch,
+    RatiosExportSearch,
+    UserCompaniesOffsetSearch,
     UserCompaniesSearch,
+    get_ratios_arrow_schema,
 )
 from src.companies.service import CompanyService
-from src.core.asgi import Architecture, ExtendedRouter
+from src.core.asgi import (
+    Architecture,
+    ExtendedRouter,
+    RawJSONResponse,
+    get_etags,
+    get_tagged_response,
+)
 from src.core.schemas import (
     BaseCursorPage,
     BaseOffsetPage,
-    CursorSortingSearch,
-    OffsetSortingSearch,
+    Schema,
+    Tagged,
 )
+from src.core.settings import PaginationSettings
+from src.core.utils.exports import MEDIA_TYPES, export, to_columnar
 from src.users.db.models import DBUserProtocol
-from src.users.deps import get_authenticated
+from src.users.deps import get_authenticated, get_superuser
+from src.users.schemas import UserRead
+
+
+async def _get_page_response(
+    read: Callable[[], Awaitable[BaseCursorPage[Schema]]],
+    read_json: Callable[[], Awaitable[Tagged]],
+    *,
+    is_json: bool,
+) -> Response:
+    if is_json:
+        return get_tagged_response(await read_json())
+
+    page = await read()
+    return RawJSONResponse(page.model_dump_json(by_alias=True).encode())
 
 
 def get_company_router() -> ExtendedRouter:
@@ -30,32 +80,201 @@ def get_company_router() -> ExtendedRouter:
         ],
     )
 
-    @router.get("/my")
+    @router.get(
+        "/my",
+        response_model=BaseCursorPage[CompanyRead],
+        response_class=RawJSONResponse,
+    )
     async def get_my_companies(
         user: Annotated[
             DBUserProtocol,
-            Depends(get_authenticated),
+            Depends(get_authenticated()),
+        ],
+        service: FromDishka[CompanyService],
+        settings: FromDishka[PaginationSettings],
+        conditions: Annotated[MyCompaniesSearch, Query()],
+        if_none_match: Annotated[str | None, Header()] = None,
+    ) -> Response:
+        """
+        An unchanged page is not sent again to clients that have its tag,
+        unless pages are serialized by Pydantic.
+        """
+        clauses = UserCompaniesSearch(
+            user_nickname=user.nickname,
+            **conditions.model_dump(),
+        )
+
+        return await _get_page_response(
+            partial(service.get_by_user, clauses=clauses),
+            partial(
+                service.get_by_user_json,
+                clauses=clauses,
+                etags=get_etags(if_none_match),
+            ),
+            is_json=settings.is_json,
+        )
+
+    @router.get(
+        "/my/offset",
+        response_model=BaseOffsetPage[CompanyRead],
+        response_class=RawJSONResponse,
+    )
+    async def get_my_companies_offset(
+        user: Annotated[
+            DBUserProtocol,
+            Depends(get_authenticated()),
         ],
         service: FromDishka[CompanyService],
-        conditions: Annotated[OffsetSortingSearch, Query()],
-    ) -> BaseOffsetPage[CompanyRead]:
-        return await service.get_by_user(
-            clauses=UserCompaniesSearch(
+        conditions: Annotated[MyCompaniesOffsetSearch, Query()],
+    ) -> RawJSONResponse:
+        # The items may be a subset of the response model, so the page is
+        # serialized by its own schema.
+        page = await service.get_by_user_offset(
+            clauses=UserCompaniesOffsetSearch(
                 user_nickname=user.nickname,
                 **conditions.model_dump(),
             )
         )
 
+        return RawJSONResponse(page.model_dump_json(by_alias=True).encode())
+
     @router.get(
         "/all",
-        dependencies=(Depends(get_authenticated),),
+        dependencies=(Depends(get_authenticated()),),
+        response_model=BaseCursorPage[CompanyRead],
+        response_class=RawJSONResponse,
     )
     async def get_all_companies(
         service: FromDishka[CompanyService],
+        settings: FromDishka[PaginationSettings],
         conditions: Annotated[AllCompaniesSearch, Query()],
-    ) -> BaseCursorPage[CompanyRead]:
-        return await service.get_all(
-            clauses=CursorSortingSearch(**conditions.model_dump())
+        if_none_match: Annotated[str | None, Header()] = None,
+    ) -> Response:
+        """
+        An unchanged page is not sent again to clients that have its tag,
+        unless pages are serialized by Pydantic.
+        """
+        clauses = CompaniesSearch(**conditions.model_dump())
+
+        return await _get_page_response(
+            partial(service.get_all, clauses=clauses),
+            partial(
+                service.get_all_json,
+                clauses=clauses,
+                etags=get_etags(if_none_match),
+            ),
+            is_json=settings.is_json,
+        )
+
+    @router.get(
+        "/export",
+        dependencies=(Depends(get_authenticated()),),
+        response_class=StreamingResponse,
+    )
+    async def export_companies(
+        service: FromDishka[CompanyService],
+        conditions: Annotated[CompaniesExportSearch, Query()],
+    ) -> StreamingResponse:
+        """
+        Streams all the companies at once instead of paginating them, so memory
+        stays flat regardless of their number.
+        """
+        fieldset = CompanyFieldset(**conditions.model_dump())
+
+        return StreamingResponse(
+            export(
+                service.export(fieldset=fieldset),
+                fieldset.get_schema(),
+                conditions.format,
+            ),
+            media_type=MEDIA_TYPES[conditions.format],
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="companies.{conditions.format}"'
+                )
+            },
+        )
+
+    @router.get(
+        "/export/ratios",
+        dependencies=(Depends(get_authenticated()),),
+        response_class=StreamingResponse,
+    )
+    async def export_ratios(
+        service: FromDishka[CompanyService],
+        conditions: Annotated[RatiosExportSearch, Query()],
+    ) -> StreamingResponse:
+        """
+        Streams companies, analytics and ratios as a single flat table in a
+        columnar format.
+        """
+        return StreamingResponse(
+            to_columnar(
+                service.export_ratios(),
+                get_ratios_arrow_schema(),
+                conditions.format,
+            ),
+            media_type=MEDIA_TYPES[conditions.format],
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="ratios.{conditions.format}"'
+                )
+            },
+        )
+
+    @router.get(
+        "/{country}/{brn}/users",
+        dependencies=(Depends(get_authenticated()),),
+    )
+    async def get_company_users(
+        country: Annotated[CountryShortName, Path()],
+        brn: Annotated[BaseBRN, Path()],
+        service: FromDishka[CompanyService],
+        conditions: Annotated[CompanyUsersQuerySearch, Query()],
+    ) -> BaseCursorPage[UserRead]:
+        """
+        Pages through all the users of a company, which are only previewed in
+        the company itself.
+        """
+        page = await service.get_users(
+            clauses=CompanyUsersSearch(
+                brn=brn, country=country, **conditions.model_dump()
+            )
         )
+        if page is None:
+            raise HTTPException(status.HTTP_404_NOT_FOUND)
+
+        return page
+
+    @router.post(
+        "/search",
+        dependencies=(Depends(get_authenticated()),),
+    )
+    async def search_companies(
+        service: FromDishka[CompanyService],
+        companies: Annotated[list[CompanySearch], Body()],
+    ) -> list[CompanyRead]:
+        """
+        Missing companies are omitted, so the response may be shorter than the
+        request.
+        """
+        return list((await service.get_many(companies=companies)).values())
+
+    @router.post(
+        "/bulk",
+        dependencies=(Depends(get_superuser()),),
+        status_code=status.HTTP_201_CREATED,
+    )
+    async def create_companies(
+        service: FromDishka[CompanyService],
+        companies: Annotated[
+            list[CompanyCreate], Body(max_length=MAX_BULK_SIZE)
+        ],
+    ) -> CompaniesWriteSummary:
+        """
+        Is available only to superusers and takes at most 10 000 companies, so
+        larger imports are sent in several requests.
+        """
+        return await service.create_many(companies=companies)
 
     return router
@@ -1,22 +1,38 @@
 import re
+from collections.abc import Iterable
 from decimal import Decimal
 from enum import StrEnum
-from functools import total_ordering
-from typing import Annotated, Self
+from functools import cache, total_ordering
+from typing import TYPE_CHECKING, Annotated, Final, Self
 
 from pycountry import countries
-from pydantic import AwareDatetime, Field, field_validator
+from pydantic import (
+    AwareDatetime,
+    Field,
+    NonNegativeInt,
+    PositiveInt,
+    field_validator,
+)
+from pydantic.alias_generators import to_snake
 from pydantic_extra_types.country import CountryShortName
 
 from src.analytics.schemas import Analytics
 from src.core.schemas import (
+    ColumnarFormat,
+    CursorSearch,
     CursorSortingSearch,
+    DBSchema,
+    ExportFormat,
     NonEmptyStr,
     OffsetSortingSearch,
     Schema,
+    get_subset,
 )
 from src.users.schemas import Nickname, UserRead
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 BaseBRN = Annotated[NonEmptyStr, Field(max_length=100)]
 BaseName = Annotated[NonEmptyStr, Field(max_length=300)]
 Countries = StrEnum(  # type: ignore[misc] # A MyPy limitation to determine dynamically generated values: https://github.com/python/mypy/issues/4865#issuecomment-592560696.
@@ -86,22 +102,177 @@ class CompanyRead(Schema):
     created_at: AwareDatetime
 
     analytics: list[Analytics]
-    users: list[UserRead]
+    users: Annotated[
+        list[UserRead],
+        Field(
+            description="Is only a preview of the first users by nickname, "
+            "the rest are paginated separately."
+        ),
+    ]
+    users_count: NonNegativeInt
 
     def __gt__(self, other: Self) -> bool:
         return self.name > other.name
 
 
+class CompanyVersion(DBSchema):
+    version: PositiveInt
+
+
+class CompanyRecord(DBSchema):
+    """
+    Is a company row with the relationships that may be loaded along with it.
+    Users are always read separately.
+    """
+
+    name: BaseName
+    brn: BaseBRN
+    country: CountryShortName
+    score: Annotated[Decimal | None, Field(ge=0, le=100)] = None
+    created_at: AwareDatetime
+
+    analytics: list[Analytics]
+
+
+# Bounds the body of a bulk creation, which is validated in memory as a whole.
+MAX_BULK_SIZE: Final = 10_000
+
+
+class CompaniesWriteSummary(Schema):
+    inserted: NonNegativeInt
+    duplicates: NonNegativeInt
+
+
 class CompanySearch(Schema):
     brn: BaseBRN
     country: CountryShortName
 
 
-class UserCompaniesSearch(OffsetSortingSearch):
+# BRN and country, which uniquely identify a company.
+type CompanyKey = tuple[str, str]
+
+
+class CompanyField(StrEnum):
+    NAME = "name"
+    BRN = "brn"
+    COUNTRY = "country"
+    SCORE = "score"
+    CREATED_AT = "createdAt"
+
+
+class CompanyRelationship(StrEnum):
+    ANALYTICS = "analytics"
+    USERS = "users"
+
+
+class CompanyFieldset(Schema):
+    """
+    Fields and relationships that are not requested are neither loaded nor
+    sent.
+    """
+
+    fields: frozenset[CompanyField] = frozenset(CompanyField)
+    include: frozenset[CompanyRelationship] = frozenset(CompanyRelationship)
+
+    @field_validator("fields", "include", mode="before")
+    @classmethod
+    def split(cls, values: str | Iterable[str]) -> list[str]:
+        """
+        Both comma-separated and repeated query params are accepted.
+        """
+        if isinstance(values, str):
+            values = (values,)
+        return [value for item in values for value in item.split(",") if value]
+
+    @property
+    def columns(self) -> frozenset[str]:
+        return frozenset(map(to_snake, self.fields))
+
+    def get_schema(self) -> type[Schema]:
+        fields = self.columns | self.include
+        # The count is sent along with the users preview it refers to.
+        if CompanyRelationship.USERS in self.include:
+            fields |= {"users_count"}
+        return get_subset(CompanyRead, fields)
+
+
+class UserCompaniesSearch(CursorSortingSearch, CompanyFieldset):
     user_nickname: Nickname
 
 
-class AllCompaniesSearch(CursorSortingSearch):
+class CompaniesSearch(CursorSortingSearch, CompanyFieldset):
+    pass
+
+
+class UserCompaniesOffsetSearch(OffsetSortingSearch, CompanyFieldset):
+    """
+    Allows to «jump» to an arbitrary page at the cost of scanning all the
+    previous ones, so the keyset alternative should be preferred.
+    """
+
+    user_nickname: Nickname
+
+
+class CompaniesQuerySearch(CursorSortingSearch, CompanyFieldset):
+    @field_validator("next_page", mode="after")
+    @classmethod
+    def empty_to_none(cls, next_page: str) -> str | None:
+        """
+        None cannot be sent via query params. (See RFC 3986 for details)
+        """
+        return next_page or None
+
+
+class MyCompaniesSearch(CompaniesQuerySearch):
+    pass
+
+
+class AllCompaniesSearch(CompaniesQuerySearch):
+    pass
+
+
+class MyCompaniesOffsetSearch(OffsetSortingSearch, CompanyFieldset):
+    pass
+
+
+class CompaniesExportSearch(CompanyFieldset):
+    format: ExportFormat = ExportFormat.NDJSON
+
+
+class RatiosExportSearch(Schema):
+    format: ColumnarFormat = ColumnarFormat.ARROW
+
+
+@cache
+def get_ratios_arrow_schema() -> "pa.Schema":
+    """
+    The join of companies, analytics and ratios, one row per ratio. Companies
+    without analytics or ratios are kept with nulls.
+
+    Is built on the first export, so the app is started without pyarrow.
+    """
+    import pyarrow as pa
+
+    return pa.schema(
+        (
+            ("brn", pa.string()),
+            ("country", pa.string()),
+            ("name", pa.string()),
+            ("score", pa.decimal128(8, 5)),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("analytics", pa.string()),
+            ("ratio", pa.string()),
+            ("value", pa.decimal128(38, 10)),
+            ("deviation", pa.string()),
+        )
+    )
+
+
+class CompanyUsersSearch(CursorSearch, CompanySearch):
+    pass
+
+
+class CompanyUsersQuerySearch(CursorSearch):
     @field_validator("next_page", mode="after")
     @classmethod
     def empty_to_none(cls, next_page: str) -> str | None:
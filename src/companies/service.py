@@ -1,17 +1,28 @@
+from collections.abc import AsyncIterator, Collection, Iterable, Sequence
 from dataclasses import dataclass
+from typing import Any
 
 from dishka import AsyncContainer
 
 from src.companies.db.daos import CompanyDAO
 from src.companies.schemas import (
+    CompaniesSearch,
+    CompaniesWriteSummary,
+    CompanyCreate,
+    CompanyFieldset,
+    CompanyKey,
     CompanyRead,
+    CompanySearch,
+    CompanyUsersSearch,
+    UserCompaniesOffsetSearch,
     UserCompaniesSearch,
 )
 from src.core.db.sessions import DBSession
-from src.core.schemas import BaseCursorPage, BaseOffsetPage, CursorSortingSearch
+from src.core.schemas import BaseCursorPage, BaseOffsetPage, Schema, Tagged
 from src.core.utils.paginators import (
     Query,
 )
+from src.users.schemas import UserRead
 
 
 @dataclass(kw_only=True, slots=True, frozen=True)
@@ -19,22 +30,105 @@ class CompanyService:
     _container: AsyncContainer
     _company_dao: CompanyDAO[DBSession, Query]
 
+    async def get_many(
+        self,
+        companies: Sequence[CompanySearch],
+    ) -> dict[CompanyKey, CompanyRead]:
+        async with self._container() as sub_container:
+            return await self._company_dao.read_many(
+                session=await sub_container.get(DBSession),
+                companies=companies,
+            )
+
     async def get_by_user(
         self,
         clauses: UserCompaniesSearch,
-    ) -> BaseOffsetPage[CompanyRead]:
+    ) -> BaseCursorPage[Schema]:
         async with self._container() as sub_container:
             return await self._company_dao.read_by_user(
                 session=await sub_container.get(DBSession),
                 clauses=clauses,
             )
 
+    async def get_by_user_offset(
+        self,
+        clauses: UserCompaniesOffsetSearch,
+    ) -> BaseOffsetPage[Schema]:
+        async with self._container() as sub_container:
+            return await self._company_dao.read_by_user_offset(
+                session=await sub_container.get(DBSession),
+                clauses=clauses,
+            )
+
     async def get_all(
         self,
-        clauses: CursorSortingSearch,
-    ) -> BaseCursorPage[CompanyRead]:
+        clauses: CompaniesSearch,
+    ) -> BaseCursorPage[Schema]:
         async with self._container() as sub_container:
             return await self._company_dao.read_all(
                 session=await sub_container.get(DBSession),
                 clauses=clauses,
             )
+
+    async def get_users(
+        self,
+        clauses: CompanyUsersSearch,
+    ) -> BaseCursorPage[UserRead] | None:
+        async with self._container() as sub_container:
+            return await self._company_dao.read_users(
+                session=await sub_container.get(DBSession),
+                clauses=clauses,
+            )
+
+    async def create_many(
+        self,
+        companies: Iterable[CompanyCreate],
+    ) -> CompaniesWriteSummary:
+        async with self._container() as sub_container:
+            return await self._company_dao.write_many(
+                session=await sub_container.get(DBSession),
+                companies=companies,
+            )
+
+    async def export(
+        self,
+        fieldset: CompanyFieldset,
+    ) -> AsyncIterator[Sequence[Schema]]:
+        # The session is held until the whole stream is consumed.
+        async with self._container() as sub_container:
+            async for companies in self._company_dao.export(
+                session=await sub_container.get(DBSession),
+                fieldset=fieldset,
+            ):
+                yield companies
+
+    async def export_ratios(self) -> AsyncIterator[Sequence[Sequence[Any]]]:
+        async with self._container() as sub_container:
+            async for rows in self._company_dao.export_ratios(
+                session=await sub_container.get(DBSession),
+            ):
+                yield rows
+
+    async def get_by_user_json(
+        self,
+        clauses: UserCompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        async with self._container() as sub_container:
+            return await self._company_dao.read_by_user_json(
+                session=await sub_container.get(DBSession),
+                clauses=clauses,
+                etags=etags,
+            )
+
+    async def get_all_json(
+        self,
+        clauses: CompaniesSearch,
+        etags: Collection[str] = (),
+    ) -> Tagged:
+        async with self._container() as sub_container:
+            return await self._company_dao.read_all_json(
+                session=await sub_container.get(DBSession),
+                clauses=clauses,
+                etags=etags,
+            )
@@ -21,16 +21,17 @@ from cadwyn.schema_generation import (
     _ValidatorWrapper,
 )
 from dishka.integrations.fastapi import DishkaRoute, setup_dishka
+from starlette import status
 from starlette.datastructures import State
 from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 
-from src.core.schemas import PublicError
+from src.core.schemas import PublicError, Tagged
 
 if TYPE_CHECKING:
     from collections.abc import Awaitable, Callable, Iterable
 
     from dishka import AsyncContainer
-    from starlette.responses import Response
 
     from src.core.middlewares import Middleware
 
@@ -142,6 +143,41 @@ class ExtendedRequest(Request):
         return cast(TypedState, super().state)
 
 
+class RawJSONResponse(JSONResponse):
+    """
+    Sends content that has already been serialized (e.g. by the DB) «as is»,
+    skipping both validation and encoding.
+    """
+
+    @override
+    def render(self, content: bytes) -> bytes:
+        return content
+
+
+def get_etags(if_none_match: str | None) -> frozenset[str]:
+    """
+    Tags are compared weakly, as required for conditional GET, so the «W/»
+    prefix is ignored.
+    """
+    if if_none_match is None:
+        return frozenset()
+
+    return frozenset(
+        etag.strip().removeprefix("W/").strip('"')
+        for etag in if_none_match.split(",")
+    )
+
+
+def get_tagged_response(tagged: Tagged) -> Response:
+    headers = {"ETag": f'"{tagged.etag}"'}
+    if tagged.content is None:
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+        )
+
+    return RawJSONResponse(tagged.content, headers=headers)
+
+
 class ExtendedRouter(VersionedAPIRouter):
     def __init__(
         self,
@@ -0,0 +1,119 @@
+import asyncio
+from abc import ABC, abstractmethod
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import ClassVar, override
+
+import asyncpg
+
+from src.core.settings import DBCredentials
+from src.core.utils.caches import Cache
+from src.core.utils.loggers import Logger
+
+
+class DBListener(ABC):
+    @abstractmethod
+    async def start(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True)
+class AsyncpgListener(DBListener):
+    """
+    Invalidates cached values when the tables behind them are changed by any
+    worker or directly in the DB, e.g. by triggers. Notifications are sent by
+    triggers to channels named after the cache namespaces.
+
+    The dedicated connection is held outside the pool for the worker lifetime,
+    since notifications are only delivered to an idle session that listens.
+    """
+
+    _credentials: DBCredentials
+    _cache: Cache
+    _logger: Logger
+    _channels: frozenset[str]
+
+    _task: asyncio.Task[None] | None = None
+    # Notifications delivered in one go are handled once.
+    _scheduled: set[str] = field(default_factory=set)
+    # Are kept, since the loop holds only weak references to tasks.
+    _invalidations: set[asyncio.Task[None]] = field(default_factory=set)
+
+    RECONNECT_INTERVAL: ClassVar = 5.0
+
+    @override
+    async def start(self) -> None:
+        if self._channels and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    @override
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+        await asyncio.gather(*self._invalidations, return_exceptions=True)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                connection = await asyncpg.connect(
+                    host=self._credentials.host,
+                    port=self._credentials.port,
+                    user=self._credentials.user,
+                    password=self._credentials.password,
+                    database=self._credentials.db_name,
+                )
+            except (OSError, asyncpg.PostgresError):
+                self._logger.exception("Failed to listen for DB changes.")
+                await asyncio.sleep(self.RECONNECT_INTERVAL)
+                continue
+
+            try:
+                await self._wait(connection)
+            except (OSError, asyncpg.PostgresError):
+                self._logger.exception("Stopped listening for DB changes.")
+            finally:
+                with suppress(OSError, asyncpg.PostgresError):
+                    await connection.close(timeout=self.RECONNECT_INTERVAL)
+
+    async def _wait(self, connection: asyncpg.Connection) -> None:
+        is_terminated = asyncio.Event()
+        connection.add_termination_listener(lambda _: is_terminated.set())
+
+        for channel in self._channels:
+            await connection.add_listener(channel, self._notify)
+            # Changes made while disconnected are unknown.
+            self._invalidate(channel)
+        await is_terminated.wait()
+
+    def _notify(
+        self, _connection: object, _pid: int, channel: str, _payload: object, /
+    ) -> None:
+        """
+        Payloads are ignored: cached values are keyed by search clauses rather
+        than by companies, so the whole namespace is invalidated.
+        """
+        if channel not in self._scheduled:
+            self._scheduled.add(channel)
+            asyncio.get_running_loop().call_soon(self._invalidate, channel)
+
+    def _invalidate(self, channel: str) -> None:
+        """
+        Shared values are dropped too, since changes made directly in the DB
+        are not invalidated by any worker.
+        """
+        self._scheduled.discard(channel)
+        task = asyncio.create_task(
+            self._cache.invalidate(channel, is_shared=True)
+        )
+        self._invalidations.add(task)
+        task.add_done_callback(self._invalidations.discard)
@@ -0,0 +1,50 @@
+"""Notify about company changes
+
+Revision ID: 4b1e9d0c7a52
+Revises: 0c93832207a3
+Create Date: 2026-10-17 09:12:44.518203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.core.db.models
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b1e9d0c7a52'
+down_revision: Union[str, Sequence[str], None] = '0c93832207a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# A statement changing any of these tables sends a single notification to the
+# «companies» channel, since the listener evicts the whole namespace anyway.
+# Notifications with the same payload are sent once per transaction, so the
+# payload is constant.
+TABLES = ('companies', 'analytics', 'ratios', 'companies_users')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE FUNCTION notify_companies_change() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('companies', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER notify_{table}_change
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_companies_change()
+        """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(TABLES):
+        op.execute(f'DROP TRIGGER notify_{table}_change ON {table}')
+    op.execute('DROP FUNCTION notify_companies_change()')
@@ -0,0 +1,136 @@
+"""Add versions of companies
+
+Revision ID: 9d3f6a2e8b14
+Revises: 4b1e9d0c7a52
+Create Date: 2026-10-17 11:40:05.237961
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import src.core.db.models
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d3f6a2e8b14'
+down_revision: Union[str, Sequence[str], None] = '4b1e9d0c7a52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COMMENT = (
+    'Is incremented by the DB on any change of the company or its analytics, '
+    'ratios and users.'
+)
+# Changed rows of the children are resolved to the ids of their companies.
+CHILDREN = {
+    'analytics': 'SELECT company_id FROM {rows}',
+    'ratios': (
+        'SELECT company_id FROM analytics '
+        'WHERE id IN (SELECT analytics_id FROM {rows})'
+    ),
+    'companies_users': 'SELECT companies FROM {rows}',
+    'users': (
+        'SELECT companies FROM companies_users '
+        'WHERE users IN (SELECT id FROM {rows})'
+    ),
+}
+
+# The ones of «UserRead».
+USER_COLUMNS = ('nickname', 'email', 'is_active', 'is_superuser', 'is_verified')
+
+# Transition tables and the rows changed by each event. A trigger with
+# transition tables may only fire on a single event.
+EVENTS = {
+    'INSERT': ('NEW TABLE AS new_rows', 'new_rows'),
+    'UPDATE': (
+        'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+        '(SELECT * FROM old_rows UNION ALL SELECT * FROM new_rows) AS changed',
+    ),
+    'DELETE': ('OLD TABLE AS old_rows', 'old_rows'),
+}
+# Only the public profiles of users are shown in companies, while their links
+# are handled by the link table. Transition tables cannot be combined with
+# the columns of «UPDATE OF», so the profiles are compared instead.
+USER_EVENTS = {
+    'UPDATE': (
+        EVENTS['UPDATE'][0],
+        '(SELECT new_rows.id FROM new_rows JOIN old_rows USING (id) '
+        f'WHERE ({", ".join(f"new_rows.{column}" for column in USER_COLUMNS)}) '
+        f'IS DISTINCT FROM ({", ".join(f"old_rows.{column}" for column in USER_COLUMNS)})'
+        ') AS changed',
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'companies',
+        sa.Column(
+            'version',
+            sa.Integer(),
+            server_default=sa.text('1'),
+            nullable=False,
+            comment=COMMENT,
+        ),
+    )
+
+    # Bumps of the children are not bumped once more.
+    op.execute("""
+        CREATE FUNCTION bump_company_version() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.version = OLD.version THEN
+                NEW.version := OLD.version + 1;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER bump_company_version
+        BEFORE UPDATE ON companies
+        FOR EACH ROW EXECUTE FUNCTION bump_company_version()
+    """)
+
+    # A statement bumps each of its companies once, however many of their
+    # rows it changes.
+    for table, company_ids in CHILDREN.items():
+        events = USER_EVENTS if table == 'users' else EVENTS
+        branches = ''.join(
+            f"""
+                {'ELSIF' if index else 'IF'} TG_OP = '{event}' THEN
+                    UPDATE companies SET version = version + 1
+                    WHERE id IN ({company_ids.format(rows=rows)});"""
+            for index, (event, (_, rows)) in enumerate(events.items())
+        )
+        op.execute(f"""
+            CREATE FUNCTION bump_{table}_company_version() RETURNS trigger AS $$
+            BEGIN{branches}
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql
+        """)
+        for event, (transition_tables, _) in events.items():
+            op.execute(f"""
+                CREATE TRIGGER bump_{table}_company_version_{event.lower()}
+                AFTER {event} ON {table}
+                REFERENCING {transition_tables}
+                FOR EACH STATEMENT EXECUTE FUNCTION bump_{table}_company_version()
+            """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(CHILDREN):
+        for event in USER_EVENTS if table == 'users' else EVENTS:
+            op.execute(
+                f'DROP TRIGGER bump_{table}_company_version_{event.lower()} '
+                f'ON {table}'
+            )
+        op.execute(f'DROP FUNCTION bump_{table}_company_version()')
+    op.execute('DROP TRIGGER bump_company_version ON companies')
+    op.execute('DROP FUNCTION bump_company_version()')
+
+    op.drop_column('companies', 'version')
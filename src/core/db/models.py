@@ -5,12 +5,15 @@ from typing import Any, cast, override
 
 from sqlalchemy import (
     CheckConstraint,
+    ClauseElement,
     Column,
     Compiled,
     DateTime,
     Dialect,
+    Executable,
     FunctionElement,
     MetaData,
+    Select,
     func,
     inspect,
 )
@@ -75,6 +78,24 @@ def pg_utcnow(element: utcnow, compiler: Compiled, **kwargs: Any) -> str:
     return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
 
 
+class explain(Executable, ClauseElement):  # noqa: N801
+    """
+    Returns the plan as JSON, which allows to estimate the number of rows
+    without executing the statement.
+    """
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(explain, "postgresql")
+def pg_explain(element: explain, compiler: Compiled, **kwargs: Any) -> str:
+    statement = compiler.process(element.statement, **kwargs)
+    return f"EXPLAIN (FORMAT JSON) {statement}"
+
+
 class UTCDateTime(TypeDecorator[datetime]):
     impl = DateTime(timezone=True)
     cache_ok = True
@@ -1,12 +1,20 @@
-from abc import ABC
-from collections.abc import Awaitable, Callable
+from abc import ABC, abstractmethod
+from collections.abc import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Sequence,
+)
 from dataclasses import dataclass
 from functools import wraps
-from typing import Any, Final
+from typing import Any, Final, cast, override
 
+import asyncpg
 import sqlalchemy.exc
-from sqlalchemy import select
+from sqlalchemy import Executable, Row, select
 from sqlalchemy.exc import (
+    DBAPIError,
     DisconnectionError,
     SQLAlchemyError,
 )
@@ -15,19 +23,61 @@ from sqlalchemy.orm import selectinload
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
 from src.core.db.models import SQLAlchemyPKModel
-from src.core.errors import DBConnError, DBResponseError
+from src.core.errors import CircuitOpenError, DBConnError, DBResponseError
 from src.core.settings import DBSettings
+from src.core.utils.breakers import CircuitBreaker
+
+# Are raised by the pool, the driver or the socket.
+CONN_ERRORS: Final = (
+    sqlalchemy.exc.TimeoutError,
+    DisconnectionError,
+    asyncpg.PostgresConnectionError,
+    OSError,
+)
+
+
+def is_conn_error(exc: BaseException) -> bool:
+    """
+    Errors of the driver are wrapped by SQLAlchemy into DBAPI ones (e.g.
+    InterfaceError), which keep the adapted error with the original as its
+    cause.
+    """
+    if isinstance(exc, DBAPIError):
+        return (
+            exc.connection_invalidated
+            or isinstance(exc.orig, CONN_ERRORS)
+            or isinstance(getattr(exc.orig, "__cause__", None), CONN_ERRORS)
+        )
+
+    return isinstance(exc, CONN_ERRORS)
 
 
 @dataclass(kw_only=True, slots=True)
 class DBSession(ABC):
     _settings: Final[DBSettings]  # type: ignore[misc] # A MyPy limitation when dealing with dataclasses with Final, not confirmed by Pyright: https://github.com/python/mypy/issues/5608.
 
+    @abstractmethod
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """
+        Defers the callback until the current transaction is committed, e.g.
+        to invalidate caches only when the changes are visible to others. It
+        is dropped on a rollback.
+        """
+        raise NotImplementedError
+
 
 class SQLAlchemySession(AsyncSession, DBSession):
-    def __init__(self, settings: DBSettings, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        settings: DBSettings,
+        breaker: CircuitBreaker[DBSession],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
         super().__init__(*args, **kwargs)
         DBSession.__init__(self, _settings=settings)
+        self._breaker: Final = breaker
+        self._callbacks: list[Callable[[], Awaitable[None]]] = []
 
         retryer: Final = retry(
             retry=retry_if_exception_type(DBConnError),
@@ -37,28 +87,70 @@ class SQLAlchemySession(AsyncSession, DBSession):
 
         for method in (
             "execute",
+            "stream",
             "get",
             "merge",
             "flush",
             "refresh",
             "load_all",
             "commit",
-            "rollback",
         ):
             setattr(self, method, retryer(self.handle(getattr(self, method))))
+        # Releases the connection (like closing, which is not wrapped), so it
+        # is made even while the breaker is open, and its failures are caused
+        # by the ones already counted.
+        for method in ("rollback",):
+            setattr(
+                self,
+                method,
+                retryer(self.handle(getattr(self, method), is_guarded=False)),
+            )
+        # Records may be a one-shot iterator, so they cannot be resent.
+        for method in ("copy_records",):
+            setattr(self, method, self.handle(getattr(self, method)))
+
+    @override
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self._callbacks.append(callback)
+
+    @override
+    async def commit(self) -> None:
+        await super().commit()
+
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            await callback()
+
+    @override
+    async def rollback(self) -> None:
+        self._callbacks.clear()
+        await super().rollback()
 
-    @staticmethod
     def handle[**P, ReturnT](
+        self,
         func: Callable[P, Awaitable[ReturnT]],
+        *,
+        is_guarded: bool = True,
     ) -> Callable[P, Awaitable[ReturnT]]:
         @wraps(func)
         async def wrapper(*args: P.args, **kwargs: P.kwargs) -> ReturnT:
             try:
-                return await func(*args, **kwargs)
+                if not is_guarded:
+                    return await func(*args, **kwargs)
+                return await self._breaker.run(func, *args, **kwargs)
+            except CircuitOpenError as exc:
+                raise DBConnError from exc
             except (sqlalchemy.exc.TimeoutError, DisconnectionError) as exc:
                 raise DBConnError(code=exc.code) from exc
             except SQLAlchemyError as exc:
+                if is_conn_error(exc):
+                    raise DBConnError(code=exc.code) from exc
                 raise DBResponseError(code=exc.code) from exc
+            # Are raised by the driver when it is used directly.
+            except asyncpg.PostgresConnectionError as exc:
+                raise DBConnError(code=exc.sqlstate) from exc
+            except asyncpg.PostgresError as exc:
+                raise DBResponseError(code=exc.sqlstate) from exc
 
         return wrapper
 
@@ -85,3 +177,44 @@ class SQLAlchemySession(AsyncSession, DBSession):
         )
 
         return (await self.execute(query)).scalar_one()
+
+    async def stream_partitions(
+        self, statement: Executable
+    ) -> AsyncIterator[Sequence[Row[Any]]]:
+        """
+        A server-side cursor mostly fails while it is fetched rather than when
+        it is opened, so each fetch is handled (but not retried) like a call.
+        """
+        partitions = (await self.stream(statement)).partitions()
+        fetch = self.handle(partitions.__anext__)
+
+        while True:
+            try:
+                rows = await fetch()
+            except StopAsyncIteration:
+                return
+            yield rows
+
+    async def copy_records(
+        self,
+        table: str,
+        records: Iterable[Sequence[Any]],
+        *,
+        columns: Sequence[str],
+    ) -> int:
+        """
+        Loads records via the COPY protocol within the current transaction,
+        bypassing both the ORM and SQL parsing. Returns the number of copied
+        records.
+        """
+        connection = cast(
+            asyncpg.Connection,
+            (
+                await (await self.connection()).get_raw_connection()
+            ).driver_connection,
+        )
+        status = await connection.copy_records_to_table(
+            table, records=records, columns=columns
+        )
+
+        return int(status.rsplit(maxsplit=1)[-1])
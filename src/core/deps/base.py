@@ -19,17 +19,25 @@ class UvicornLoggerProvider(BaseProvider):
 
 
 def get_deps() -> tuple[Provider, ...]:
+    from src.core.deps.breakers import WindowCircuitBreakerProvider
+    from src.core.deps.caches import TieredCacheProvider
     from src.core.deps.db import RedisProvider, SQLAlchemyProvider
+    from src.core.deps.executors import PoolExecutorProvider
     from src.core.deps.external_api import HTTPXProvider
     from src.core.deps.mail import AIOSMTPLibProvider
     from src.core.deps.paginators import FastAPIPaginationProvider
+    from src.core.deps.reporters import LoggingStatsReporterProvider
 
     return (
         FastapiProvider(),
         UvicornLoggerProvider(),
+        WindowCircuitBreakerProvider(),
         SQLAlchemyProvider(),
         FastAPIPaginationProvider(),
         RedisProvider(),
+        TieredCacheProvider(),
         AIOSMTPLibProvider(),
         HTTPXProvider(),
+        PoolExecutorProvider(),
+        LoggingStatsReporterProvider(),
     )
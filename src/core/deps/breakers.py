@@ -0,0 +1,51 @@
+from dishka import provide
+
+from src.core import external_api
+from src.core.db import sessions
+from src.core.db.sessions import DBSession
+from src.core.deps.base import BaseProvider
+from src.core.external_api import RESTSession
+from src.core.settings import BreakerSettings
+from src.core.utils import mail
+from src.core.utils.breakers import CircuitBreaker, WindowCircuitBreaker
+from src.core.utils.loggers import Logger
+from src.core.utils.mail import MailSession
+
+
+class WindowCircuitBreakerProvider(BaseProvider):
+    @provide
+    def get_breaker_settings(self) -> BreakerSettings:
+        return BreakerSettings.load()
+
+    @provide(provides=CircuitBreaker[RESTSession])
+    def get_external_api_breaker(
+        self, settings: BreakerSettings, logger: Logger
+    ) -> WindowCircuitBreaker[RESTSession]:
+        return WindowCircuitBreaker(
+            _settings=settings,
+            _logger=logger,
+            _name="the external API",
+            _is_failure=lambda exc: isinstance(exc, external_api.CONN_ERRORS),
+        )
+
+    @provide(provides=CircuitBreaker[MailSession])
+    def get_mail_breaker(
+        self, settings: BreakerSettings, logger: Logger
+    ) -> WindowCircuitBreaker[MailSession]:
+        return WindowCircuitBreaker(
+            _settings=settings,
+            _logger=logger,
+            _name="the mail server",
+            _is_failure=lambda exc: isinstance(exc, mail.CONN_ERRORS),
+        )
+
+    @provide(provides=CircuitBreaker[DBSession])
+    def get_db_breaker(
+        self, settings: BreakerSettings, logger: Logger
+    ) -> WindowCircuitBreaker[DBSession]:
+        return WindowCircuitBreaker(
+            _settings=settings,
+            _logger=logger,
+            _name="the DB",
+            _is_failure=sessions.is_conn_error,
+        )
@@ -0,0 +1,20 @@
+from dishka import provide
+
+from src.core.deps.base import BaseProvider
+from src.core.deps.db import (
+    Redis_,  # Is resolved by Dishka in runtime.
+)
+from src.core.settings import ReadCacheSettings
+from src.core.utils.caches import Cache, TieredCache
+
+
+class TieredCacheProvider(BaseProvider):
+    @provide
+    def get_read_cache_settings(self) -> ReadCacheSettings:
+        return ReadCacheSettings.load()
+
+    @provide(provides=Cache)
+    def get_cache(
+        self, redis_: Redis_, settings: ReadCacheSettings
+    ) -> TieredCache:
+        return TieredCache(_redis=redis_, _settings=settings)
@@ -10,13 +10,14 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
-from src.core.db.sessions import SQLAlchemySession
+from src.core.db.sessions import DBSession, SQLAlchemySession
 from src.core.deps.base import BaseProvider
 from src.core.settings import (
     DBCredentials,
     DBSettings,
     RedisCredentials,
 )
+from src.core.utils.breakers import CircuitBreaker
 
 # Generic in stubs, but not in runtime: https://github.com/python/typeshed/issues/8242.
 if TYPE_CHECKING:
@@ -51,12 +52,14 @@ class SQLAlchemyProvider(BaseProvider):
         self,
         engine: AsyncEngine,
         settings: DBSettings,
+        breaker: CircuitBreaker[DBSession],
     ) -> async_sessionmaker[SQLAlchemySession]:
         return async_sessionmaker(
             engine,
             class_=SQLAlchemySession,
             expire_on_commit=False,
             settings=settings,
+            breaker=breaker,
         )
 
     @provide(scope=Scope.REQUEST)
@@ -0,0 +1,44 @@
+import asyncio
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import (
+    Executor as Pool,
+)
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from dishka import provide
+
+from src.core.deps.base import BaseProvider
+from src.core.settings import ExecutorSettings
+from src.core.utils.executors import Executor, PoolExecutor
+
+
+class PoolExecutorProvider(BaseProvider):
+    @provide
+    def get_executor_settings(self) -> ExecutorSettings:
+        return ExecutorSettings.load()
+
+    @provide
+    def get_pool(self, settings: ExecutorSettings) -> Iterator[Pool]:
+        # Forking a process with running threads (e.g. of the DB driver) is
+        # unsafe.
+        pool = (
+            ProcessPoolExecutor(
+                settings.concurrency,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+            if settings.is_process
+            else ThreadPoolExecutor(
+                settings.concurrency, thread_name_prefix="executor"
+            )
+        )
+        yield pool
+        pool.shutdown(cancel_futures=True)
+
+    @provide(provides=Executor)
+    def get_executor(
+        self, pool: Pool, settings: ExecutorSettings
+    ) -> PoolExecutor:
+        return PoolExecutor(
+            _pool=pool, _semaphore=asyncio.Semaphore(settings.concurrency)
+        )
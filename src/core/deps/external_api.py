@@ -1,14 +1,32 @@
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncIterator
+from time import monotonic
 
 from dishka import Scope, provide
-from httpx import AsyncBaseTransport, AsyncHTTPTransport
+from httpx import AsyncBaseTransport, AsyncClient, AsyncHTTPTransport, Limits
 
 from src.core.deps.base import BaseProvider
+from src.core.deps.db import (
+    Redis_,  # Is resolved by Dishka in runtime.
+)
 from src.core.external_api import (
+    CachedRESTSession,
     HTTPXSession,
+    RedisResponseCache,
+    ResponseCache,
     RESTSession,
 )
-from src.core.settings import ExternalAPISettings
+from src.core.settings import (
+    ExternalAPISettings,
+    RateLimitSettings,
+    ResponseCacheSettings,
+)
+from src.core.utils.breakers import CircuitBreaker
+from src.core.utils.limiters import (
+    RATE_LIMIT_SCRIPT,
+    RateLimiter,
+    RedisRateLimiter,
+)
+from src.core.utils.loggers import Logger
 
 
 class HTTPXProvider(BaseProvider):
@@ -16,21 +34,92 @@ class HTTPXProvider(BaseProvider):
     def get_external_api_settings(self) -> ExternalAPISettings:
         return ExternalAPISettings.load()
 
+    @provide
+    def get_response_cache_settings(self) -> ResponseCacheSettings:
+        return ResponseCacheSettings.load()
+
+    @provide
+    def get_rate_limit_settings(self) -> RateLimitSettings:
+        return RateLimitSettings.load()
+
     @provide(provides=AsyncBaseTransport)
     def get_transport_provider(
         self,
         settings: ExternalAPISettings,
     ) -> AsyncHTTPTransport:
-        return AsyncHTTPTransport(retries=settings.retries)
+        return AsyncHTTPTransport(
+            retries=settings.retries,
+            limits=Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            http2=settings.is_http2,
+        )
 
-    @provide(scope=Scope.REQUEST, provides=RESTSession)
-    async def get_session(
+    @provide
+    async def get_client(
         self,
         settings: ExternalAPISettings,
         transport: AsyncBaseTransport,
-    ) -> AsyncGenerator[HTTPXSession]:
-        async with HTTPXSession(
+    ) -> AsyncIterator[AsyncClient]:
+        """
+        Is closed with the container in the lifespan.
+        """
+        async with AsyncClient(
+            transport=transport, timeout=settings.timeout
+        ) as client:
+            yield client
+
+    @provide(provides=ResponseCache)
+    async def get_response_cache(
+        self,
+        redis_: Redis_,
+        settings: ResponseCacheSettings,
+        logger: Logger,
+    ) -> AsyncIterator[RedisResponseCache]:
+        cache = RedisResponseCache(
+            _redis=redis_, _settings=settings, _logger=logger
+        )
+        yield cache
+        await cache.close()
+
+    @provide(provides=RateLimiter)
+    def get_rate_limiter(
+        self,
+        redis_: Redis_,
+        settings: RateLimitSettings,
+        api_settings: ExternalAPISettings,
+    ) -> RedisRateLimiter:
+        return RedisRateLimiter(
+            _script=redis_.register_script(RATE_LIMIT_SCRIPT),
+            _settings=settings,
+            _request_time=min(settings.request_time, api_settings.timeout),
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_httpx_session(
+        self,
+        settings: ExternalAPISettings,
+        client: AsyncClient,
+        limiter: RateLimiter,
+        breaker: CircuitBreaker[RESTSession],
+    ) -> HTTPXSession:
+        return HTTPXSession(
             _settings=settings,
-            transport=transport,
-        ) as session:
-            yield session
+            _client=client,
+            _limiter=limiter,
+            _breaker=breaker,
+            _deadline=monotonic() + settings.deadline,
+        )
+
+    @provide(scope=Scope.REQUEST, provides=RESTSession)
+    def get_session(
+        self,
+        settings: ExternalAPISettings,
+        session: HTTPXSession,
+        cache: ResponseCache,
+    ) -> CachedRESTSession:
+        return CachedRESTSession(
+            _settings=settings, _session=session, _cache=cache
+        )
@@ -5,6 +5,7 @@ from dishka import Scope, provide
 
 from src.core.deps.base import BaseProvider
 from src.core.settings import MailSettings
+from src.core.utils.breakers import CircuitBreaker
 from src.core.utils.mail import (
     AIOSMTPLibSession,
     MailSession,
@@ -17,8 +18,11 @@ class AIOSMTPLibProvider(BaseProvider):
         return MailSettings.load()
 
     @provide(scope=Scope.REQUEST, provides=MailSession)
-    async def get_session(self, settings: MailSettings) -> AsyncGenerator[SMTP]:
+    async def get_session(
+        self, settings: MailSettings, breaker: CircuitBreaker[MailSession]
+    ) -> AsyncGenerator[SMTP]:
         async with AIOSMTPLibSession(
             settings=settings,
+            breaker=breaker,
         ) as session:
             yield session
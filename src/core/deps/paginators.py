@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, Protocol
 
-from dishka import AnyOf, provide
+from dishka import provide
 from fastapi_pagination.ext.sqlalchemy import (
     AsyncConn,
     Selectable,
@@ -13,7 +13,18 @@ from sqlalchemy import Select
 
 from src.core.db.sessions import SQLAlchemySession
 from src.core.deps.base import BaseProvider
-from src.core.utils.paginators import DBPaginator, FastAPIPagination, Paginate
+from src.core.deps.db import (
+    Redis_,  # noqa: TC001 # Is resolved by Dishka in runtime.
+)
+from src.core.settings import PaginationSettings
+from src.core.utils.paginators import (
+    DBCounter,
+    DBPaginator,
+    FastAPIPagination,
+    Paginate,
+    SQLAlchemyCounter,
+    SQLAlchemyPagination,
+)
 
 if TYPE_CHECKING:
     from fastapi_pagination.bases import AbstractParams
@@ -51,16 +62,47 @@ class FastAPIPaginationProvider(BaseProvider):
     ) -> SQLAlchemyPaginate:
         return apaginate
 
-    @provide(
-        provides=AnyOf[
-            DBPaginator[SQLAlchemySession, Select[Any]],
-            FastAPIPagination[SQLAlchemySession, Select[Any]],
-        ]
-    )
-    def get_paginator(
+    @provide
+    def get_pagination_settings(self) -> PaginationSettings:
+        return PaginationSettings.load()
+
+    @provide(provides=DBCounter[SQLAlchemySession, Select[Any]])
+    def get_counter(
+        self,
+        redis_: Redis_,
+        settings: PaginationSettings,
+    ) -> SQLAlchemyCounter:
+        return SQLAlchemyCounter(_redis=redis_, _settings=settings)
+
+    @provide
+    def get_fastapi_pagination(
         self,
         paginate: Paginate[SQLAlchemySession, Select[Any], ...],
+        counter: DBCounter[SQLAlchemySession, Select[Any]],
     ) -> FastAPIPagination[SQLAlchemySession, Select[Any]]:
         return FastAPIPagination[SQLAlchemySession, Select[Any]](
-            _paginate=paginate
+            _paginate=paginate,
+            _counter=counter,
         )
+
+    @provide
+    def get_sqlalchemy_pagination(
+        self,
+        counter: DBCounter[SQLAlchemySession, Select[Any]],
+    ) -> SQLAlchemyPagination:
+        return SQLAlchemyPagination(_counter=counter)
+
+    @provide
+    def get_paginator(
+        self,
+        settings: PaginationSettings,
+        fastapi_pagination: FastAPIPagination[SQLAlchemySession, Select[Any]],
+        sqlalchemy_pagination: SQLAlchemyPagination,
+    ) -> DBPaginator[SQLAlchemySession, Select[Any]]:
+        """
+        Both implementations are kept available to be compared with each
+        other.
+        """
+        if settings.is_native:
+            return sqlalchemy_pagination
+        return fastapi_pagination
@@ -0,0 +1,39 @@
+from dishka import provide
+
+from src.core.db.sessions import DBSession
+from src.core.deps.base import BaseProvider
+from src.core.external_api import RESTSession
+from src.core.settings import StatsSettings
+from src.core.utils.breakers import CircuitBreaker
+from src.core.utils.executors import Executor
+from src.core.utils.loggers import Logger
+from src.core.utils.mail import MailSession
+from src.core.utils.reporters import LoggingStatsReporter, StatsReporter
+
+
+class LoggingStatsReporterProvider(BaseProvider):
+    @provide
+    def get_stats_settings(self) -> StatsSettings:
+        return StatsSettings.load()
+
+    @provide(provides=StatsReporter)
+    def get_reporter(  # noqa: PLR0913 # Each source is a separate dependency.
+        self,
+        settings: StatsSettings,
+        logger: Logger,
+        executor: Executor,
+        db_breaker: CircuitBreaker[DBSession],
+        mail_breaker: CircuitBreaker[MailSession],
+        external_api_breaker: CircuitBreaker[RESTSession],
+    ) -> LoggingStatsReporter:
+        # States of the breakers are logged by themselves, when they change.
+        return LoggingStatsReporter(
+            _settings=settings,
+            _logger=logger,
+            _sources={
+                "the executor": executor,
+                "the DB breaker": db_breaker,
+                "the mail server breaker": mail_breaker,
+                "the external API breaker": external_api_breaker,
+            },
+        )
@@ -46,6 +46,12 @@ class OpenAPIError(NonDetailedError):
         self.key: Final = key
 
 
+class CircuitOpenError(NonDetailedError, ConnectionError):
+    def __init__(self, name: str) -> None:
+        super().__init__(f"The circuit of {name} is open.")
+        self.name: Final = name
+
+
 class DBConnError(NonDetailedError, ConnectionError):
     def __init__(
         self,
@@ -1,18 +1,39 @@
+import asyncio
+import hashlib
+import json
+import zlib
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from http import HTTPMethod
-from typing import Any, Final, Literal, cast, override
+from collections import Counter
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import partial
+from http import HTTPMethod, HTTPStatus
+from time import monotonic, time
+from types import MappingProxyType
+from typing import Any, ClassVar, Final, Literal, cast, override
 
 from httpx import (
+    URL,
     AsyncClient,
     HTTPStatusError,
     RequestError,
     Response,
 )
+from redis.exceptions import RedisError
 
-from src.core.errors import ExternalAPIConnError, ExternalRESTResponseError
-from src.core.schemas import JSON
-from src.core.settings import ExternalAPISettings
+from src.core.deps.db import Redis_
+from src.core.errors import (
+    CircuitOpenError,
+    ExternalAPIConnError,
+    ExternalRESTResponseError,
+)
+from src.core.schemas import JSON, Priority
+from src.core.settings import ExternalAPISettings, ResponseCacheSettings
+from src.core.utils.breakers import CircuitBreaker
+from src.core.utils.flights import SingleFlight
+from src.core.utils.limiters import RateLimiter
+from src.core.utils.loggers import Logger
 
 type Method = Literal[
     HTTPMethod.GET,
@@ -33,6 +54,21 @@ type JSONReturningMethod = Literal[
     HTTPMethod.DELETE,
 ]
 
+CONN_ERRORS: Final = (RequestError,)
+
+# Sends a request with the given conditional headers.
+type Fetch = Callable[[Mapping[str, str], Priority], Awaitable[Response]]
+
+
+def _raise_for_status(response: Response) -> Response:
+    try:
+        return response.raise_for_status()
+    except HTTPStatusError as exc:
+        raise ExternalRESTResponseError(
+            exc.response.json(),
+            code=exc.response.status_code,
+        ) from exc
+
 
 @dataclass(kw_only=True, slots=True)
 class APISession(ABC):
@@ -51,26 +87,55 @@ class RESTSession(APISession):
         raise NotImplementedError
 
 
-class HTTPXSession(AsyncClient, RESTSession):
-    def __init__(self, **kwargs: Any) -> None:
-        super().__init__(
-            timeout=self._settings.timeout,
-            **kwargs,
-        )
+@dataclass(kw_only=True, slots=True)
+class HTTPXSession(RESTSession):
+    """
+    Is created for each request, unlike the client, so connections (and their
+    TLS sessions) are reused across requests.
+    """
+
+    _client: AsyncClient
+    _limiter: RateLimiter
+    _breaker: CircuitBreaker[RESTSession]
+    # By the monotonic clock, bounds all calls made while handling a request.
+    _deadline: float
 
-    @override
     async def request(
         self,
-        *args: Any,
+        method: Method,
+        url: str,
+        *,
+        priority: Priority = Priority.INTERACTIVE,
         **kwargs: Any,
     ) -> Response:
+        if self._deadline <= monotonic():
+            msg = "The deadline of external API calls is exceeded."
+            raise ExternalAPIConnError(msg)
+
         try:
-            return await super().request(
-                *args,
-                **kwargs,
+            return await self._breaker.run(
+                self._send, method, url, priority, kwargs
             )
         except RequestError as exc:
             raise ExternalAPIConnError(exc.args[0]) from exc
+        except CircuitOpenError as exc:
+            raise ExternalAPIConnError(exc.msg) from exc
+
+    async def _send(
+        self,
+        method: Method,
+        url: str,
+        priority: Priority,
+        kwargs: dict[str, Any],
+    ) -> Response:
+        await self._limiter.acquire(URL(url).host, priority, self._deadline)
+        # The token may be reserved up to the deadline itself.
+        if (remaining := self._deadline - monotonic()) <= 0:
+            msg = "The deadline of external API calls is exceeded."
+            raise ExternalAPIConnError(msg)
+        kwargs.setdefault("timeout", min(self._settings.timeout, remaining))
+
+        return await self._client.request(method, url, **kwargs)
 
     @override
     async def request_json(
@@ -80,17 +145,251 @@ class HTTPXSession(AsyncClient, RESTSession):
         method: JSONReturningMethod,
         **kwargs: Any,
     ) -> JSON:
+        return cast(
+            JSON,
+            _raise_for_status(await self.request(method, url, **kwargs)).json(),
+        )
+
+
+class ResponseCache(ABC):
+    @abstractmethod
+    async def get_or_fetch(self, url: str, fetch: Fetch) -> bytes:
+        """
+        Returns the body of a successful response, which may be a stale one
+        while it is refreshed in the background.
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def stats(self) -> Mapping[str, int]:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class RedisResponseCache(ResponseCache):
+    """
+    Keeps compressed bodies in Redis with their validators, if the upstream
+    has sent any, so a stale body is refreshed by a conditional request. Only
+    one worker refreshes it, while the rest keep returning the stale one.
+
+    Concurrent identical requests are made only once by each worker, and, if
+    their responses are cached, by all workers.
+
+    Redis is only an optimization, so its unavailability falls back to the
+    upstream.
+    """
+
+    _redis: Redis_
+    _settings: ResponseCacheSettings
+    _logger: Logger
+
+    _flight: SingleFlight[str, bytes] = field(default_factory=SingleFlight)
+    # Are kept, since the loop holds only weak references to tasks.
+    _refreshes: dict[str, asyncio.Task[None]] = field(default_factory=dict)
+    _stats: Counter[str] = field(default_factory=Counter)
+
+    # Bounds the refresh of a single worker, e.g. a stuck one.
+    REFRESH_LOCK_TIME: ClassVar = 60
+    # Other workers are polled while they make the same request.
+    POLL_INTERVAL: ClassVar = 0.05
+
+    @staticmethod
+    def _get_key(url: str) -> str:
+        # Query parameters may be arbitrarily long and contain secrets.
+        digest = hashlib.sha1(url.encode()).hexdigest()  # noqa: S324 # Is not used for security purposes.
+        return f"response:{digest}"
+
+    @override
+    async def get_or_fetch(self, url: str, fetch: Fetch) -> bytes:
+        key = self._get_key(url)
+        if not (time_ := self._settings.get_time(url)):
+            return await self._flight.run(key, partial(self._fetch, fetch))
+
+        cached = await self._get(key)
+        if not cached:
+            return await self._flight.run(
+                key, partial(self._load, key, fetch, time_)
+            )
+
+        if float(cached[b"fresh_until"]) > time():
+            self._stats["hits"] += 1
+        else:
+            self._stats["stale_hits"] += 1
+            self._refresh(key, cached, fetch, time_)
+
+        return zlib.decompress(cached[b"body"])
+
+    async def _get(self, key: str) -> dict[bytes, bytes]:
+        try:
+            # The client does not decode responses, unlike the stubs of
+            # Redis_ say.
+            return cast(dict[bytes, bytes], await self._redis.hgetall(key))
+        except RedisError:
+            return {}
+
+    @staticmethod
+    async def _fetch(fetch: Fetch) -> bytes:
+        return (await fetch({}, Priority.INTERACTIVE)).content
+
+    async def _load(self, key: str, fetch: Fetch, time_: int) -> bytes:
+        lock = f"{key}:lock"
+        is_locked = is_waiting = False
+        if self._settings.lock_time:
+            with suppress(RedisError):
+                is_locked = bool(
+                    await self._redis.set(
+                        lock,
+                        1,
+                        nx=True,
+                        px=int(self._settings.lock_time * 1000),
+                    )
+                )
+                is_waiting = not is_locked
+
+        # Another worker is already making the same request.
+        if is_waiting:
+            deadline = monotonic() + self._settings.lock_time
+            while monotonic() < deadline:
+                await asyncio.sleep(self.POLL_INTERVAL)
+                if cached := await self._get(key):
+                    self._stats["remote_coalesced"] += 1
+                    return zlib.decompress(cached[b"body"])
+
+        self._stats["misses"] += 1
+        try:
+            response = await fetch({}, Priority.INTERACTIVE)
+            await self._store(key, response, time_)
+        finally:
+            if is_locked:
+                with suppress(RedisError):
+                    await self._redis.delete(lock)
+
+        return response.content
+
+    def _refresh(
+        self, key: str, cached: Mapping[bytes, bytes], fetch: Fetch, time_: int
+    ) -> None:
+        if key in self._refreshes:
+            return
+
+        task = asyncio.create_task(self._revalidate(key, cached, fetch, time_))
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+
+    async def _revalidate(
+        self, key: str, cached: Mapping[bytes, bytes], fetch: Fetch, time_: int
+    ) -> None:
+        lock = f"{key}:refresh"
         try:
-            return cast(
-                JSON,
-                (
-                    (await self.request(url=url, method=method, **kwargs))
-                    .raise_for_status()
-                    .json()
-                ),
+            if not await self._redis.set(
+                lock, 1, nx=True, ex=self.REFRESH_LOCK_TIME
+            ):
+                return
+
+            validators = {
+                header: cached[name].decode()
+                for header, name in (
+                    ("If-None-Match", b"etag"),
+                    ("If-Modified-Since", b"last_modified"),
+                )
+                if name in cached
+            }
+            response = await fetch(validators, Priority.BACKGROUND)
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                self._stats["revalidations"] += 1
+                await (
+                    self._redis.pipeline(transaction=False)
+                    .hset(key, "fresh_until", time() + time_)
+                    .expire(key, time_ + self._settings.stale_time)
+                    .execute()
+                )
+            else:
+                self._stats["refreshes"] += 1
+                await self._store(key, response, time_)
+
+            await self._redis.delete(lock)
+        # Otherwise, the refresh is retried after the lock expires.
+        except Exception:
+            self._logger.exception("Failed to refresh a cached response.")
+
+    async def _store(self, key: str, response: Response, time_: int) -> None:
+        mapping: dict[str, bytes | float | str] = {
+            "body": zlib.compress(response.content),
+            "fresh_until": time() + time_,
+        }
+        for name, header in (
+            ("etag", "ETag"),
+            ("last_modified", "Last-Modified"),
+        ):
+            if (value := response.headers.get(header)) is not None:
+                mapping[name] = value
+
+        with suppress(RedisError):
+            await (
+                self._redis.pipeline(transaction=False)
+                .delete(key)
+                .hset(key, mapping=mapping)
+                .expire(key, time_ + self._settings.stale_time)
+                .execute()
+            )
+
+    async def close(self) -> None:
+        for task in tuple(self._refreshes.values()):
+            task.cancel()
+        await asyncio.gather(*self._refreshes.values(), return_exceptions=True)
+
+    @property
+    @override
+    def stats(self) -> Mapping[str, int]:
+        return MappingProxyType(Counter({**self._stats, **self._flight.stats}))
+
+
+@dataclass(kw_only=True, slots=True)
+class CachedRESTSession(RESTSession):
+    """
+    Answers GET requests from the cache, so hits (and requests coalesced with
+    identical ones) do not spend the quota of the upstream.
+    """
+
+    _session: HTTPXSession
+    _cache: ResponseCache
+
+    @override
+    async def request_json(
+        self,
+        *,
+        url: str,
+        method: JSONReturningMethod,
+        **kwargs: Any,
+    ) -> JSON:
+        if method != HTTPMethod.GET:
+            return await self._session.request_json(
+                url=url, method=method, **kwargs
             )
-        except HTTPStatusError as exc:
-            raise ExternalRESTResponseError(
-                exc.response.json(),
-                code=exc.response.status_code,
-            ) from exc
+
+        body = await self._cache.get_or_fetch(
+            str(URL(url, params=kwargs.get("params"))),
+            partial(self._fetch, url, kwargs),
+        )
+        return cast(JSON, json.loads(body))
+
+    async def _fetch(
+        self,
+        url: str,
+        kwargs: Mapping[str, Any],
+        validators: Mapping[str, str],
+        priority: Priority,
+    ) -> Response:
+        response = await self._session.request(
+            HTTPMethod.GET,
+            url,
+            priority=priority,
+            **{
+                **kwargs,
+                "headers": {**kwargs.get("headers", {}), **validators},
+            },
+        )
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return response
+        return _raise_for_status(response)
@@ -1,7 +1,8 @@
 import re
-from collections.abc import Callable, Sequence
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass
 from enum import StrEnum
-from functools import wraps
+from functools import cache, wraps
 from types import CoroutineType
 from typing import Annotated, Any, Final, Self
 
@@ -11,6 +12,7 @@ from pydantic import (
     Field,
     NonNegativeInt,
     PositiveInt,
+    create_model,
 )
 from pydantic.alias_generators import to_camel
 
@@ -61,6 +63,26 @@ class Schema(BaseModel):
         return wrapper  # type: ignore[return-value] # MyPy doesn't support CoroutineType properly (unlike Pyright): https://github.com/python/mypy/issues/18635.
 
 
+@cache
+def get_subset(schema: type[Schema], fields: frozenset[str]) -> type[Schema]:
+    """
+    Derives a schema with the given fields only. Is cached, since Pydantic
+    builds a validator and a serializer for each new schema.
+    """
+    if fields >= schema.model_fields.keys():
+        return schema
+
+    return create_model(  # type: ignore[call-overload, no-any-return] # pyright: ignore[reportCallIssue] # Field definitions are built dynamically.
+        f"{schema.__name__}Subset",
+        __base__=Schema,
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in fields
+        },
+    )
+
+
 class DBSchema(Schema):
     id: Annotated[int, Field(frozen=True)]
 
@@ -70,27 +92,92 @@ class OrderBy(StrEnum):
     DESC = "desc"
 
 
+class Total(StrEnum):
+    """
+    An exact total may cost more than the page itself on large tables, so it
+    can be approximated by the DB planner or omitted.
+    """
+
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    OFF = "off"
+
+
+class ExportFormat(StrEnum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ColumnarFormat(StrEnum):
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class Priority(StrEnum):
+    """
+    Background requests (e.g. refreshes of cached responses) never use up the
+    share of a rate limit reserved for interactive ones.
+    """
+
+    INTERACTIVE = "interactive"
+    BACKGROUND = "background"
+
+
 class BaseOffsetPage[SchemaT: Schema](Schema):
     items: Sequence[SchemaT]
-    total: NonNegativeInt
+    total: NonNegativeInt | None = None
 
     page: PositiveInt
     size: PositiveInt
-    pages: NonNegativeInt
+    pages: NonNegativeInt | None = None
 
 
 class BaseCursorPage[SchemaT: Schema](Schema):
     items: Sequence[SchemaT]
-    total: NonNegativeInt
+    total: NonNegativeInt | None = None
 
     current_page: str | None = None
     previous_page: str | None = None
     next_page: str | None = None
 
 
+@dataclass(kw_only=True, slots=True, frozen=True)
+class Tagged:
+    """
+    Serialized content with its strong entity tag. The content is omitted when
+    the client already has the current one.
+    """
+
+    etag: str
+    content: bytes | None = None
+
+    @staticmethod
+    def is_current(etag: str, etags: Collection[str]) -> bool:
+        return etag in etags or "*" in etags
+
+    def to_bytes(self) -> bytes:
+        return f"{self.etag}\n".encode() + (self.content or b"")
+
+    @classmethod
+    def from_bytes(cls, raw: bytes, etags: Collection[str] = ()) -> Self:
+        encoded, content = raw.split(b"\n", 1)
+        etag = encoded.decode()
+
+        return cls(
+            etag=etag, content=None if cls.is_current(etag, etags) else content
+        )
+
+
 class OffsetSearch(Schema):
     page: PositiveInt = 1
     size: PositiveInt
+    include_total: Total = Total.EXACT
 
 
 class OffsetSortingSearch(OffsetSearch):
@@ -100,6 +187,7 @@ class OffsetSortingSearch(OffsetSearch):
 class CursorSearch(Schema):
     next_page: str | None = None
     size: PositiveInt
+    include_total: Total = Total.EXACT
 
 
 class CursorSortingSearch(CursorSearch):
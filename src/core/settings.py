@@ -2,14 +2,18 @@ from abc import ABC, abstractmethod
 from collections.abc import Sequence
 from http import HTTPMethod
 from typing import Annotated, Self, override
+from urllib.parse import urlsplit
 
 from pydantic import (
     EmailStr,
     Field,
     HttpUrl,
+    NonNegativeFloat,
+    NonNegativeInt,
     PositiveFloat,
     PositiveInt,
     field_serializer,
+    model_validator,
 )
 from pydantic_core.core_schema import SerializerFunctionWrapHandler
 from pydantic_extra_types.semantic_version import SemanticVersion
@@ -68,6 +72,89 @@ class DBSettings(Settings):
     ] = 5
 
 
+class PaginationSettings(Settings):
+    is_native: Annotated[
+        bool,
+        Field(validation_alias="native_pagination"),
+    ] = False
+    total_cache_time: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="pagination_total_cache_time"),
+    ] = 60
+    is_projected: Annotated[
+        bool,
+        Field(validation_alias="projected_pagination"),
+    ] = False
+    is_json: Annotated[
+        bool,
+        Field(validation_alias="json_pagination"),
+    ] = True
+    users_preview: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="company_users_preview"),
+    ] = 10
+    export_size: Annotated[
+        PositiveInt,
+        Field(validation_alias="export_fetch_size"),
+    ] = 1000
+
+
+class ReadCacheSettings(Settings):
+    time: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="read_cache_time"),
+    ] = 60
+    local_time: Annotated[
+        NonNegativeFloat,
+        Field(validation_alias="read_cache_local_time"),
+    ] = 5
+    local_size: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="read_cache_local_size"),
+    ] = 1000
+    lock_time: Annotated[
+        PositiveFloat,
+        Field(validation_alias="read_cache_lock_time"),
+    ] = 5
+
+
+class BreakerSettings(Settings):
+    window: Annotated[
+        PositiveFloat,
+        Field(validation_alias="breaker_window"),
+    ] = 30
+    failure_rate: Annotated[
+        PositiveFloat,
+        Field(le=1, validation_alias="breaker_failure_rate"),
+    ] = 0.5
+    min_calls: Annotated[
+        PositiveInt,
+        Field(validation_alias="breaker_min_calls"),
+    ] = 5
+    open_time: Annotated[
+        PositiveFloat,
+        Field(validation_alias="breaker_open_time"),
+    ] = 30
+
+
+class ExecutorSettings(Settings):
+    is_process: Annotated[
+        bool,
+        Field(validation_alias="process_executor"),
+    ] = False
+    concurrency: Annotated[
+        PositiveInt,
+        Field(validation_alias="executor_concurrency"),
+    ] = 2
+
+
+class StatsSettings(Settings):
+    interval: Annotated[
+        NonNegativeFloat,
+        Field(validation_alias="stats_log_interval"),
+    ] = 60
+
+
 class ExternalAPISettings(Settings):
     api_fns_token: Annotated[str, Field(pattern=SHA_1)]
 
@@ -79,6 +166,76 @@ class ExternalAPISettings(Settings):
         PositiveInt,
         Field(validation_alias="external_api_retries"),
     ] = 3
+    deadline: Annotated[
+        PositiveFloat,
+        Field(validation_alias="external_api_deadline"),
+    ] = 60.0
+
+    max_connections: Annotated[
+        PositiveInt,
+        Field(validation_alias="external_api_max_connections"),
+    ] = 100
+    max_keepalive_connections: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="external_api_max_keepalive_connections"),
+    ] = 20
+    keepalive_expiry: Annotated[
+        NonNegativeFloat,
+        Field(validation_alias="external_api_keepalive_expiry"),
+    ] = 5.0
+    is_http2: Annotated[
+        bool,
+        Field(validation_alias="external_api_http2"),
+    ] = False
+
+
+class RateLimitSettings(Settings):
+    # Per second, for each API host.
+    rate: Annotated[
+        PositiveFloat,
+        Field(validation_alias="external_api_rate_limit"),
+    ] = 10
+    burst: Annotated[
+        PositiveInt,
+        Field(validation_alias="external_api_rate_limit_burst"),
+    ] = 10
+    # A share of the burst.
+    reserve: Annotated[
+        NonNegativeFloat,
+        Field(le=1, validation_alias="external_api_rate_limit_reserve"),
+    ] = 0.5
+    queue_size: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="external_api_rate_limit_queue_size"),
+    ] = 100
+    # Is capped by the timeout.
+    request_time: Annotated[
+        NonNegativeFloat,
+        Field(validation_alias="external_api_rate_limit_request_time"),
+    ] = 1
+
+
+class ResponseCacheSettings(Settings):
+    time: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="response_cache_time"),
+    ] = 86400
+    # By URL paths, e.g. {"/api/egr": 86400}.
+    endpoint_times: Annotated[
+        dict[str, NonNegativeInt],
+        Field(validation_alias="response_cache_endpoint_times"),
+    ] = {}
+    stale_time: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="response_cache_stale_time"),
+    ] = 604800
+    lock_time: Annotated[
+        NonNegativeFloat,
+        Field(validation_alias="response_cache_lock_time"),
+    ] = 5
+
+    def get_time(self, url: str) -> int:
+        return self.endpoint_times.get(urlsplit(url).path, self.time)
 
 
 class MailSettings(Settings):
@@ -124,6 +281,36 @@ class AuthSettings(Settings):
 
     sys_email: EmailStr
 
+    is_stateless: Annotated[
+        bool,
+        Field(validation_alias="stateless_auth"),
+    ] = False
+    access_token_secret: NonEmptyStr | None = None
+    access_token_lifetime: PositiveInt = 300
+    session_lifetime: PositiveInt = 3600
+
+    @model_validator(mode="after")
+    def check_secret(self) -> Self:
+        if self.is_stateless and self.access_token_secret is None:
+            msg = "Stateless authentication requires a secret."
+            raise ValueError(msg)
+        return self
+
+
+class UserCacheSettings(Settings):
+    time: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="user_cache_time"),
+    ] = 30
+    local_time: Annotated[
+        NonNegativeFloat,
+        Field(validation_alias="user_cache_local_time"),
+    ] = 1
+    local_size: Annotated[
+        NonNegativeInt,
+        Field(validation_alias="user_cache_local_size"),
+    ] = 1000
+
 
 class TrustedHostsSettings(Settings):
     hosts: Annotated[
@@ -0,0 +1,158 @@
+from abc import ABC, abstractmethod
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable, Mapping
+from dataclasses import dataclass, field
+from time import monotonic
+from types import MappingProxyType
+from typing import override
+
+from src.core.errors import CircuitOpenError
+from src.core.schemas import CircuitState
+from src.core.settings import BreakerSettings
+from src.core.utils.loggers import Logger
+
+
+class CircuitBreaker[SessionT](ABC):
+    """
+    Is parametrized by the guarded session, so each dependency has its own.
+    """
+
+    @abstractmethod
+    async def run[**P, T](
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """
+        Fails at once with CircuitOpenError while the dependency is considered
+        unavailable.
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def state(self) -> CircuitState:
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def stats(self) -> Mapping[str, int]:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True)
+class WindowCircuitBreaker[SessionT](CircuitBreaker[SessionT]):
+    """
+    Opens when the share of failed calls within the window reaches the
+    threshold, so calls fail at once instead of waiting for timeouts. After
+    the open time, a single trial call is made: its success closes the
+    breaker, while its failure opens it again.
+
+    Only the exceptions recognized as failures are counted, while the rest
+    (e.g. errors in responses) are not counted at all. Each state change
+    starts a new generation, so results of calls started before it are late
+    and ignored.
+    """
+
+    _settings: BreakerSettings
+    _logger: Logger
+    _name: str
+    _is_failure: Callable[[Exception], bool]
+
+    # Times and results of calls within the window, the oldest first.
+    _calls: deque[tuple[float, bool]] = field(default_factory=deque)
+    _failed: int = 0
+    _state: CircuitState = CircuitState.CLOSED
+    _opened_at: float = 0
+    _is_trying: bool = False
+    _generation: int = 0
+    _stats: Counter[str] = field(default_factory=Counter)
+
+    @override
+    async def run[**P, T](
+        self, func: Callable[P, Awaitable[T]], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        generation = self._admit()
+        try:
+            value = await func(*args, **kwargs)
+        except Exception as exc:
+            if self._is_failure(exc):
+                self._record(generation, is_failed=True)
+            else:
+                self._end_trial(generation)
+            raise
+        except BaseException:
+            self._end_trial(generation)
+            raise
+        self._record(generation, is_failed=False)
+
+        return value
+
+    def _admit(self) -> int:
+        if (
+            self._state == CircuitState.OPEN
+            and monotonic() - self._opened_at >= self._settings.open_time
+        ):
+            self._set_state(CircuitState.HALF_OPEN)
+
+        if self._state == CircuitState.OPEN or (
+            self._state == CircuitState.HALF_OPEN and self._is_trying
+        ):
+            self._stats["rejected"] += 1
+            raise CircuitOpenError(self._name)
+        if self._state == CircuitState.HALF_OPEN:
+            self._is_trying = True
+
+        return self._generation
+
+    def _end_trial(self, generation: int) -> None:
+        if generation == self._generation:
+            self._is_trying = False
+
+    def _record(self, generation: int, *, is_failed: bool) -> None:
+        if generation != self._generation:
+            self._stats["late"] += 1
+            return
+        self._stats["failures" if is_failed else "successes"] += 1
+
+        match self._state:
+            case CircuitState.HALF_OPEN:
+                self._is_trying = False
+                self._set_state(
+                    CircuitState.OPEN if is_failed else CircuitState.CLOSED
+                )
+            case CircuitState.CLOSED:
+                now = monotonic()
+                self._calls.append((now, is_failed))
+                self._failed += is_failed
+                while self._calls[0][0] <= now - self._settings.window:
+                    self._failed -= self._calls.popleft()[1]
+
+                if (
+                    len(self._calls) >= self._settings.min_calls
+                    and self._failed / len(self._calls)
+                    >= self._settings.failure_rate
+                ):
+                    self._set_state(CircuitState.OPEN)
+            # No calls are admitted while the breaker is open.
+            case CircuitState.OPEN:
+                pass
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state == CircuitState.OPEN:
+            self._opened_at = monotonic()
+            self._stats["opened"] += 1
+        self._calls.clear()
+        self._failed = 0
+        self._state = state
+        self._generation += 1
+
+        self._logger.warning("The circuit of %s is %s.", self._name, state)
+
+    @property
+    @override
+    def state(self) -> CircuitState:
+        return self._state
+
+    @property
+    @override
+    def stats(self) -> Mapping[str, int]:
+        return MappingProxyType(self._stats)
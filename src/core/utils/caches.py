@@ -0,0 +1,236 @@
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import suppress
+from dataclasses import dataclass, field
+from functools import partial
+from time import monotonic
+from types import MappingProxyType
+from typing import ClassVar, cast, override
+
+from pydantic import BaseModel
+from redis.exceptions import RedisError
+
+from src.core.deps.db import Redis_
+from src.core.settings import ReadCacheSettings
+from src.core.utils.flights import SingleFlight
+
+type Compute = Callable[[], Awaitable[bytes]]
+
+
+class Cache(ABC):
+    @staticmethod
+    def get_key(name: str, *args: BaseModel) -> str:
+        """
+        Arguments are hashed, since search clauses may be arbitrarily long.
+        """
+        digest = hashlib.sha1()  # noqa: S324 # Is not used for security purposes.
+        for arg in args:
+            digest.update(arg.model_dump_json().encode())
+
+        return f"{name}:{digest.hexdigest()}"
+
+    @abstractmethod
+    async def get_or_set(
+        self, namespace: str, key: str, compute: Compute
+    ) -> bytes:
+        """
+        Concurrent misses of the same key are recomputed only once.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate(
+        self, namespace: str, *, is_shared: bool = False
+    ) -> None:
+        """
+        Shared invalidations are made by all processes at once, e.g. when they
+        are notified about a change, so only one of them drops the shared
+        values.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def evict(self, namespace: str) -> None:
+        """
+        Drops only the values kept by this process, e.g. when another one has
+        already invalidated the shared ones.
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def stats(self) -> Mapping[str, int]:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class TieredCache(Cache):
+    """
+    Keeps the hottest values in the process for a short time in front of
+    Redis, which is shared by all workers. Redis is only an optimization, so
+    its unavailability falls back to the computation.
+    """
+
+    _redis: Redis_
+    _settings: ReadCacheSettings
+
+    # Expiration times and values in the least recently used order.
+    _local: OrderedDict[str, tuple[float, bytes]] = field(
+        default_factory=OrderedDict
+    )
+    _flight: SingleFlight[tuple[str, int], bytes] = field(
+        default_factory=SingleFlight
+    )
+    # Values computed before an invalidation of their namespace are not
+    # stored, as they may be outdated.
+    _generations: Counter[str] = field(default_factory=Counter)
+    _stats: Counter[str] = field(default_factory=Counter)
+
+    # Other workers are polled while they recompute a value.
+    POLL_INTERVAL: ClassVar = 0.05
+
+    @staticmethod
+    def _get_full_key(namespace: str, key: str) -> str:
+        return f"cache:{namespace}:{key}"
+
+    @staticmethod
+    def _to_bytes(cached: str) -> bytes:
+        # The client does not decode responses, unlike the stubs of Redis_ say.
+        return cast(bytes, cached)
+
+    @override
+    async def get_or_set(
+        self, namespace: str, key: str, compute: Compute
+    ) -> bytes:
+        full_key = self._get_full_key(namespace, key)
+
+        if (cached := self._get_local(full_key)) is not None:
+            self._stats["local_hits"] += 1
+            return cached
+
+        generation = self._generations[namespace]
+        return await self._flight.run(
+            (full_key, generation),
+            partial(self._compute, namespace, full_key, compute, generation),
+        )
+
+    async def _compute(
+        self, namespace: str, key: str, compute: Compute, generation: int
+    ) -> bytes:
+        value = await self._load(namespace, key, compute, generation)
+        if self._generations[namespace] == generation:
+            self._set_local(key, value)
+
+        return value
+
+    async def _load(
+        self, namespace: str, key: str, compute: Compute, generation: int
+    ) -> bytes:
+        try:
+            cached = await self._redis.get(key)
+        except RedisError:
+            self._stats["misses"] += 1
+            return await compute()
+        if cached is not None:
+            self._stats["remote_hits"] += 1
+            return self._to_bytes(cached)
+
+        lock = f"{key}:lock"
+        try:
+            is_locked = bool(
+                await self._redis.set(
+                    lock, 1, nx=True, px=int(self._settings.lock_time * 1000)
+                )
+            )
+        except RedisError:
+            is_locked = False
+
+        # Another worker is already recomputing the value.
+        if not is_locked:
+            deadline = monotonic() + self._settings.lock_time
+            while monotonic() < deadline:
+                await asyncio.sleep(self.POLL_INTERVAL)
+                with suppress(RedisError):
+                    if (cached := await self._redis.get(key)) is not None:
+                        self._stats["remote_hits"] += 1
+                        return self._to_bytes(cached)
+
+        self._stats["misses"] += 1
+        try:
+            value = await compute()
+            if self._generations[namespace] != generation:
+                return value
+            with suppress(RedisError):
+                await (
+                    self._redis.pipeline(transaction=False)
+                    .set(key, value, ex=self._settings.time)
+                    .sadd(f"cache:{namespace}", key)
+                    .expire(f"cache:{namespace}", self._settings.time)
+                    .execute()
+                )
+        finally:
+            if is_locked:
+                with suppress(RedisError):
+                    await self._redis.delete(lock)
+
+        return value
+
+    def _get_local(self, key: str) -> bytes | None:
+        if (cached := self._local.get(key)) is None:
+            return None
+
+        expires_at, value = cached
+        if expires_at <= monotonic():
+            del self._local[key]
+            return None
+        self._local.move_to_end(key)
+
+        return value
+
+    def _set_local(self, key: str, value: bytes) -> None:
+        if not self._settings.local_size:
+            return
+
+        self._local[key] = (monotonic() + self._settings.local_time, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self._settings.local_size:
+            self._local.popitem(last=False)
+
+    @override
+    def evict(self, namespace: str) -> None:
+        self._generations[namespace] += 1
+        prefix = self._get_full_key(namespace, "")
+        for key in [key for key in self._local if key.startswith(prefix)]:
+            del self._local[key]
+        self._stats["evictions"] += 1
+
+    @override
+    async def invalidate(
+        self, namespace: str, *, is_shared: bool = False
+    ) -> None:
+        self.evict(namespace)
+
+        # Is released at once, so later changes are never skipped, while
+        # processes notified about the same one mostly are.
+        lock = f"cache:{namespace}:invalidation"
+        with suppress(RedisError):
+            if is_shared and not await self._redis.set(
+                lock, 1, nx=True, px=int(self._settings.lock_time * 1000)
+            ):
+                return
+
+            try:
+                keys = await self._redis.smembers(f"cache:{namespace}")
+                await self._redis.delete(f"cache:{namespace}", *keys)
+            finally:
+                if is_shared:
+                    await self._redis.delete(lock)
+        self._stats["invalidations"] += 1
+
+    @property
+    @override
+    def stats(self) -> Mapping[str, int]:
+        return MappingProxyType(Counter({**self._stats, **self._flight.stats}))
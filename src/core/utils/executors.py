@@ -0,0 +1,75 @@
+import asyncio
+import concurrent.futures
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from functools import partial
+from types import MappingProxyType
+from typing import override
+
+
+class Executor(ABC):
+    @abstractmethod
+    async def run[**P, T](
+        self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        """
+        Runs CPU-bound work outside the event loop.
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def stats(self) -> Mapping[str, int]:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class PoolExecutor(Executor):
+    """
+    Admits only as many tasks as the pool runs at once, so the rest wait in
+    the loop, where their number is known and they can still be cancelled.
+    """
+
+    _pool: concurrent.futures.Executor
+    # Is sized like the pool.
+    _semaphore: asyncio.Semaphore
+
+    # «waiting» and «running» are current values, unlike the rest.
+    _stats: Counter[str] = field(default_factory=Counter)
+
+    @override
+    async def run[**P, T](
+        self, func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        self._stats["waiting"] += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._stats["waiting"] -= 1
+
+        self._stats["running"] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._pool.submit(partial(func, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # The task keeps running in the pool when its caller is cancelled, so
+        # the slot is only released once the pool has finished it.
+        future.add_done_callback(
+            lambda _: loop.call_soon_threadsafe(self._release)
+        )
+
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        self._stats["running"] -= 1
+        self._stats["completed"] += 1
+        self._semaphore.release()
+
+    @property
+    @override
+    def stats(self) -> Mapping[str, int]:
+        return MappingProxyType(self._stats)
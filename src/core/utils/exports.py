@@ -0,0 +1,145 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator, Sequence
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Final, override
+
+from src.core.schemas import ColumnarFormat, ExportFormat, Schema
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+type Batches = AsyncIterable[Sequence[Schema]]
+type RowBatches = AsyncIterable[Sequence[Sequence[Any]]]
+
+MEDIA_TYPES: Final = MappingProxyType(
+    {
+        ExportFormat.NDJSON: "application/x-ndjson",
+        ExportFormat.CSV: "text/csv",
+        ColumnarFormat.ARROW: "application/vnd.apache.arrow.stream",
+        ColumnarFormat.PARQUET: "application/vnd.apache.parquet",
+    }
+)
+
+
+async def to_ndjson(batches: Batches) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(
+            item.model_dump_json(by_alias=True).encode() + b"\n"
+            for item in batch
+        )
+
+
+def _to_cell(value: Any) -> Any:
+    # Nested values (e.g. lists of related entities) are kept as JSON.
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(",", ":"))
+
+
+async def to_csv(
+    batches: Batches, schema: type[Schema]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> bytes:
+        chunk = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    names = [field.alias or name for name, field in schema.model_fields.items()]
+    writer.writerow(names)
+    yield flush()
+
+    async for batch in batches:
+        for item in batch:
+            values = item.model_dump(mode="json", by_alias=True)
+            writer.writerow(_to_cell(values[name]) for name in names)
+        yield flush()
+
+
+def export(
+    batches: Batches, schema: type[Schema], format_: ExportFormat
+) -> AsyncIterator[bytes]:
+    """
+    Each batch is sent as a single chunk, which is large enough to be
+    compressed on the fly.
+    """
+    if format_ == ExportFormat.CSV:
+        return to_csv(batches, schema)
+    return to_ndjson(batches)
+
+
+class _Drain(io.RawIOBase):
+    """
+    Hands over everything written so far, while keeping the total position,
+    since the Parquet footer refers to the offsets of row groups.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    @override
+    def writable(self) -> bool:
+        return True
+
+    @override
+    def write(self, data: Any) -> int:
+        chunk = bytes(data)
+        self._chunks.append(chunk)
+        self._position += len(chunk)
+        return len(chunk)
+
+    @override
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        chunk = b"".join(self._chunks)
+        self._chunks.clear()
+        return chunk
+
+
+async def to_columnar(
+    batches: RowBatches, schema: "pa.Schema", format_: ColumnarFormat
+) -> AsyncIterator[bytes]:
+    """
+    Each batch of rows becomes a record batch (or a Parquet row group), which
+    is sent right away, so only one of them is kept in memory.
+
+    Pyarrow is imported on the first export, since it is heavy.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = _Drain()
+    file = pa.PythonFile(sink, mode="w")
+    writer: pa.ipc.RecordBatchStreamWriter | pq.ParquetWriter = (
+        pq.ParquetWriter(file, schema)
+        if format_ == ColumnarFormat.PARQUET
+        else pa.ipc.new_stream(file, schema)
+    )
+
+    try:
+        async for rows in batches:
+            if not rows:
+                continue
+            columns = zip(*rows, strict=True)
+            writer.write_batch(
+                pa.RecordBatch.from_arrays(
+                    [
+                        pa.array(values, type=field.type)
+                        for values, field in zip(columns, schema, strict=True)
+                    ],
+                    schema=schema,
+                )
+            )
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
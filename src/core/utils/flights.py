@@ -0,0 +1,45 @@
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class SingleFlight[K: Hashable, V]:
+    """
+    Concurrent calls with the same key share the one in flight. If it is
+    cancelled, one of the waiting calls is made instead.
+    """
+
+    _pending: dict[K, asyncio.Future[V]] = field(default_factory=dict)
+    _stats: Counter[str] = field(default_factory=Counter)
+
+    async def run(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        while (pending := self._pending.get(key)) is not None:
+            self._stats["coalesced"] += 1
+            await asyncio.wait((pending,))
+            if not pending.cancelled():
+                return pending.result()
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await func()
+        except Exception as exc:
+            future.set_exception(exc)
+            # The exception is re-raised here, so waiters are optional.
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            del self._pending[key]
+
+    @property
+    def stats(self) -> Mapping[str, int]:
+        return MappingProxyType(self._stats)
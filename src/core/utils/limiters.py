@@ -0,0 +1,142 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections import Counter
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from time import monotonic
+from types import MappingProxyType
+from typing import Final, cast, override
+
+from redis.commands.core import AsyncScript
+from redis.exceptions import RedisError
+
+from src.core.errors import ExternalAPIConnError
+from src.core.schemas import Priority
+from src.core.settings import RateLimitSettings
+
+# Takes a token only if the bucket keeps at least the given level, which is
+# negative for reservations of future tokens. Returns whether it is taken and
+# the time to wait for it (or until it can be taken), as floats are truncated.
+RATE_LIMIT_SCRIPT: Final = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local level = tonumber(ARGV[3])
+
+local time = redis.call("TIME")
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "updated_at")
+local tokens = math.min(
+    burst,
+    (tonumber(bucket[1]) or burst) + (now - (tonumber(bucket[2]) or now)) * rate
+)
+
+if tokens - 1 < level then
+    return {0, tostring((level + 1 - tokens) / rate)}
+end
+
+tokens = tokens - 1
+redis.call(
+    "HSET", KEYS[1], "tokens", tostring(tokens), "updated_at", tostring(now)
+)
+redis.call("EXPIRE", KEYS[1], math.ceil((burst - tokens) / rate) + 1)
+return {1, tostring(math.max(0, -tokens) / rate)}
+"""
+
+
+class RateLimiter(ABC):
+    @abstractmethod
+    async def acquire(
+        self, key: str, priority: Priority, deadline: float
+    ) -> None:
+        """
+        Waits for a request to be allowed, failing at once if it is not
+        expected early enough to be made before the deadline (by the
+        monotonic clock).
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def stats(self) -> Mapping[str, int]:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class RedisRateLimiter(RateLimiter):
+    """
+    A token bucket shared by all workers. Interactive requests reserve the
+    nearest token, even a future one, while background ones wait until the
+    bucket has more than the reserve.
+
+    Redis is only a protection of the quota, so its unavailability lets
+    requests through.
+    """
+
+    _script: AsyncScript
+    _settings: RateLimitSettings
+    # Is left for the request itself, so tokens are not taken (or reserved)
+    # by requests that would not complete before the deadline anyway.
+    _request_time: float
+
+    # «waiting» is a current value, unlike the rest.
+    _stats: Counter[str] = field(default_factory=Counter)
+
+    @override
+    async def acquire(
+        self, key: str, priority: Priority, deadline: float
+    ) -> None:
+        if self._stats["waiting"] >= self._settings.queue_size:
+            self._stats["rejected"] += 1
+            msg = "Too many requests are waiting for the rate limit."
+            raise ExternalAPIConnError(msg)
+
+        self._stats["waiting"] += 1
+        try:
+            await self._acquire(key, priority, deadline)
+        finally:
+            self._stats["waiting"] -= 1
+
+    async def _acquire(
+        self, key: str, priority: Priority, deadline: float
+    ) -> None:
+        while True:
+            remaining = deadline - monotonic() - self._request_time
+            if remaining < 0:
+                self._stats["rejected"] += 1
+                msg = "The deadline does not leave time for the request."
+                raise ExternalAPIConnError(msg)
+
+            level = (
+                -remaining * self._settings.rate
+                if priority == Priority.INTERACTIVE
+                else self._settings.burst * self._settings.reserve
+            )
+            try:
+                # The client does not decode responses, unlike the stubs of
+                # Redis_ say.
+                is_taken, wait = cast(
+                    tuple[int, bytes],
+                    await self._script(
+                        keys=(f"rate_limit:{key}",),
+                        args=(self._settings.rate, self._settings.burst, level),
+                    ),
+                )
+            except RedisError:
+                self._stats["unlimited"] += 1
+                return
+
+            if is_taken:
+                self._stats["acquired"] += 1
+                await asyncio.sleep(float(wait))
+                return
+            if float(wait) > remaining:
+                self._stats["rejected"] += 1
+                msg = "The rate limit does not allow the request in time."
+                raise ExternalAPIConnError(msg)
+
+            await asyncio.sleep(float(wait))
+
+    @property
+    @override
+    def stats(self) -> Mapping[str, int]:
+        return MappingProxyType(self._stats)
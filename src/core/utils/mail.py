@@ -17,8 +17,19 @@ from aiosmtplib import (
 )
 from tenacity import retry, retry_if_exception_type, stop_after_attempt
 
-from src.core.errors import EmailConnError, EmailResponseError
+from src.core.errors import (
+    CircuitOpenError,
+    EmailConnError,
+    EmailResponseError,
+)
 from src.core.settings import MailSettings
+from src.core.utils.breakers import CircuitBreaker
+
+CONN_ERRORS: Final = (
+    SMTPServerDisconnected,
+    SMTPConnectError,
+    SMTPTimeoutError,
+)
 
 
 @dataclass(kw_only=True, slots=True)
@@ -54,7 +65,15 @@ class MailSession(ABC):
 
 
 class AIOSMTPLibSession(SMTP, MailSession):
-    def __init__(self, *args: Any, **kwargs: Any) -> None:
+    def __init__(
+        self,
+        settings: MailSettings,
+        breaker: CircuitBreaker[MailSession],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        MailSession.__init__(self, _settings=settings)
+        self._breaker: Final = breaker
         super().__init__(
             *args,
             hostname=self._settings.host,
@@ -65,17 +84,24 @@ class AIOSMTPLibSession(SMTP, MailSession):
         )
 
         self.send_message = retry(  # type: ignore[method-assign] # An alternative to the «sugar» decorator syntax for top-level methods (self cannot be used there, since the instance has not already been created).
-            retry=retry_if_exception_type(
-                (
-                    SMTPServerDisconnected,
-                    SMTPConnectError,
-                    SMTPTimeoutError,
-                )
-            ),
+            retry=retry_if_exception_type(CONN_ERRORS),
             stop=stop_after_attempt(self._settings.retries),
             reraise=True,
         )(self.send_message)
 
+    @override
+    async def connect(self, *args: Any, **kwargs: Any) -> SMTPResponse:
+        """
+        Is guarded as well, since an unavailable server is usually found out
+        here.
+        """
+        try:
+            return await self._breaker.run(super().connect, *args, **kwargs)
+        except CONN_ERRORS as exc:
+            raise EmailConnError(exc.message) from exc
+        except CircuitOpenError as exc:
+            raise EmailConnError(exc.msg) from exc
+
     @override
     async def send_message(
         self,
@@ -84,15 +110,15 @@ class AIOSMTPLibSession(SMTP, MailSession):
         **kwargs: Any,
     ) -> tuple[dict[str, SMTPResponse], str]:
         try:
-            return await super().send_message(message, *args, **kwargs)
-        except (
-            SMTPServerDisconnected,
-            SMTPConnectError,
-            SMTPTimeoutError,
-        ) as exc:
+            return await self._breaker.run(
+                super().send_message, message, *args, **kwargs
+            )
+        except CONN_ERRORS as exc:
             raise EmailConnError(exc.message) from exc
         except SMTPResponseException as exc:
             raise EmailResponseError(exc.message, code=exc.code) from exc
+        except CircuitOpenError as exc:
+            raise EmailConnError(exc.msg) from exc
 
     @override
     async def send(
@@ -1,42 +1,167 @@
+import binascii
+import hashlib
 from abc import ABC, abstractmethod
-from collections.abc import Awaitable, Callable
-from dataclasses import dataclass
+from base64 import b64decode, b64encode
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from functools import cache
+from math import ceil
 from typing import (
     Any,
     Concatenate,
     cast,
     override,
 )
+from urllib.parse import quote, unquote
 
+from fastapi.exceptions import RequestValidationError
 from fastapi_pagination import Page, Params, set_page, set_params
+from fastapi_pagination.bases import CursorRawParams, RawParams
 from fastapi_pagination.cursor import CursorPage, CursorParams
-from sqlalchemy import Select
+from pydantic import NonNegativeInt
+from redis.exceptions import RedisError
+from sqlakeyset import InvalidPage
+from sqlakeyset.asyncio import select_page
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import noload
 
-from src.core.db.sessions import DBSession
+from src.core.db.models import explain
+from src.core.db.sessions import DBSession, SQLAlchemySession
+from src.core.deps.db import Redis_
 from src.core.schemas import (
     BaseCursorPage,
     BaseOffsetPage,
     CursorSearch,
     OffsetSearch,
     Schema,
+    Total,
 )
+from src.core.settings import PaginationSettings
 
 
 class FastAPIPaginationOffsetPage[SchemaT: Schema](
     Page[SchemaT], BaseOffsetPage[SchemaT]
 ):
-    pass
+    total: NonNegativeInt | None = None  # type: ignore[assignment] # pyright: ignore[reportIncompatibleVariableOverride] # The total is counted separately, so the lib always omits it.
+    pages: NonNegativeInt | None = None  # type: ignore[assignment] # pyright: ignore[reportIncompatibleVariableOverride] # The total is counted separately, so the lib always omits it.
 
 
 class FastAPIPaginationCursorPage[SchemaT: Schema](  # type: ignore[misc] # Specifics of the lib implementation. Does not affect anything in runtime.
     CursorPage[SchemaT], BaseCursorPage[SchemaT]
 ):
-    pass
+    total: NonNegativeInt | None = None  # type: ignore[assignment] # pyright: ignore[reportIncompatibleVariableOverride] # The total is counted separately, so the lib always omits it.
+
+
+class FastAPIPaginationParams(Params):
+    @override
+    def to_raw_params(self) -> RawParams:
+        return replace(super().to_raw_params(), include_total=False)
+
+
+class FastAPIPaginationCursorParams(CursorParams):
+    @override
+    def to_raw_params(self) -> CursorRawParams:
+        return replace(super().to_raw_params(), include_total=False)
 
 
 type Query = Select[Any]
 
 
+class DBCounter[SessionT: DBSession, QueryT: Query](ABC):
+    @abstractmethod
+    async def count_exact(
+        self, session: SessionT, query: QueryT, *, is_cached: bool = False
+    ) -> int:
+        """
+        The caching is intended only for queries whose total does not depend
+        on the user, so that a stale value is acceptable for a short time.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def count_estimated(self, session: SessionT, query: QueryT) -> int:
+        raise NotImplementedError
+
+    async def count(
+        self,
+        session: SessionT,
+        query: QueryT,
+        *,
+        mode: Total,
+        is_cached: bool = False,
+    ) -> int | None:
+        match mode:
+            case Total.EXACT:
+                return await self.count_exact(
+                    session, query, is_cached=is_cached
+                )
+            case Total.ESTIMATED:
+                return await self.count_estimated(session, query)
+            case Total.OFF:
+                return None
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class SQLAlchemyCounter(DBCounter[SQLAlchemySession, Query]):
+    _redis: Redis_
+    _settings: PaginationSettings
+
+    @staticmethod
+    def _get_key(session: SQLAlchemySession, query: Query) -> str:
+        compiled = query.compile(session.get_bind())
+        statement = f"{compiled}{sorted(compiled.params.items())}"
+
+        return f"total:{hashlib.sha1(statement.encode()).hexdigest()}"  # noqa: S324 # Is not used for security purposes.
+
+    @override
+    async def count_exact(
+        self,
+        session: SQLAlchemySession,
+        query: Query,
+        *,
+        is_cached: bool = False,
+    ) -> int:
+        count_query = select(func.count()).select_from(
+            query.order_by(None).options(noload("*")).subquery()
+        )
+        if not is_cached or not self._settings.total_cache_time:
+            return (await session.execute(count_query)).scalar_one()
+
+        # The cache is only an optimization, so its unavailability should not
+        # break the pagination.
+        key = self._get_key(session, query)
+        try:
+            cached = await self._redis.get(key)
+        except RedisError:
+            cached = None
+        if cached is not None:
+            return int(cached)
+
+        total: int = (await session.execute(count_query)).scalar_one()
+        with suppress(RedisError):
+            await self._redis.set(
+                key, total, ex=self._settings.total_cache_time
+            )
+
+        return total
+
+    @override
+    async def count_estimated(
+        self, session: SQLAlchemySession, query: Query
+    ) -> int:
+        """
+        Relies on the planner statistics (pg_class.reltuples for an unfiltered
+        table and selectivity for the clauses), which are refreshed by
+        autovacuum.
+        """
+        plan = (
+            await session.execute(explain(query.order_by(None)))
+        ).scalar_one()
+
+        return max(int(plan[0]["Plan"]["Plan Rows"]), 0)
+
+
 class DBPaginator[SessionT: DBSession, QueryT: Query](ABC):
     @abstractmethod
     async def paginate_offset[SchemaT: Schema](
@@ -46,6 +171,7 @@ class DBPaginator[SessionT: DBSession, QueryT: Query](ABC):
         search: OffsetSearch,
         return_schema: type[SchemaT],
         *args: Any,
+        is_total_cached: bool = False,
         **kwargs: Any,
     ) -> BaseOffsetPage[SchemaT]:
         raise NotImplementedError
@@ -58,6 +184,7 @@ class DBPaginator[SessionT: DBSession, QueryT: Query](ABC):
         search: CursorSearch,
         return_schema: type[SchemaT],
         *args: Any,
+        is_total_cached: bool = False,
         **kwargs: Any,
     ) -> BaseCursorPage[SchemaT]:
         raise NotImplementedError
@@ -78,6 +205,7 @@ class FastAPIPagination[SessionT: DBSession, QueryT: Query](
     DBPaginator[SessionT, QueryT]
 ):
     _paginate: Paginate[SessionT, QueryT, ...]
+    _counter: DBCounter[SessionT, QueryT]
 
     @override
     async def paginate_offset[SchemaT: Schema](
@@ -87,15 +215,35 @@ class FastAPIPagination[SessionT: DBSession, QueryT: Query](
         search: OffsetSearch,
         return_schema: type[SchemaT],
         *args: Any,
+        is_total_cached: bool = False,
         **kwargs: Any,
     ) -> BaseOffsetPage[SchemaT]:
         set_page(FastAPIPaginationOffsetPage[return_schema])  # type: ignore[valid-type] # The lib API design specifics.
-        set_params(Params(**search.model_dump(include={"page", "size"})))
+        set_params(
+            FastAPIPaginationParams(
+                **search.model_dump(include={"page", "size"})
+            )
+        )
 
-        return cast(
+        page = cast(
             FastAPIPaginationOffsetPage[return_schema],  # type: ignore[valid-type] # pyright: ignore[reportInvalidTypeForm] # The lib API design specifics.
             await self._paginate(session, query, *args, **kwargs),
         )
+        total = await self._counter.count(
+            session,
+            query,
+            mode=search.include_total,
+            is_cached=is_total_cached,
+        )
+
+        return page.model_copy(
+            update={
+                "total": total,
+                "pages": ceil(total / search.size)
+                if total is not None
+                else None,
+            }
+        )
 
     @override
     async def paginate_cursor[SchemaT: Schema](
@@ -105,14 +253,185 @@ class FastAPIPagination[SessionT: DBSession, QueryT: Query](
         search: CursorSearch,
         return_schema: type[SchemaT],
         *args: Any,
+        is_total_cached: bool = False,
         **kwargs: Any,
     ) -> BaseCursorPage[SchemaT]:
         set_page(FastAPIPaginationCursorPage[return_schema])  # type: ignore[valid-type] # The lib API design specifics.
         set_params(
-            CursorParams(**search.model_dump(include={"cursor", "size"}))
+            FastAPIPaginationCursorParams(
+                cursor=search.next_page, size=search.size
+            )
         )
 
-        return cast(
+        page = cast(
             FastAPIPaginationCursorPage[return_schema],  # type: ignore[valid-type] # pyright: ignore[reportInvalidTypeForm] # The lib API design specifics.
             await self._paginate(session, query, *args, **kwargs),
         )
+        total = await self._counter.count(
+            session,
+            query,
+            mode=search.include_total,
+            is_cached=is_total_cached,
+        )
+
+        return page.model_copy(update={"total": total})
+
+
+@dataclass(kw_only=True, slots=True, frozen=True)
+class SQLAlchemyPagination(DBPaginator[SQLAlchemySession, Query]):
+    """
+    Unlike FastAPIPagination, does not touch the context-local page and params
+    of the lib, and fetches one extra row to detect the next page, so that
+    the total is counted only when it cannot be derived from the page itself.
+    Cursors are compatible with the ones produced by FastAPIPagination.
+    """
+
+    _counter: DBCounter[SQLAlchemySession, Query]
+
+    @staticmethod
+    @cache
+    def _get_offset_page(
+        return_schema: type[Schema],
+    ) -> type[BaseOffsetPage[Schema]]:
+        return BaseOffsetPage[return_schema]  # type: ignore[valid-type] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+
+    @staticmethod
+    @cache
+    def _get_cursor_page(
+        return_schema: type[Schema],
+    ) -> type[BaseCursorPage[Schema]]:
+        return BaseCursorPage[return_schema]  # type: ignore[valid-type] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+
+    @staticmethod
+    def _unwrap(query: Query, rows: Iterable[Any]) -> list[Any]:
+        """
+        Instances are returned «as is» if the whole entity is selected,
+        otherwise rows are kept for attribute-based validation.
+        """
+        descriptions = query.column_descriptions
+        if len(descriptions) == 1 and (
+            descriptions[0]["expr"] is descriptions[0]["entity"]
+        ):
+            return [row[0] for row in rows]
+        return list(rows)
+
+    @staticmethod
+    def _encode(bookmark: str) -> str:
+        return quote(b64encode(bookmark.encode()).decode())
+
+    @staticmethod
+    def _get_cursor_error() -> RequestValidationError:
+        return RequestValidationError(
+            (
+                {
+                    "msg": "Cursor is invalid",
+                    "loc": ("query", "nextPage"),
+                    "type": "value_error",
+                },
+            )
+        )
+
+    @classmethod
+    def _decode(cls, cursor: str | None) -> str | None:
+        if cursor is None:
+            return None
+
+        try:
+            return b64decode(unquote(cursor).encode()).decode()
+        except (binascii.Error, UnicodeDecodeError) as exc:
+            raise cls._get_cursor_error() from exc
+
+    @override
+    async def paginate_offset[SchemaT: Schema](
+        self,
+        session: SQLAlchemySession,
+        query: Query,
+        search: OffsetSearch,
+        return_schema: type[SchemaT],
+        *args: Any,
+        is_total_cached: bool = False,
+        **kwargs: Any,
+    ) -> BaseOffsetPage[SchemaT]:
+        offset = (search.page - 1) * search.size
+        rows: Sequence[Any] = (
+            await session.execute(query.offset(offset).limit(search.size + 1))
+        ).all()
+        items = self._unwrap(query, rows[: search.size])
+
+        # The total is unknown only if there are rows beyond the page or the
+        # page is empty because it is out of range.
+        total: int | None
+        if search.include_total is Total.OFF:
+            total = None
+        elif len(rows) > search.size or (not items and offset):
+            total = await self._counter.count(
+                session,
+                query,
+                mode=search.include_total,
+                is_cached=is_total_cached,
+            )
+        else:
+            total = offset + len(items)
+
+        return cast(
+            BaseOffsetPage[SchemaT],
+            self._get_offset_page(return_schema)(
+                items=items,
+                total=total,
+                page=search.page,
+                size=search.size,
+                pages=ceil(total / search.size) if total is not None else None,
+            ),
+        )
+
+    @override
+    async def paginate_cursor[SchemaT: Schema](
+        self,
+        session: SQLAlchemySession,
+        query: Query,
+        search: CursorSearch,
+        return_schema: type[SchemaT],
+        *args: Any,
+        is_total_cached: bool = False,
+        **kwargs: Any,
+    ) -> BaseCursorPage[SchemaT]:
+        try:
+            page = await select_page(
+                session,
+                query,
+                per_page=search.size,
+                page=self._decode(search.next_page),
+            )
+        except InvalidPage as exc:
+            raise self._get_cursor_error() from exc
+        items = self._unwrap(query, page)
+
+        # sqlakeyset fetches an extra row itself, so only the first and the
+        # last page at the same time allows to skip the count.
+        total: int | None
+        if search.include_total is Total.OFF:
+            total = None
+        elif page.paging.has_next or search.next_page is not None:
+            total = await self._counter.count(
+                session,
+                query,
+                mode=search.include_total,
+                is_cached=is_total_cached,
+            )
+        else:
+            total = len(items)
+
+        return cast(
+            BaseCursorPage[SchemaT],
+            self._get_cursor_page(return_schema)(
+                items=items,
+                total=total,
+                current_page=self._encode(page.paging.bookmark_current),
+                previous_page=self._encode(page.paging.bookmark_previous)
+                if page.paging.has_previous
+                else None,
+                next_page=self._encode(page.paging.bookmark_next)
+                if page.paging.has_next
+                else None,
+            ),
+        )
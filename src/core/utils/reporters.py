@@ -0,0 +1,61 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Protocol, override
+
+from src.core.settings import StatsSettings
+from src.core.utils.loggers import Logger
+
+
+class StatsSource(Protocol):
+    @property
+    @abstractmethod
+    def stats(self) -> Mapping[str, int]:
+        raise NotImplementedError
+
+
+class StatsReporter(ABC):
+    @abstractmethod
+    async def start(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def stop(self) -> None:
+        raise NotImplementedError
+
+
+@dataclass(kw_only=True, slots=True)
+class LoggingStatsReporter(StatsReporter):
+    """
+    Periodically logs the stats of long-lived components, so they are
+    collected along with the rest of the logs of each worker.
+    """
+
+    _settings: StatsSettings
+    _logger: Logger
+    _sources: Mapping[str, StatsSource]
+
+    _task: asyncio.Task[None] | None = None
+
+    @override
+    async def start(self) -> None:
+        if self._settings.interval and self._sources and self._task is None:
+            self._task = asyncio.create_task(self._report())
+
+    @override
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _report(self) -> None:
+        while True:
+            await asyncio.sleep(self._settings.interval)
+            for name, source in self._sources.items():
+                self._logger.info("Stats of %s: %s.", name, dict(source.stats))
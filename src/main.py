@@ -8,12 +8,14 @@ from dishka import Provider, make_async_container
 from src.companies.deps import get_company_deps
 from src.companies.routes import get_company_router
 from src.core.asgi import ExtendedFastAPI
+from src.core.db.listeners import DBListener
 from src.core.deps.base import get_deps
 from src.core.errors import get_handling_map
 from src.core.middlewares import get_middleware_map
 from src.core.settings import (
     DocsSettings,
 )
+from src.core.utils.reporters import StatsReporter
 from src.users.deps import get_user_deps
 from src.users.errors import (
     get_user_handling_map,
@@ -34,8 +36,15 @@ CONTAINER: Final = make_async_container(*get_prod_deps())
 
 @asynccontextmanager
 async def lifespan(app: ExtendedFastAPI) -> AsyncGenerator[None]:
+    listener = await app.state.dishka_container.get(DBListener)
+    await listener.start()
+    reporter = await app.state.dishka_container.get(StatsReporter)
+    await reporter.start()
+
     yield
 
+    await reporter.stop()
+    await listener.stop()
     await app.state.dishka_container.close()
 
 
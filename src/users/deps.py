@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator, Awaitable, Callable
 from functools import lru_cache
 from typing import Annotated
 
@@ -7,6 +8,7 @@ from fastapi_users import FastAPIUsers
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
+    JWTStrategy,
     RedisStrategy,
 )
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
@@ -15,13 +17,16 @@ from src.core.asgi import Architecture, ExtendedRequest
 from src.core.db.sessions import SQLAlchemySession
 from src.core.deps.base import BaseProvider
 from src.core.deps.db import Redis_
-from src.core.settings import AuthSettings
+from src.core.settings import AuthSettings, UserCacheSettings
+from src.core.utils.executors import Executor
+from src.core.utils.loggers import Logger
 from src.users.db.models import DBUserProtocol, SQLAlchemyUser
 from src.users.service import UserManager
 from src.users.utils.password_validators import (
     PasswordValidator,
     ZXCVBNValidator,
 )
+from src.users.utils.strategies import CachedRedisStrategy, StatelessStrategy
 
 
 class ZXCVBNProvider(BaseProvider):
@@ -36,6 +41,31 @@ class AuthProvider(BaseProvider):
     def get_settings(self) -> AuthSettings:
         return AuthSettings.load()
 
+    @provide
+    def get_cache_settings(self) -> UserCacheSettings:
+        return UserCacheSettings.load()
+
+    @provide
+    def get_strategy(
+        self,
+        redis_: Redis_,
+        settings: AuthSettings,
+        cache_settings: UserCacheSettings,
+    ) -> CachedRedisStrategy:
+        # Shared by all requests, since it keeps the hottest users.
+        return CachedRedisStrategy(
+            redis_, cache_settings, lifetime_seconds=settings.session_lifetime
+        )
+
+    @provide
+    async def get_stateless_strategy(
+        self, redis_: Redis_, settings: AuthSettings, logger: Logger
+    ) -> AsyncIterator[StatelessStrategy]:
+        strategy = StatelessStrategy(redis_, settings, logger)
+        await strategy.start()
+        yield strategy
+        await strategy.stop()
+
 
 @lru_cache
 def get_fastapi_users() -> FastAPIUsers[DBUserProtocol, int]:
@@ -46,24 +76,34 @@ def get_fastapi_users() -> FastAPIUsers[DBUserProtocol, int]:
     since async deps are declared now but called later.
     """
 
+    settings = AuthSettings.load()
+    name = "stateless" if settings.is_stateless else "universal"
     bearer = BearerTransport(
-        tokenUrl=f"{Architecture.JSON_API}/{{version}}/users/auth/universal/login"
+        tokenUrl=f"{Architecture.JSON_API}/{{version}}/users/auth/{name}/login"
     )
 
     async def get_redis_strategy(
         request: ExtendedRequest,
     ) -> RedisStrategy[DBUserProtocol, int]:
-        redis_ = await request.state.dishka_container.get(Redis_)
+        return await request.state.dishka_container.get(CachedRedisStrategy)
 
-        return RedisStrategy[DBUserProtocol, int](redis_, lifetime_seconds=3600)
+    async def get_stateless_strategy(
+        request: ExtendedRequest,
+    ) -> JWTStrategy[DBUserProtocol, int]:
+        return await request.state.dishka_container.get(StatelessStrategy)
 
     # «Universal» here means the ability to be used equally effectively with
     # different frontends thanks to the platform-independent Bearer and
-    # lightweight Redis.
-    universal_backend = AuthenticationBackend[DBUserProtocol, int](
-        name="universal",
+    # lightweight Redis. «Stateless» trades instant logouts for
+    # authentication without any I/O.
+    backend = AuthenticationBackend[DBUserProtocol, int](
+        name=name,
         transport=bearer,
-        get_strategy=get_redis_strategy,
+        get_strategy=(
+            get_stateless_strategy
+            if settings.is_stateless
+            else get_redis_strategy
+        ),
     )
 
     async def get_sqlalchemy_db(
@@ -89,17 +129,35 @@ def get_fastapi_users() -> FastAPIUsers[DBUserProtocol, int]:
             user_db=db,
             settings=await container.get(AuthSettings),
             password_validator=await container.get(PasswordValidator),
+            invalidator=await container.get(
+                StatelessStrategy
+                if settings.is_stateless
+                else CachedRedisStrategy
+            ),
+            executor=await container.get(Executor),
         )
 
     return FastAPIUsers[DBUserProtocol, int](
         get_user_manager=get_user_manager,
-        auth_backends=(universal_backend,),
+        auth_backends=(backend,),
     )
 
 
-async def get_authenticated() -> DBUserProtocol:
-    dep = get_fastapi_users().current_user(active=True, verified=True)
-    return await dep()  # type: ignore[no-any-return] # pyright: ignore[reportReturnType]
+@lru_cache
+def get_authenticated() -> Callable[..., Awaitable[DBUserProtocol]]:
+    """
+    Is built once, when routers are declared, since the lib creates a new
+    dependency with its own signature on every call, while overrides are
+    keyed by it.
+    """
+    return get_fastapi_users().current_user(active=True, verified=True)  # type: ignore[no-any-return] # The lib is partially typed.
+
+
+@lru_cache
+def get_superuser() -> Callable[..., Awaitable[DBUserProtocol]]:
+    return get_fastapi_users().current_user(  # type: ignore[no-any-return] # The lib is partially typed.
+        active=True, verified=True, superuser=True
+    )
 
 
 def get_user_deps() -> tuple[Provider, ...]:
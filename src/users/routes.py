@@ -1,12 +1,47 @@
 from http import HTTPStatus
+from typing import Annotated
 
-from fastapi import APIRouter
+from dishka import FromDishka
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi_users import FastAPIUsers
+from fastapi_users.authentication.transport.bearer import BearerResponse
 
 from src.core.asgi import Architecture, ExtendedRouter
 from src.core.schemas import PublicError
+from src.core.settings import AuthSettings
 from src.core.utils.openapi import ResponseEditor
+from src.users.db.models import DBUserProtocol
 from src.users.deps import get_fastapi_users
 from src.users.schemas import UserCreate, UserRead, UserUpdate
+from src.users.service import UserManager
+from src.users.utils.strategies import StatelessStrategy
+
+
+def get_refresh_router(
+    fastapi_users: FastAPIUsers[DBUserProtocol, int],
+) -> ExtendedRouter:
+    router = ExtendedRouter()
+    (backend,) = fastapi_users.authenticator.backends
+
+    @router.post("/refresh", response_model=BearerResponse)
+    async def refresh(
+        token: Annotated[str, Depends(backend.transport.scheme)],
+        strategy: FromDishka[StatelessStrategy],
+        user_manager: Annotated[
+            UserManager, Depends(fastapi_users.get_user_manager)
+        ],
+    ) -> Response:
+        """
+        Issues a new short-lived token (the current one may be expired) until
+        the session is over.
+        """
+        refreshed = await strategy.refresh(token, user_manager)
+        if refreshed is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+        return await backend.transport.get_login_response(refreshed)
+
+    return router
 
 
 def get_user_router() -> ExtendedRouter:
@@ -36,6 +71,13 @@ def get_user_router() -> ExtendedRouter:
             tags=["auth"],
         )
 
+    if AuthSettings.load().is_stateless:
+        router.include_router(
+            get_refresh_router(fastapi_users),
+            prefix="/auth/stateless",
+            tags=["auth"],
+        )
+
     profile_routes = 2
     router.include_router(
         APIRouter(
@@ -46,3 +46,20 @@ class UserUpdate(Schema, BaseUserUpdate):
     email: Annotated[
         EmailStr | None, Field(max_length=256, examples=["ivanov@mail.ru"])
     ] = None
+
+
+class CachedUser(Schema):
+    """
+    The authenticated user as kept in the cache, which is not bound to any DB
+    session.
+    """
+
+    id: int
+    nickname: str
+    email: str
+    # Is never cached or put into tokens, so that the hash cannot be collected
+    # there, as only the DB user needs it.
+    hashed_password: Annotated[str, Field(exclude=True)] = ""
+    is_active: bool
+    is_superuser: bool
+    is_verified: bool
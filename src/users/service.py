@@ -1,4 +1,4 @@
-from typing import cast, override
+from typing import Any, cast, override
 
 from fastapi import HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
@@ -19,6 +19,7 @@ from fastapi_users.schemas import BaseUserCreate, BaseUserUpdate
 
 from src.core.asgi import ExtendedRequest
 from src.core.settings import AuthSettings
+from src.core.utils.executors import Executor
 from src.core.utils.mail import MailSession
 from src.users.db.models import DBUserProtocol
 from src.users.errors import (
@@ -32,18 +33,22 @@ from src.users.errors import (
 )
 from src.users.schemas import UserCreate
 from src.users.utils.password_validators import PasswordValidator
+from src.users.utils.strategies import UserInvalidator
 
 
 class UserManager(IntegerIDMixin, BaseUserManager[DBUserProtocol, int]):
     """
-    Also overrides exception classes via their interception.
+    Also overrides exception classes via their interception. Passwords are
+    hashed and scored in the executor rather than in the event loop.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913 # Follows the lib constructor.
         self,
         user_db: BaseUserDatabase[DBUserProtocol, int],
         settings: AuthSettings,
         password_validator: PasswordValidator,
+        invalidator: UserInvalidator,
+        executor: Executor,
         password_helper: PasswordHelperProtocol | None = None,
     ) -> None:
         super().__init__(user_db, password_helper)
@@ -54,6 +59,8 @@ class UserManager(IntegerIDMixin, BaseUserManager[DBUserProtocol, int]):
             self._settings.password_reset_secret,
         )
         self._password_validator = password_validator
+        self._invalidator = invalidator
+        self._executor = executor
 
     @override
     async def validate_password(
@@ -67,7 +74,8 @@ class UserManager(IntegerIDMixin, BaseUserManager[DBUserProtocol, int]):
         # (see «fastapi_users.get_register_router(UserRead, UserCreate)» in
         # routes.py)
         user = cast(UserCreate | DBUserProtocol, user)
-        report = self._password_validator.validate(
+        report = await self._executor.run(
+            self._password_validator.validate,
             password,
             related=(user.nickname, user.email),
         )
@@ -127,10 +135,30 @@ class UserManager(IntegerIDMixin, BaseUserManager[DBUserProtocol, int]):
         if request is None:
             raise HTTPException(status_code=500)
 
-        try:
-            return await super().create(user_create, safe, request)
-        except LibUserAlreadyExists as exc:
-            raise AlreadyExistsError from exc
+        # Follows the lib, except for hashing, which is pinned by the tests.
+        await self.validate_password(user_create.password, user_create)
+        if await self.user_db.get_by_email(user_create.email) is not None:
+            raise AlreadyExistsError
+
+        user_dict = (
+            user_create.create_update_dict()  # type: ignore[no-untyped-call] # The lib is partially typed.
+            if safe
+            else user_create.create_update_dict_superuser()  # type: ignore[no-untyped-call] # The lib is partially typed.
+        )
+        user_dict["hashed_password"] = await self._hash(
+            user_dict.pop("password")
+        )
+        created_user = await self.user_db.create(user_dict)
+        await self.on_after_register(created_user, request)
+
+        return created_user
+
+    async def _hash(self, password: str) -> str:
+        """
+        The lib hashes passwords in the event loop, so the methods doing it
+        are reimplemented around this one.
+        """
+        return await self._executor.run(self.password_helper.hash, password)
 
     @override
     async def update(
@@ -143,19 +171,77 @@ class UserManager(IntegerIDMixin, BaseUserManager[DBUserProtocol, int]):
         if request is None:
             raise HTTPException(status_code=500)
 
+        # The authenticated user may be a cached copy, which is not bound to
+        # the DB session.
+        user = await self.get(user.id)
         try:
             return await super().update(user_update, user, safe, request)
         except LibUserAlreadyExists as exc:
             raise AlreadyExistsError from exc
 
+    @override
+    async def _update(
+        self, user: DBUserProtocol, update_dict: dict[str, Any]
+    ) -> DBUserProtocol:
+        # The lib would hash the password itself.
+        if (password := update_dict.pop("password", None)) is not None:
+            await self.validate_password(password, user)
+            update_dict["hashed_password"] = await self._hash(password)
+
+        return await super()._update(user, update_dict)
+
+    @override
+    async def on_after_update(
+        self,
+        user: DBUserProtocol,
+        update_dict: dict[str, Any],
+        request: Request | None = None,
+    ) -> None:
+        # Also covers the deactivation.
+        await self._invalidator.invalidate(user)
+
+    @override
+    async def on_after_reset_password(
+        self, user: DBUserProtocol, request: Request | None = None
+    ) -> None:
+        await self._invalidator.invalidate(user)
+
+    @override
+    async def on_after_verify(
+        self, user: DBUserProtocol, request: Request | None = None
+    ) -> None:
+        # The verification is not reported as an update by the lib.
+        await self._invalidator.invalidate(user)
+
+    @override
+    async def on_after_delete(
+        self, user: DBUserProtocol, request: Request | None = None
+    ) -> None:
+        # Cached copies would keep authenticating the user otherwise.
+        await self._invalidator.invalidate(user)
+
     @override
     async def authenticate(
         self, credentials: OAuth2PasswordRequestForm
     ) -> DBUserProtocol | None:
-        user = await super().authenticate(credentials)
+        # Follows the lib, except for hashing and errors, which is pinned by
+        # the tests.
+        try:
+            user = await self.get_by_email(credentials.username)
+        except LibUserNotExists:
+            # Takes as much time as for an existing user.
+            await self._hash(credentials.password)
+            raise AuthenticationError from None
 
-        if user is None or not user.is_active:
+        is_verified, updated_hash = await self._executor.run(
+            self.password_helper.verify_and_update,
+            credentials.password,
+            user.hashed_password,
+        )
+        if not is_verified or not user.is_active:
             raise AuthenticationError
+        if updated_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_hash})
 
         if not user.is_verified:
             raise UnverifiedError
@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from typing import Annotated, ClassVar, Literal, override
 
 from pydantic import AliasPath, Field, NonNegativeInt
-from zxcvbn import zxcvbn
 
 from src.core.schemas import NonEmptyStr, Schema
 
@@ -12,12 +11,13 @@ class Report(Schema):
     is_strong: bool
     score: NonNegativeInt
     strength: Literal["Very Weak", "Weak", "Medium", "Strong", "Very Strong"]
-    improvements: Iterable[NonEmptyStr]
+    # Not a lazy iterable, since reports may be sent between processes.
+    improvements: Sequence[NonEmptyStr]
 
 
 class ZXCVBNReport(Report):
     improvements: Annotated[
-        Iterable[NonEmptyStr],
+        Sequence[NonEmptyStr],
         Field(validation_alias=AliasPath("feedback", "suggestions")),
     ]
 
@@ -29,6 +29,12 @@ class PasswordValidator(ABC):
 
 
 class ZXCVBNValidator(PasswordValidator):
+    """
+    The lib ranks its dictionaries on import, which takes over 10 MB per
+    process, so it is imported on first use: only by the processes that
+    validate passwords (e.g. those of the executor).
+    """
+
     STRENGTH: ClassVar = (
         "Very Weak",
         "Weak",
@@ -45,6 +51,8 @@ class ZXCVBNValidator(PasswordValidator):
         *,
         related: Iterable[str] = (),
     ) -> Report:
+        from zxcvbn import zxcvbn
+
         report = zxcvbn(password, user_inputs=related)
 
         return ZXCVBNReport.model_validate(
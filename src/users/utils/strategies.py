@@ -0,0 +1,367 @@
+import asyncio
+import secrets
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import suppress
+from time import monotonic, time
+from typing import Any, ClassVar, cast, override
+
+import jwt
+from fastapi_users import BaseUserManager
+from fastapi_users.authentication import JWTStrategy, RedisStrategy
+from fastapi_users.exceptions import InvalidID, UserNotExists
+from fastapi_users.jwt import generate_jwt
+from redis.exceptions import RedisError
+
+from src.core.deps.db import Redis_
+from src.core.settings import AuthSettings, UserCacheSettings
+from src.core.utils.loggers import Logger
+from src.users.db.models import DBUserProtocol
+from src.users.schemas import CachedUser
+
+
+class UserInvalidator(ABC):
+    @abstractmethod
+    async def invalidate(self, user: DBUserProtocol) -> None:
+        """
+        Makes the changes of the user (e.g. the deactivation) effective for
+        the tokens issued before.
+        """
+        raise NotImplementedError
+
+
+class CachedRedisStrategy(RedisStrategy[DBUserProtocol, int], UserInvalidator):
+    """
+    Keeps the user next to the token, so both are fetched in a single round
+    trip instead of a Redis one followed by a DB one. The hottest users are
+    also kept in the process for a short time.
+
+    The user is not bound to any DB session, so it has to be read again before
+    being changed.
+    """
+
+    def __init__(
+        self,
+        redis_: Redis_,
+        settings: UserCacheSettings,
+        lifetime_seconds: int | None = None,
+    ) -> None:
+        super().__init__(redis_, lifetime_seconds)
+
+        self._settings = settings
+        # Expiration times and users in the least recently used order.
+        self._local: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    @staticmethod
+    def _get_user_key(token: str) -> str:
+        return f"fastapi_users_user:{token}"
+
+    @staticmethod
+    def _get_tokens_key(user_id: int) -> str:
+        return f"fastapi_users_tokens:{user_id}"
+
+    @override
+    async def read_token(
+        self,
+        token: str | None,
+        user_manager: BaseUserManager[DBUserProtocol, int],
+    ) -> DBUserProtocol | None:
+        if token is None or not self._settings.time:
+            return await super().read_token(token, user_manager)
+
+        if (cached := self._get_local(token)) is not None:
+            return CachedUser.model_validate_json(cached)
+
+        # The client does not decode responses, unlike the stubs of Redis_ say.
+        user_id, cached = cast(
+            tuple[bytes | None, bytes | None],
+            await self.redis.pipeline(transaction=False)
+            .get(f"{self.key_prefix}{token}")
+            .get(self._get_user_key(token))
+            .execute(),
+        )
+        if user_id is None:
+            return None
+        if cached is not None:
+            self._set_local(token, cached)
+            return CachedUser.model_validate_json(cached)
+
+        try:
+            user = await user_manager.get(user_manager.parse_id(user_id))
+        except (UserNotExists, InvalidID):
+            return None
+
+        cached = CachedUser.model_validate(user).model_dump_json().encode()
+        tokens_key = self._get_tokens_key(user.id)
+        # The cache is only an optimization, unlike the token itself.
+        with suppress(RedisError):
+            await (
+                self.redis.pipeline(transaction=False)
+                .set(self._get_user_key(token), cached, ex=self._settings.time)
+                .sadd(tokens_key, token)
+                .expire(tokens_key, self._settings.time)
+                .execute()
+            )
+        self._set_local(token, cached)
+
+        return user
+
+    @override
+    async def destroy_token(self, token: str, user: DBUserProtocol) -> None:
+        self._local.pop(token, None)
+
+        await (
+            self.redis.pipeline(transaction=False)
+            .delete(f"{self.key_prefix}{token}", self._get_user_key(token))
+            .srem(self._get_tokens_key(user.id), token)
+            .execute()
+        )
+
+    @override
+    async def invalidate(self, user: DBUserProtocol) -> None:
+        """
+        Drops the cached copies of the user for all of its tokens. Other
+        workers may keep them for the local time at most.
+        """
+        tokens_key = self._get_tokens_key(user.id)
+        tokens = [
+            token.decode()
+            for token in cast(set[bytes], await self.redis.smembers(tokens_key))
+        ]
+
+        for token in tokens:
+            self._local.pop(token, None)
+        await self.redis.delete(
+            tokens_key, *(self._get_user_key(token) for token in tokens)
+        )
+
+    def _get_local(self, token: str) -> bytes | None:
+        if (cached := self._local.get(token)) is None:
+            return None
+
+        expires_at, user = cached
+        if expires_at <= monotonic():
+            del self._local[token]
+            return None
+        self._local.move_to_end(token)
+
+        return user
+
+    def _set_local(self, token: str, user: bytes) -> None:
+        if not self._settings.local_size:
+            return
+
+        self._local[token] = (monotonic() + self._settings.local_time, user)
+        self._local.move_to_end(token)
+        while len(self._local) > self._settings.local_size:
+            self._local.popitem(last=False)
+
+
+class StatelessStrategy(JWTStrategy[DBUserProtocol, int], UserInvalidator):
+    """
+    Short-lived tokens carry the user, so they are verified without any I/O.
+    Each login starts a session in Redis, which is only checked when the
+    token is refreshed.
+
+    Revoked sessions and invalidated users are kept in Redis until the tokens
+    issued before expire. They are also broadcast to all workers, which keep
+    them in memory, and are reloaded after a reconnection.
+    """
+
+    DENIED_KEY: ClassVar = "auth_denied"
+    RECONNECT_INTERVAL: ClassVar = 5.0
+
+    def __init__(
+        self, redis_: Redis_, settings: AuthSettings, logger: Logger
+    ) -> None:
+        super().__init__(
+            cast(str, settings.access_token_secret),
+            settings.access_token_lifetime,
+        )
+
+        self._redis = redis_
+        self._settings = settings
+        self._logger = logger
+        self._task: asyncio.Task[None] | None = None
+        # Expiration times of denied sessions and the time before which the
+        # tokens of denied users are issued.
+        self._denied_sessions: dict[str, float] = {}
+        self._denied_users: dict[int, float] = {}
+
+    @staticmethod
+    def _get_session_key(session: str) -> str:
+        return f"auth_session:{session}"
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    @override
+    async def read_token(
+        self,
+        token: str | None,
+        user_manager: BaseUserManager[DBUserProtocol, int],
+    ) -> DBUserProtocol | None:
+        if token is None or (claims := self._decode(token)) is None:
+            return None
+        if claims["jti"] in self._denied_sessions or claims[
+            "iat"
+        ] <= self._denied_users.get(int(claims["sub"]), 0):
+            return None
+
+        return CachedUser.model_validate(
+            {**claims["user"], "id": claims["sub"]}
+        )
+
+    @override
+    async def write_token(self, user: DBUserProtocol) -> str:
+        session = secrets.token_urlsafe()
+        await self._redis.set(
+            self._get_session_key(session),
+            user.id,
+            ex=self._settings.session_lifetime,
+        )
+
+        return self._encode(user, session)
+
+    @override
+    async def destroy_token(self, token: str, user: DBUserProtocol) -> None:
+        if (claims := self._decode(token)) is None:
+            return
+
+        await self._redis.delete(self._get_session_key(claims["jti"]))
+        await self._deny(f"jti:{claims['jti']}")
+
+    async def refresh(
+        self,
+        token: str,
+        user_manager: BaseUserManager[DBUserProtocol, int],
+    ) -> str | None:
+        """
+        Issues a new token for the same session, reading the user again, e.g.
+        to refuse deactivated ones. The given token may be expired.
+        """
+        if (claims := self._decode(token, is_expired=True)) is None:
+            return None
+        if await self._redis.get(self._get_session_key(claims["jti"])) is None:
+            return None
+
+        try:
+            user = await user_manager.get(int(claims["sub"]))
+        except UserNotExists:
+            return None
+        if not user.is_active:
+            return None
+
+        return self._encode(user, claims["jti"])
+
+    @override
+    async def invalidate(self, user: DBUserProtocol) -> None:
+        await self._deny(f"sub:{user.id}:{time()}")
+
+    def _encode(self, user: DBUserProtocol, session: str) -> str:
+        return generate_jwt(
+            {
+                "sub": str(user.id),
+                "aud": self.token_audience,
+                "jti": session,
+                "iat": time(),
+                "user": CachedUser.model_validate(user).model_dump(
+                    mode="json", exclude={"id"}
+                ),
+            },
+            self.encode_key,
+            self.lifetime_seconds,
+            algorithm=self.algorithm,
+        )
+
+    def _decode(
+        self, token: str, *, is_expired: bool = False
+    ) -> dict[str, Any] | None:
+        try:
+            claims: dict[str, Any] = jwt.decode(
+                token,
+                cast(str, self.decode_key),
+                audience=self.token_audience,
+                algorithms=[self.algorithm],
+                options={
+                    "verify_exp": not is_expired,
+                    "require": ["sub", "jti", "iat"],
+                },
+            )
+        except jwt.PyJWTError:
+            return None
+
+        return claims
+
+    async def _deny(self, denial: str) -> None:
+        self._apply(denial)
+
+        now = time()
+        await (
+            self._redis.pipeline(transaction=False)
+            .zremrangebyscore(self.DENIED_KEY, "-inf", now)
+            .zadd(
+                self.DENIED_KEY,
+                {denial: now + self._settings.access_token_lifetime},
+            )
+            .publish(self.DENIED_KEY, denial)
+            .execute()
+        )
+
+    def _apply(self, denial: str) -> None:
+        now = time()
+        expires_at = now + self._settings.access_token_lifetime
+        self._denied_sessions = {
+            session: time_
+            for session, time_ in self._denied_sessions.items()
+            if time_ > now
+        }
+        self._denied_users = {
+            user_id: time_
+            for user_id, time_ in self._denied_users.items()
+            if time_ + self._settings.access_token_lifetime > now
+        }
+
+        match denial.split(":"):
+            case ["jti", session]:
+                self._denied_sessions[session] = expires_at
+            case ["sub", user_id, issued_before]:
+                self._denied_users[int(user_id)] = max(
+                    float(issued_before),
+                    self._denied_users.get(int(user_id), 0),
+                )
+            case _:
+                self._logger.warning("Unknown token denial: %s.", denial)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(self.DENIED_KEY)
+                    # Denials made while disconnected are unknown otherwise.
+                    for denial in await self._redis.zrangebyscore(
+                        self.DENIED_KEY, time(), "+inf"
+                    ):
+                        self._apply(self._to_str(denial))
+
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._apply(self._to_str(message["data"]))
+            except RedisError:
+                self._logger.exception("Failed to listen for token denials.")
+                await asyncio.sleep(self.RECONNECT_INTERVAL)
+
+    @staticmethod
+    def _to_str(denial: str | bytes) -> str:
+        # The client does not decode responses, unlike the stubs of Redis_ say.
+        return denial.decode() if isinstance(denial, bytes) else denial
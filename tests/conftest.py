@@ -35,7 +35,7 @@ from src.core.settings import DocsSettings, ExternalAPISettings
 from src.core.utils.paginators import FastAPIPagination
 from src.main import get_prod_deps
 from src.users.db.models import SQLAlchemyUser
-from src.users.deps import get_authenticated
+from src.users.deps import get_authenticated, get_superuser
 from src.users.errors import get_user_handling_map
 from src.users.routes import get_user_router
 from tests.deps import SQLAlchemyTestProvider
@@ -195,7 +195,8 @@ async def current_sqlalchemy_user_mock(
     async def get_authenticated_override() -> SQLAlchemyUser:
         return user
 
-    app.dependency_overrides[get_authenticated] = get_authenticated_override
+    app.dependency_overrides[get_authenticated()] = get_authenticated_override
+    app.dependency_overrides[get_superuser()] = get_authenticated_override
 
     yield user
 
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from src.core.db.sessions import SQLAlchemySession
 from src.core.deps.base import BaseProvider
+from src.core.settings import PaginationSettings
 
 
 class SQLAlchemyTestProvider(BaseProvider):
@@ -18,3 +19,24 @@ class SQLAlchemyTestProvider(BaseProvider):
         """
         async with session_maker() as session, session.begin_nested():
             yield session
+
+
+class PaginationTestProvider(BaseProvider):
+    def __init__(self, *, is_native: bool, is_projected: bool = False) -> None:
+        super().__init__()
+        self._is_native = is_native
+        self._is_projected = is_projected
+
+    @provide(override=True)
+    def get_pagination_settings(self) -> PaginationSettings:
+        """
+        Cached totals would leak between tests, since their data is rolled
+        back.
+        """
+        return PaginationSettings.model_validate(
+            {
+                "native_pagination": self._is_native,
+                "pagination_total_cache_time": 0,
+                "projected_pagination": self._is_projected,
+            }
+        )
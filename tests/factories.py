@@ -8,6 +8,7 @@ from polyfactory.factories.sqlalchemy_factory import SQLAlchemyFactory
 from src.core.db.models import SQLAlchemyModel, SQLAlchemyPKModel
 from src.core.db.sessions import SQLAlchemySession
 from src.core.schemas import (
+    CursorSearch,
     CursorSortingSearch,
     OffsetSortingSearch,
     Schema,
@@ -28,6 +29,10 @@ class OffsetSortingSearchFactory(ExtendedPydanticFactory[OffsetSortingSearch]):
     pass
 
 
+class CursorSearchFactory(ExtendedPydanticFactory[CursorSearch]):
+    pass
+
+
 class CursorSortingSearchFactory(ExtendedPydanticFactory[CursorSortingSearch]):
     pass
 
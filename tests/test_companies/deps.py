@@ -3,14 +3,19 @@
 # Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
 
 from unittest.mock import create_autospec
+from uuid import uuid4
 
 from dishka import provide
 
 from src.companies.service import CompanyService
 from src.core.deps.base import BaseProvider
+from src.core.schemas import Tagged
 from tests.test_companies.factories import (
+    CompaniesWriteSummaryFactory,
     CompanyBaseCursorPageFactory,
     CompanyBaseOffsetPageFactory,
+    CompanyReadFactory,
+    CompanyUsersBaseCursorPageFactory,
 )
 
 
@@ -21,7 +26,30 @@ class CompanyServiceMockProvider(BaseProvider):
     ) -> CompanyService:
         service: CompanyService = create_autospec(CompanyService, instance=True)
 
-        service.get_by_user.return_value = CompanyBaseOffsetPageFactory.build()
+        service.get_many.return_value = {
+            (company.brn, company.country): company
+            for company in CompanyReadFactory.batch(3)
+        }
+        service.get_by_user.return_value = CompanyBaseCursorPageFactory.build()
+        service.get_by_user_offset.return_value = (
+            CompanyBaseOffsetPageFactory.build()
+        )
         service.get_all.return_value = CompanyBaseCursorPageFactory.build()
+        service.get_by_user_json.return_value = Tagged(
+            etag=uuid4().hex,
+            content=CompanyBaseCursorPageFactory.build()
+            .model_dump_json(by_alias=True)
+            .encode(),
+        )
+        service.get_all_json.return_value = Tagged(
+            etag=uuid4().hex,
+            content=CompanyBaseCursorPageFactory.build()
+            .model_dump_json(by_alias=True)
+            .encode(),
+        )
+        service.get_users.return_value = (
+            CompanyUsersBaseCursorPageFactory.build()
+        )
+        service.create_many.return_value = CompaniesWriteSummaryFactory.build()
 
         return service
@@ -8,14 +8,18 @@ from pydantic_extra_types.country import CountryShortName
 from src.analytics.db.models import SQLAlchemyAnalytics
 from src.companies.db.models import SQLAlchemyCompany
 from src.companies.schemas import (
+    CompaniesSearch,
+    CompaniesWriteSummary,
     CompanyCreate,
     CompanyRead,
     CompanySearch,
     Countries,
+    UserCompaniesOffsetSearch,
     UserCompaniesSearch,
 )
 from src.core.schemas import BaseCursorPage, BaseOffsetPage
 from src.users.db.models import SQLAlchemyUser
+from src.users.schemas import UserRead
 from tests.factories import ExtendedPydanticFactory, ExtendedSQLAlchemyFactory
 from tests.test_analytics.factories import SQLAlchemyAnalyticsFactory
 from tests.test_users.factories import SQLAlchemyUserFactory
@@ -57,10 +61,26 @@ class CompanyCreateFactory(ExtendedPydanticFactory[CompanyCreate]):
         return get_country(cls)
 
 
+class CompaniesWriteSummaryFactory(
+    ExtendedPydanticFactory[CompaniesWriteSummary]
+):
+    pass
+
+
+class CompaniesSearchFactory(ExtendedPydanticFactory[CompaniesSearch]):
+    __use_defaults__ = True
+
+
 class UserCompaniesSearchFactory(ExtendedPydanticFactory[UserCompaniesSearch]):
     __use_defaults__ = True
 
 
+class UserCompaniesOffsetSearchFactory(
+    ExtendedPydanticFactory[UserCompaniesOffsetSearch]
+):
+    __use_defaults__ = True
+
+
 class CompanyReadFactory(ExtendedPydanticFactory[CompanyRead]):
     @classmethod
     def country(cls) -> CountryShortName:
@@ -79,6 +99,12 @@ class CompanyBaseCursorPageFactory(
     pass
 
 
+class CompanyUsersBaseCursorPageFactory(
+    ExtendedPydanticFactory[BaseCursorPage[UserRead]]
+):
+    pass
+
+
 class SQLAlchemyCompanyFactory(ExtendedSQLAlchemyFactory[SQLAlchemyCompany]):
     @classmethod
     def name(cls) -> str:
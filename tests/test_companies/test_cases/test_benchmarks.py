@@ -0,0 +1,100 @@
+# pyright: reportUninitializedInstanceVariable=false
+from collections.abc import AsyncGenerator
+from time import perf_counter
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from sqlalchemy import Select
+
+from src.companies.db.daos import (
+    SQLAlchemyCompanyDAO,
+    SQLAlchemyProjectedCompanyDAO,
+)
+from src.companies.schemas import CompaniesSearch
+from src.core.db.sessions import SQLAlchemySession
+from src.core.schemas import OrderBy, Total
+from src.core.settings import PaginationSettings
+from src.core.utils.paginators import DBPaginator
+from tests.deps import PaginationTestProvider
+from tests.test_analytics.factories import (
+    SQLAlchemyAnalyticsFactory,
+    SQLAlchemyRatioFactory,
+)
+from tests.test_companies.factories import SQLAlchemyCompanyFactory
+from tests.test_users.factories import SQLAlchemyUserFactory
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize(
+    "overridden_container",
+    [(PaginationTestProvider(is_native=True),)],
+    indirect=True,
+)
+@pytest.mark.usefixtures("postgresql")
+class TestCompanyDAOBenchmark:
+    COMPANIES = 1000
+    ANALYTICS = 5
+    RATIOS = 10
+    ROUNDS = 5
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(
+        self,
+        sqlalchemy_session: SQLAlchemySession,
+        overridden_container: AsyncContainer,
+    ) -> AsyncGenerator[None]:
+        self._session = sqlalchemy_session
+        paginator = await overridden_container.get(
+            DBPaginator[SQLAlchemySession, Select[Any]]
+        )
+        settings = await overridden_container.get(PaginationSettings)
+        self._daos = (
+            SQLAlchemyCompanyDAO(_paginator=paginator, _settings=settings),
+            SQLAlchemyProjectedCompanyDAO(
+                _paginator=paginator, _settings=settings
+            ),
+        )
+
+        users = SQLAlchemyUserFactory.batch(3)
+        self._session.add_all(
+            SQLAlchemyCompanyFactory.build(
+                analytics=[
+                    SQLAlchemyAnalyticsFactory.build(
+                        ratios=SQLAlchemyRatioFactory.batch(self.RATIOS)
+                    )
+                    for _ in range(self.ANALYTICS)
+                ],
+                users=users,
+            )
+            for _ in range(self.COMPANIES)
+        )
+        await self._session.flush()
+        self._session.expunge_all()
+
+        yield
+
+    @pytest.mark.asyncio
+    async def test_read_all(self) -> None:
+        search = CompaniesSearch(
+            size=self.COMPANIES,
+            order_by=OrderBy.DESC,
+            include_total=Total.OFF,
+        )
+        pages = []
+
+        for dao in self._daos:
+            elapsed = float("inf")
+            for _ in range(self.ROUNDS):
+                start = perf_counter()
+                page = await dao.read_all(session=self._session, clauses=search)
+                elapsed = min(elapsed, perf_counter() - start)
+                # Otherwise, the ORM would reuse instances between rounds.
+                self._session.expunge_all()
+
+            print(f"{type(dao).__name__}: {elapsed * 1000:.1f} ms")  # noqa: T201 # Is the result of the benchmark.
+            pages.append(page)
+
+        orm, projected = pages
+        assert orm == projected
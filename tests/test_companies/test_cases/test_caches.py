@@ -0,0 +1,250 @@
+# mypy: disable-error-code="attr-defined"
+# pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
+# Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
+
+import asyncio
+from typing import TYPE_CHECKING, Any
+from unittest.mock import AsyncMock, create_autospec
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+from sqlalchemy import Select
+
+from src.companies.db.daos import CachedCompanyDAO, SQLAlchemyCompanyDAO
+from src.companies.schemas import CompanyRead
+from src.core.db.listeners import AsyncpgListener
+from src.core.db.sessions import SQLAlchemySession
+from src.core.schemas import Tagged
+from src.core.settings import DBCredentials, ReadCacheSettings
+from src.core.utils.caches import Cache, TieredCache
+from src.core.utils.loggers import Logger
+from src.core.utils.paginators import DBPaginator
+from tests.test_companies.factories import (
+    CompaniesSearchFactory,
+    CompanyBaseCursorPageFactory,
+    CompanyCreateFactory,
+    CompanyReadFactory,
+    CompanySearchFactory,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+
+class TestCachedCompanyDAO:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._cache = await container.get(Cache)
+        await self._cache.invalidate(CachedCompanyDAO.NAMESPACE)
+
+        self._expected = create_autospec(SQLAlchemyCompanyDAO, instance=True)
+        self._session = create_autospec(SQLAlchemySession, instance=True)
+        self._callbacks: list[Callable[[], Awaitable[None]]] = []
+        self._session.after_commit.side_effect = self._callbacks.append
+        self._dao = CachedCompanyDAO[SQLAlchemySession, Select[Any]](
+            _paginator=await container.get(
+                DBPaginator[SQLAlchemySession, Select[Any]]
+            ),
+            _dao=self._expected,
+            _cache=self._cache,
+        )
+
+    async def _commit(self) -> None:
+        for callback in self._callbacks:
+            await callback()
+        self._callbacks.clear()
+
+    @pytest.mark.asyncio
+    async def test_read_one(self) -> None:
+        company = CompanySearchFactory.build()
+        self._expected.read_one.return_value = CompanyReadFactory.build()
+
+        first = await self._dao.read_one(self._session, company)
+        second = await self._dao.read_one(self._session, company)
+
+        self._expected.read_one.assert_awaited_once_with(self._session, company)
+        assert self._expected.read_one.return_value == first == second
+
+    @pytest.mark.asyncio
+    async def test_read_one_not_found(self) -> None:
+        company = CompanySearchFactory.build()
+        self._expected.read_one.return_value = None
+
+        for _ in range(2):
+            assert await self._dao.read_one(self._session, company) is None
+        self._expected.read_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_read_all(self) -> None:
+        clauses = CompaniesSearchFactory.build()
+        self._expected.read_all.return_value = (
+            CompanyBaseCursorPageFactory.build()
+        )
+
+        first = await self._dao.read_all(self._session, clauses)
+        second = await self._dao.read_all(self._session, clauses)
+
+        self._expected.read_all.assert_awaited_once()
+        assert first == second
+        assert self._expected.read_all.return_value.model_dump() == (
+            first.model_dump()
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_all_json_not_modified(self) -> None:
+        clauses = CompaniesSearchFactory.build()
+        expected = Tagged(etag=uuid4().hex, content=b'{"items":[]}')
+        self._expected.read_all_json.return_value = expected
+
+        first = await self._dao.read_all_json(self._session, clauses)
+        second = await self._dao.read_all_json(
+            self._session, clauses, {expected.etag}
+        )
+
+        self._expected.read_all_json.assert_awaited_once_with(
+            self._session, clauses
+        )
+        assert expected == first
+        assert Tagged(etag=expected.etag) == second
+
+    @pytest.mark.asyncio
+    async def test_write_one_invalidates(self) -> None:
+        company = CompanySearchFactory.build()
+        self._expected.read_one.return_value = None
+        self._expected.write_one.return_value = CompanyReadFactory.build()
+        rounds = 3
+
+        for _ in range(rounds):
+            await self._dao.read_one(self._session, company)
+            await self._dao.write_one(
+                self._session, CompanyCreateFactory.build()
+            )
+            await self._commit()
+
+        assert self._expected.read_one.await_count == rounds
+
+    @pytest.mark.asyncio
+    async def test_read_before_commit(self) -> None:
+        company = CompanySearchFactory.build()
+        old, new = CompanyReadFactory.batch(2)
+        is_committed = False
+
+        async def read_one(*_: Any) -> CompanyRead:
+            return new if is_committed else old
+
+        self._expected.read_one.side_effect = read_one
+        self._expected.write_one.return_value = new
+
+        await self._dao.read_one(self._session, company)
+        await self._dao.write_one(self._session, CompanyCreateFactory.build())
+        # The old rows are still the only visible ones.
+        assert old == await self._dao.read_one(self._session, company)
+        is_committed = True
+        await self._commit()
+
+        assert new == await self._dao.read_one(self._session, company)
+
+    @pytest.mark.asyncio
+    async def test_write_existing_keeps(self) -> None:
+        company = CompanySearchFactory.build()
+        self._expected.read_one.return_value = None
+        self._expected.write_one.return_value = None
+
+        await self._dao.read_one(self._session, company)
+        await self._dao.write_one(self._session, CompanyCreateFactory.build())
+        await self._commit()
+        await self._dao.read_one(self._session, company)
+
+        self._expected.read_one.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses(self) -> None:
+        company = CompanySearchFactory.build()
+        expected = CompanyReadFactory.build()
+
+        async def read_one(*_: Any) -> CompanyRead:
+            await asyncio.sleep(0.1)
+            return expected
+
+        self._expected.read_one.side_effect = read_one
+        size = 5
+
+        actual = await asyncio.gather(
+            *(self._dao.read_one(self._session, company) for _ in range(size))
+        )
+
+        self._expected.read_one.assert_awaited_once()
+        assert [expected] * size == actual
+        assert self._cache.stats["coalesced"] == size - 1
+
+    @pytest.mark.asyncio
+    async def test_evict(self) -> None:
+        company = CompanySearchFactory.build()
+        self._expected.read_one.return_value = CompanyReadFactory.build()
+
+        await self._dao.read_one(self._session, company)
+        self._cache.evict(CachedCompanyDAO.NAMESPACE)
+        await self._dao.read_one(self._session, company)
+
+        assert not self._cache.stats["local_hits"]
+
+
+class TestTieredCache:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._redis = create_autospec(Redis, instance=True)
+        # Commands are not coroutine functions, but return awaitables.
+        self._redis.set = AsyncMock(return_value=True)
+        self._redis.smembers = AsyncMock(return_value={b"cached"})
+        self._redis.delete = AsyncMock()
+        self._cache = TieredCache(
+            _redis=self._redis, _settings=await container.get(ReadCacheSettings)
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_shared(self) -> None:
+        await self._cache.invalidate(CachedCompanyDAO.NAMESPACE, is_shared=True)
+
+        self._redis.delete.assert_any_await(
+            f"cache:{CachedCompanyDAO.NAMESPACE}", b"cached"
+        )
+        # The lock is released at once.
+        self._redis.delete.assert_awaited_with(
+            f"cache:{CachedCompanyDAO.NAMESPACE}:invalidation"
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate_shared_locked(self) -> None:
+        self._redis.set.return_value = None
+
+        await self._cache.invalidate(CachedCompanyDAO.NAMESPACE, is_shared=True)
+
+        # Another process drops the shared values.
+        self._redis.smembers.assert_not_awaited()
+        assert self._cache.stats["evictions"] == 1
+
+
+class TestAsyncpgListener:
+    @pytest.mark.asyncio
+    async def test_notify(self, container: AsyncContainer) -> None:
+        cache = create_autospec(Cache, instance=True)
+        listener = AsyncpgListener(
+            _credentials=await container.get(DBCredentials),
+            _cache=cache,
+            _logger=await container.get(Logger),
+            _channels=frozenset({CachedCompanyDAO.NAMESPACE}),
+        )
+
+        # E.g. several transactions committed at once.
+        for _ in range(3):
+            listener._notify(None, 0, CachedCompanyDAO.NAMESPACE, "")  # noqa: SLF001
+        # Lets the scheduled invalidation start.
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        cache.invalidate.assert_awaited_once_with(
+            CachedCompanyDAO.NAMESPACE, is_shared=True
+        )
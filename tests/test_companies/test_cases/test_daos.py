@@ -1,38 +1,58 @@
 # pyright: reportUninitializedInstanceVariable=false
+import json
 from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
 
 import pytest
 import pytest_asyncio
 from dishka import AsyncContainer
 from pydantic_extra_types.country import CountryShortName
+from sqlalchemy import update
 
 from src.companies.db.daos import SQLAlchemyCompanyDAO
+from src.companies.db.models import SQLAlchemyCompany
 from src.companies.schemas import (
+    CompaniesSearch,
+    CompaniesWriteSummary,
     CompanyCreate,
+    CompanyFieldset,
     CompanyRead,
+    CompanyRecord,
     CompanySearch,
+    CompanyUsersSearch,
+    UserCompaniesOffsetSearch,
     UserCompaniesSearch,
+    get_ratios_arrow_schema,
 )
 from src.core.db.sessions import SQLAlchemySession
-from src.core.deps.paginators import FastAPIPaginationProvider
 from src.core.schemas import (
     BaseCursorPage,
     BaseOffsetPage,
-    CursorSortingSearch,
     OrderBy,
+    Schema,
+    Total,
 )
-from tests.factories import CursorSortingSearchFactory
+from src.core.settings import PaginationSettings
+from tests.deps import PaginationTestProvider
 from tests.test_companies.factories import (
+    CompaniesSearchFactory,
     CompanyCreateFactory,
     CompanySearchFactory,
     SQLAlchemyCompanyFactory,
+    UserCompaniesOffsetSearchFactory,
     UserCompaniesSearchFactory,
 )
 from tests.test_users.factories import SQLAlchemyUserFactory
 
 
 @pytest.mark.parametrize(
-    "overridden_container", [(FastAPIPaginationProvider(),)], indirect=True
+    "overridden_container",
+    [
+        (PaginationTestProvider(is_native=False),),
+        (PaginationTestProvider(is_native=True),),
+        (PaginationTestProvider(is_native=True, is_projected=True),),
+    ],
+    indirect=True,
 )
 @pytest.mark.parametrize(
     "sqlalchemy_factories",
@@ -52,6 +72,9 @@ class TestSQLAlchemyCompanyDAO:
     ) -> AsyncGenerator[None]:
         self._session = sqlalchemy_session
         self._dao = await overridden_container.get(SQLAlchemyCompanyDAO)
+        self._users_preview = (
+            await overridden_container.get(PaginationSettings)
+        ).users_preview
 
         self._company_factory, self._user_factory = sqlalchemy_factories
         self._company_factory.__set_relationships__ = True
@@ -60,11 +83,18 @@ class TestSQLAlchemyCompanyDAO:
 
         self._company_factory.__set_relationships__ = False
 
+    def _to_read(self, company: SQLAlchemyCompany) -> CompanyRead:
+        return CompanyRead.model_validate(
+            {
+                **CompanyRecord.model_validate(company).model_dump(),
+                "users": company.users[: self._users_preview],
+                "users_count": len(company.users),
+            }
+        )
+
     @pytest.mark.asyncio
     async def test_read_one(self) -> None:
-        expected = CompanyRead.model_validate(
-            await self._company_factory.create_async()
-        )
+        expected = self._to_read(await self._company_factory.create_async())
         actual = await self._dao.read_one(
             session=self._session,
             company=CompanySearch(
@@ -75,6 +105,78 @@ class TestSQLAlchemyCompanyDAO:
         assert actual is not None
         assert expected == actual
 
+    @pytest.mark.asyncio
+    async def test_read_one_users_preview(self) -> None:
+        users = await self._user_factory.create_batch_async(
+            self._users_preview + 2
+        )
+        company = await self._company_factory.create_async(users=users)
+
+        actual = await self._dao.read_one(
+            session=self._session,
+            company=CompanySearch(
+                brn=company.brn, country=CountryShortName(company.country)
+            ),
+        )
+
+        assert actual is not None
+        assert actual.users_count == len(users)
+        assert [user.nickname for user in actual.users] == sorted(
+            user.nickname for user in users
+        )[: self._users_preview]
+
+    @pytest.mark.asyncio
+    async def test_read_users(self) -> None:
+        users = await self._user_factory.create_batch_async(5)
+        company = await self._company_factory.create_async(users=users)
+        clauses = CompanyUsersSearch(
+            brn=company.brn, country=CountryShortName(company.country), size=3
+        )
+
+        first = await self._dao.read_users(
+            session=self._session, clauses=clauses
+        )
+        assert first is not None
+        second = await self._dao.read_users(
+            session=self._session,
+            clauses=clauses.model_copy(update={"next_page": first.next_page}),
+        )
+        assert second is not None
+
+        assert first.total == len(users)
+        assert second.next_page is None
+        assert [
+            user.nickname for user in (*first.items, *second.items)
+        ] == sorted(user.nickname for user in users)
+
+    @pytest.mark.asyncio
+    async def test_read_users_empty(self) -> None:
+        company = await self._company_factory.create_async(users=[])
+
+        actual = await self._dao.read_users(
+            session=self._session,
+            clauses=CompanyUsersSearch(
+                brn=company.brn,
+                country=CountryShortName(company.country),
+                size=3,
+            ),
+        )
+
+        assert actual is not None
+        assert actual.items == []
+
+    @pytest.mark.asyncio
+    async def test_read_users_not_found(self) -> None:
+        search = CompanySearchFactory.build()
+        actual = await self._dao.read_users(
+            session=self._session,
+            clauses=CompanyUsersSearch(
+                brn=search.brn, country=search.country, size=3
+            ),
+        )
+
+        assert actual is None
+
     @pytest.mark.asyncio
     async def test_read_not_found(
         self,
@@ -85,6 +187,29 @@ class TestSQLAlchemyCompanyDAO:
 
         assert actual is None
 
+    @pytest.mark.asyncio
+    async def test_write_many(self) -> None:
+        size = 5
+        actual = await self._dao.write_many(
+            session=self._session,
+            companies=CompanyCreateFactory.batch(size),
+        )
+
+        assert CompaniesWriteSummary(inserted=size, duplicates=0) == actual
+
+    @pytest.mark.asyncio
+    async def test_write_many_duplicates(self) -> None:
+        existing = CompanyCreate.model_validate(
+            await self._company_factory.create_async()
+        )
+        new = CompanyCreateFactory.build()
+        actual = await self._dao.write_many(
+            session=self._session,
+            companies=(existing, new, new),
+        )
+
+        assert CompaniesWriteSummary(inserted=1, duplicates=2) == actual
+
     @pytest.mark.asyncio
     async def test_write_one(
         self,
@@ -118,10 +243,10 @@ class TestSQLAlchemyCompanyDAO:
     ) -> None:
         user = await self._user_factory.create_async()
         size = 3
-        expected = BaseOffsetPage[CompanyRead](
+        expected = BaseCursorPage[CompanyRead](
             items=sorted(  # pyright: ignore[reportCallIssue] # Score is guaranteed not to be None, as it is defined at the factory.
                 map(
-                    CompanyRead.model_validate,
+                    self._to_read,
                     await self._company_factory.create_batch_async(
                         size, users=[user]
                     ),
@@ -130,14 +255,103 @@ class TestSQLAlchemyCompanyDAO:
                 reverse=True,
             ),
             total=size,
+            current_page="Pg%3D%3D",
+            previous_page=None,
+            next_page=None,
+        )
+
+        actual = await self._dao.read_by_user(
+            session=self._session,
+            clauses=UserCompaniesSearch(
+                user_nickname=user.nickname,
+                order_by=OrderBy.DESC,
+                next_page=None,
+                size=size,
+            ),
+        )
+        assert expected == actual
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_next_page(
+        self,
+    ) -> None:
+        user = await self._user_factory.create_async()
+        size = 2
+        expected = [
+            company.brn
+            for company in sorted(
+                await self._company_factory.create_batch_async(
+                    size * 2, users=[user]
+                ),
+                key=lambda company: (company.score, company.id),
+            )
+        ]
+
+        clauses = UserCompaniesSearch(
+            user_nickname=user.nickname,
+            order_by=OrderBy.ASC,
+            next_page=None,
+            size=size,
+        )
+        first = await self._dao.read_by_user(
+            session=self._session, clauses=clauses
+        )
+        second = await self._dao.read_by_user(
+            session=self._session,
+            clauses=clauses.model_copy(update={"next_page": first.next_page}),
+        )
+
+        assert first.next_page is not None
+        assert expected == [
+            company.model_dump()["brn"]
+            for company in (*first.items, *second.items)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_empty(
+        self,
+    ) -> None:
+        await self._company_factory.create_async(users=[])
+        expected = BaseCursorPage[CompanyRead](
+            items=[],
+            total=0,
+            current_page="Pg%3D%3D",
+            previous_page=None,
+            next_page=None,
+        )
+
+        actual = await self._dao.read_by_user(
+            session=self._session,
+            clauses=UserCompaniesSearchFactory.build(),
+        )
+        assert expected == actual
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_offset(
+        self,
+    ) -> None:
+        user = await self._user_factory.create_async()
+        size = 3
+        expected = BaseOffsetPage[CompanyRead](
+            items=[
+                self._to_read(company)
+                for company in sorted(
+                    await self._company_factory.create_batch_async(
+                        size, users=[user]
+                    ),
+                    key=lambda company: (company.score, company.id),
+                    reverse=True,
+                )
+            ],
+            total=size,
             page=1,
             size=size,
             pages=1,
         )
 
-        actual = await self._dao.read_by_user(
+        actual = await self._dao.read_by_user_offset(
             session=self._session,
-            clauses=UserCompaniesSearch(
+            clauses=UserCompaniesOffsetSearch(
                 user_nickname=user.nickname,
                 order_by=OrderBy.DESC,
                 page=1,
@@ -147,16 +361,47 @@ class TestSQLAlchemyCompanyDAO:
         assert expected == actual
 
     @pytest.mark.asyncio
-    async def test_read_by_user_empty(
+    async def test_read_by_user_offset_as_cursor(
+        self,
+    ) -> None:
+        user = await self._user_factory.create_async()
+        await self._company_factory.create_batch_async(2, users=[user])
+        await self._company_factory.create_async(users=[user], score=None)
+        size = 3
+
+        cursor = await self._dao.read_by_user(
+            session=self._session,
+            clauses=UserCompaniesSearch(
+                user_nickname=user.nickname,
+                order_by=OrderBy.ASC,
+                next_page=None,
+                size=size,
+            ),
+        )
+        offset = await self._dao.read_by_user_offset(
+            session=self._session,
+            clauses=UserCompaniesOffsetSearch(
+                user_nickname=user.nickname,
+                order_by=OrderBy.ASC,
+                page=1,
+                size=size,
+            ),
+        )
+
+        # Companies without a score are placed the same way by both.
+        assert cursor.items == offset.items
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_offset_empty(
         self,
     ) -> None:
         await self._company_factory.create_async(users=[])
-        search = UserCompaniesSearchFactory.build()
+        search = UserCompaniesOffsetSearchFactory.build()
         expected = BaseOffsetPage[CompanyRead](
             items=[], total=0, page=1, size=search.size, pages=0
         )
 
-        actual = await self._dao.read_by_user(
+        actual = await self._dao.read_by_user_offset(
             session=self._session,
             clauses=search,
         )
@@ -168,7 +413,7 @@ class TestSQLAlchemyCompanyDAO:
         expected = BaseCursorPage[CompanyRead](
             items=sorted(
                 map(
-                    CompanyRead.model_validate,
+                    self._to_read,
                     await self._company_factory.create_batch_async(size),
                 ),
                 key=lambda company: company.created_at,
@@ -182,7 +427,7 @@ class TestSQLAlchemyCompanyDAO:
 
         actual = await self._dao.read_all(
             session=self._session,
-            clauses=CursorSortingSearch(
+            clauses=CompaniesSearch(
                 order_by=OrderBy.DESC,
                 next_page=None,
                 size=size,
@@ -190,6 +435,191 @@ class TestSQLAlchemyCompanyDAO:
         )
         assert expected == actual
 
+    @pytest.mark.asyncio
+    async def test_read_all_json(self) -> None:
+        await self._company_factory.create_batch_async(3)
+        clauses = CompaniesSearch(order_by=OrderBy.DESC, size=2)
+
+        expected = await self._dao.read_all(
+            session=self._session, clauses=clauses
+        )
+        tagged = await self._dao.read_all_json(
+            session=self._session, clauses=clauses
+        )
+        assert tagged.content is not None
+        actual = BaseCursorPage[CompanyRead].model_validate_json(tagged.content)
+        assert expected == actual
+        # Both paths send the same keys.
+        assert json.loads(expected.model_dump_json(by_alias=True)).keys() == (
+            json.loads(tagged.content).keys()
+        )
+
+    @pytest.mark.asyncio
+    async def test_export(self) -> None:
+        size = 3
+        await self._company_factory.create_batch_async(size)
+
+        expected = await self._dao.read_all(
+            session=self._session,
+            clauses=CompaniesSearch(order_by=OrderBy.ASC, size=size),
+        )
+        actual = [
+            company
+            async for batch in self._dao.export(
+                session=self._session, fieldset=CompanyFieldset()
+            )
+            for company in batch
+        ]
+        assert sorted(expected.items, key=Schema.model_dump_json) == (
+            sorted(actual, key=Schema.model_dump_json)
+        )
+
+    @pytest.mark.asyncio
+    async def test_export_ratios(self) -> None:
+        companies = await self._company_factory.create_batch_async(3)
+
+        rows = [
+            row
+            async for batch in self._dao.export_ratios(session=self._session)
+            for row in batch
+        ]
+        assert {company.brn for company in companies} == {
+            brn for brn, *_ in rows
+        }
+        assert all(len(get_ratios_arrow_schema()) == len(row) for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_read_all_json_not_modified(self) -> None:
+        (company,) = await self._company_factory.create_batch_async(1)
+        clauses = CompaniesSearch(order_by=OrderBy.DESC, size=2)
+
+        first = await self._dao.read_all_json(
+            session=self._session, clauses=clauses
+        )
+        second = await self._dao.read_all_json(
+            session=self._session, clauses=clauses, etags={first.etag}
+        )
+        assert first.etag == second.etag
+        assert second.content is None
+
+        await self._session.execute(
+            update(SQLAlchemyCompany)
+            .where(SQLAlchemyCompany.id == company.id)
+            .values(score=50)
+        )
+        third = await self._dao.read_all_json(
+            session=self._session, clauses=clauses, etags={first.etag}
+        )
+        assert first.etag != third.etag
+        assert third.content is not None
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_json(self) -> None:
+        user = await self._user_factory.create_async()
+        await self._company_factory.create_batch_async(3, users=[user])
+        clauses = UserCompaniesSearch(
+            user_nickname=user.nickname, order_by=OrderBy.DESC, size=2
+        )
+
+        expected = await self._dao.read_by_user(
+            session=self._session, clauses=clauses
+        )
+        tagged = await self._dao.read_by_user_json(
+            session=self._session, clauses=clauses
+        )
+        assert tagged.content is not None
+        actual = BaseCursorPage[CompanyRead].model_validate_json(tagged.content)
+        assert expected == actual
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_json_as_pydantic(self) -> None:
+        user = await self._user_factory.create_async()
+        for created_at in (
+            datetime(2025, 1, 1, tzinfo=UTC),
+            datetime(2025, 1, 1, 0, 0, 0, 120000, tzinfo=UTC),
+        ):
+            await self._company_factory.create_async(
+                users=[user], created_at=created_at
+            )
+        clauses = UserCompaniesSearch(
+            user_nickname=user.nickname, order_by=OrderBy.DESC
+        )
+
+        expected = await self._dao.read_by_user(
+            session=self._session, clauses=clauses
+        )
+        tagged = await self._dao.read_by_user_json(
+            session=self._session, clauses=clauses
+        )
+
+        # Values are compared as they are sent, e.g. timestamps as strings.
+        assert tagged.content is not None
+        assert [
+            json.loads(company.model_dump_json(by_alias=True))
+            for company in expected.items
+        ] == json.loads(tagged.content)["items"]
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_fieldset(self) -> None:
+        user = await self._user_factory.create_async()
+        await self._company_factory.create_batch_async(3, users=[user])
+        clauses = UserCompaniesSearch(
+            user_nickname=user.nickname,
+            fields="name,brn",
+            include="users",
+            order_by=OrderBy.DESC,
+        )
+
+        actual = await self._dao.read_by_user(
+            session=self._session, clauses=clauses
+        )
+        assert all(
+            company.model_dump().keys()
+            == {"name", "brn", "users", "users_count"}
+            for company in actual.items
+        )
+        tagged = await self._dao.read_by_user_json(
+            session=self._session, clauses=clauses
+        )
+        assert tagged.content is not None
+        assert actual.items == (
+            BaseCursorPage[clauses.get_schema()]  # type: ignore[misc] # pyright: ignore[reportInvalidTypeForm] # Parametrization happens in runtime.
+            .model_validate_json(tagged.content)
+            .items
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_all_without_total(self) -> None:
+        await self._company_factory.create_batch_async(3)
+
+        actual = await self._dao.read_all(
+            session=self._session,
+            clauses=CompaniesSearch(
+                order_by=OrderBy.DESC,
+                size=1,
+                include_total=Total.OFF,
+            ),
+        )
+        assert actual.total is None
+
+    @pytest.mark.asyncio
+    async def test_read_by_user_estimated(self) -> None:
+        user = await self._user_factory.create_async()
+        await self._company_factory.create_batch_async(3, users=[user])
+
+        actual = await self._dao.read_by_user(
+            session=self._session,
+            clauses=UserCompaniesSearch(
+                user_nickname=user.nickname,
+                order_by=OrderBy.DESC,
+                size=1,
+                include_total=Total.ESTIMATED,
+            ),
+        )
+        # The estimation depends on the planner statistics, so only its
+        # presence is guaranteed.
+        assert actual.total is not None
+
     @pytest.mark.asyncio
     async def test_read_all_empty(
         self,
@@ -204,6 +634,6 @@ class TestSQLAlchemyCompanyDAO:
 
         actual = await self._dao.read_all(
             session=self._session,
-            clauses=CursorSortingSearchFactory.build(),
+            clauses=CompaniesSearchFactory.build(),
         )
         assert expected == actual
@@ -2,20 +2,47 @@
 # pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
 # Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
 
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from decimal import Decimal
+from itertools import chain
+from uuid import uuid4
 
+import pyarrow as pa
+import pyarrow.parquet as pq
 import pytest
 import pytest_asyncio
+from fastapi import status
 from httpx import AsyncClient
 
-from src.companies.schemas import UserCompaniesSearch
+from src.companies.schemas import (
+    MAX_BULK_SIZE,
+    CompaniesSearch,
+    CompanyCreate,
+    CompanyFieldset,
+    CompanyUsersSearch,
+    UserCompaniesOffsetSearch,
+    UserCompaniesSearch,
+    get_ratios_arrow_schema,
+)
 from src.companies.service import CompanyService
 from src.core.asgi import Architecture
+from src.core.schemas import ColumnarFormat, ExportFormat, Tagged
 from src.core.settings import DocsSettings
 from src.users.db.models import SQLAlchemyUser
 from tests.factories import (
+    CursorSearchFactory,
     CursorSortingSearchFactory,
     OffsetSortingSearchFactory,
 )
+from tests.test_companies.factories import (
+    CompanyCreateFactory,
+    CompanyReadFactory,
+    CompanySearchFactory,
+)
 
 
 class TestCompanyRouter:
@@ -37,7 +64,29 @@ class TestCompanyRouter:
 
     @pytest.mark.asyncio
     async def test_my_companies(self) -> None:
-        search = OffsetSortingSearchFactory.build().model_dump(by_alias=True)
+        search = CursorSortingSearchFactory.build().model_dump(by_alias=True)
+        actual = await self._client.get(
+            f"{self.ROOT}/my",
+            params=search,
+        )
+
+        self._expected.get_by_user_json.assert_awaited_once_with(
+            clauses=UserCompaniesSearch(
+                user_nickname=self._user.nickname,
+                **search,
+            ),
+            etags=frozenset(),
+        )
+        expected = self._expected.get_by_user_json.return_value
+        assert expected.content == actual.content
+        assert actual.headers["ETag"] == f'"{expected.etag}"'
+
+    @pytest.mark.asyncio
+    async def test_my_companies_pydantic(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("JSON_PAGINATION", "false")
+        search = CursorSortingSearchFactory.build().model_dump(by_alias=True)
         actual = await self._client.get(
             f"{self.ROOT}/my",
             params=search,
@@ -49,6 +98,7 @@ class TestCompanyRouter:
                 **search,
             )
         )
+        self._expected.get_by_user_json.assert_not_awaited()
         assert (
             self._expected.get_by_user.return_value.model_dump(
                 by_alias=True,
@@ -57,6 +107,28 @@ class TestCompanyRouter:
             == actual.json()
         )
 
+    @pytest.mark.asyncio
+    async def test_my_companies_offset(self) -> None:
+        search = OffsetSortingSearchFactory.build().model_dump(by_alias=True)
+        actual = await self._client.get(
+            f"{self.ROOT}/my/offset",
+            params=search,
+        )
+
+        self._expected.get_by_user_offset.assert_awaited_once_with(
+            clauses=UserCompaniesOffsetSearch(
+                user_nickname=self._user.nickname,
+                **search,
+            )
+        )
+        assert (
+            self._expected.get_by_user_offset.return_value.model_dump(
+                by_alias=True,
+                mode="json",
+            )
+            == actual.json()
+        )
+
     @pytest.mark.asyncio
     async def test_all_companies(self) -> None:
         search = CursorSortingSearchFactory.build()
@@ -65,13 +137,188 @@ class TestCompanyRouter:
             params=search.model_dump(by_alias=True),
         )
 
-        self._expected.get_all.assert_awaited_once_with(
-            clauses=search,
+        self._expected.get_all_json.assert_awaited_once_with(
+            clauses=CompaniesSearch(**search.model_dump()),
+            etags=frozenset(),
+        )
+        assert self._expected.get_all_json.return_value.content == (
+            actual.content
+        )
+
+    @pytest.mark.asyncio
+    async def test_all_companies_not_modified(self) -> None:
+        search = CursorSortingSearchFactory.build()
+        etag = uuid4().hex
+        self._expected.get_all_json.return_value = Tagged(etag=etag)
+
+        actual = await self._client.get(
+            f"{self.ROOT}/all",
+            params=search.model_dump(by_alias=True),
+            headers={"If-None-Match": f'W/"{etag}", "{uuid4().hex}"'},
+        )
+
+        assert actual.status_code == status.HTTP_304_NOT_MODIFIED
+        assert actual.headers["ETag"] == f'"{etag}"'
+        assert not actual.content
+        assert etag in self._expected.get_all_json.await_args.kwargs["etags"]
+
+    @pytest.mark.asyncio
+    async def test_export_ndjson(self) -> None:
+        batches = [CompanyReadFactory.batch(2), CompanyReadFactory.batch(1)]
+        self._expected.export.return_value = self._stream(batches)
+
+        actual = await self._client.get(
+            f"{self.ROOT}/export", params={"format": ExportFormat.NDJSON}
+        )
+
+        self._expected.export.assert_called_once_with(
+            fieldset=CompanyFieldset()
+        )
+        assert [
+            company.model_dump(by_alias=True, mode="json")
+            for company in chain.from_iterable(batches)
+        ] == [json.loads(line) for line in actual.text.splitlines()]
+
+    @pytest.mark.asyncio
+    async def test_export_csv(self) -> None:
+        companies = CompanyReadFactory.batch(3)
+        self._expected.export.return_value = self._stream([companies])
+
+        actual = await self._client.get(
+            f"{self.ROOT}/export",
+            params={
+                "format": ExportFormat.CSV,
+                "fields": "name,brn",
+                "include": "",
+            },
+            headers={"Accept-Encoding": "gzip"},
+        )
+
+        assert actual.headers["Content-Type"].startswith("text/csv")
+        assert [
+            {"name": company.name, "brn": company.brn} for company in companies
+        ] == list(csv.DictReader(io.StringIO(actual.text)))
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("format_", tuple(ColumnarFormat))
+    async def test_export_ratios(self, format_: ColumnarFormat) -> None:
+        row = (
+            "7707083893",
+            "Russian Federation",
+            "Sberbank",
+            Decimal("99.12345"),
+            datetime(2025, 1, 1, tzinfo=UTC),
+            "Liquidity",
+            "Current",
+            Decimal("1.5000000000"),
+            "Lower",
+        )
+        empty = (*row[:6], None, None, None)
+        self._expected.export_ratios.return_value = self._stream(
+            [[row, empty], [], [row]]
+        )
+
+        actual = await self._client.get(
+            f"{self.ROOT}/export/ratios", params={"format": format_}
+        )
+
+        table = (
+            pq.read_table(io.BytesIO(actual.content))
+            if format_ == ColumnarFormat.PARQUET
+            else pa.ipc.open_stream(actual.content).read_all()
+        )
+        assert table.schema == get_ratios_arrow_schema()
+        assert [row, empty, row] == [
+            tuple(item.values()) for item in table.to_pylist()
+        ]
+
+    @staticmethod
+    async def _stream[T](batches: list[list[T]]) -> AsyncIterator[list[T]]:
+        for batch in batches:
+            yield batch
+
+    @pytest.mark.asyncio
+    async def test_company_users(self) -> None:
+        company = CompanySearchFactory.build()
+        search = CursorSearchFactory.build().model_dump(by_alias=True)
+        actual = await self._client.get(
+            f"{self.ROOT}/{company.country}/{company.brn}/users",
+            params=search,
+        )
+
+        self._expected.get_users.assert_awaited_once_with(
+            clauses=CompanyUsersSearch(
+                brn=company.brn, country=company.country, **search
+            )
+        )
+        assert (
+            self._expected.get_users.return_value.model_dump(
+                by_alias=True, mode="json"
+            )
+            == actual.json()
+        )
+
+    @pytest.mark.asyncio
+    async def test_company_users_not_found(self) -> None:
+        self._expected.get_users.return_value = None
+        company = CompanySearchFactory.build()
+        actual = await self._client.get(
+            f"{self.ROOT}/{company.country}/{company.brn}/users",
+            params=CursorSearchFactory.build().model_dump(by_alias=True),
+        )
+
+        assert actual.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.asyncio
+    async def test_search_companies(self) -> None:
+        companies = CompanySearchFactory.batch(3)
+        actual = await self._client.post(
+            f"{self.ROOT}/search",
+            json=[
+                company.model_dump(by_alias=True, mode="json")
+                for company in companies
+            ],
+        )
+
+        self._expected.get_many.assert_awaited_once_with(companies=companies)
+        assert [
+            company.model_dump(by_alias=True, mode="json")
+            for company in self._expected.get_many.return_value.values()
+        ] == actual.json()
+
+    @pytest.mark.asyncio
+    async def test_create_companies(self) -> None:
+        companies = CompanyCreateFactory.batch(3)
+        actual = await self._client.post(
+            f"{self.ROOT}/bulk",
+            json=[
+                company.model_dump(by_alias=True, mode="json")
+                for company in companies
+            ],
+        )
+
+        self._expected.create_many.assert_awaited_once_with(
+            companies=[
+                CompanyCreate.model_validate(company) for company in companies
+            ],
         )
         assert (
-            self._expected.get_all.return_value.model_dump(
+            self._expected.create_many.return_value.model_dump(
                 by_alias=True,
                 mode="json",
             )
             == actual.json()
         )
+
+    @pytest.mark.asyncio
+    async def test_create_companies_too_many(self) -> None:
+        company = CompanyCreateFactory.build().model_dump(
+            by_alias=True, mode="json"
+        )
+        actual = await self._client.post(
+            f"{self.ROOT}/bulk",
+            json=[company] * (MAX_BULK_SIZE + 1),
+        )
+
+        self._expected.create_many.assert_not_awaited()
+        assert actual.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
@@ -0,0 +1,115 @@
+# pyright: reportUninitializedInstanceVariable=false
+import asyncio
+from collections.abc import AsyncGenerator
+from http import HTTPMethod
+from time import monotonic, perf_counter
+from unittest.mock import create_autospec
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from httpx import AsyncClient, AsyncHTTPTransport
+
+from src.core.external_api import HTTPXSession, RESTSession
+from src.core.settings import ExternalAPISettings
+from src.core.utils.breakers import CircuitBreaker
+from src.core.utils.limiters import RateLimiter
+
+
+class _StandInServer:
+    """
+    Answers every request with an empty JSON object over keep-alive HTTP/1.1
+    connections, counting them.
+    """
+
+    RESPONSE = (
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: application/json\r\n"
+        b"Content-Length: 2\r\n"
+        b"\r\n"
+        b"{}"
+    )
+
+    def __init__(self) -> None:
+        self.connections = 0
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            # Requests of the benchmark have no body.
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(self.RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+@pytest.mark.benchmark
+class TestHTTPXSessionBenchmark:
+    """
+    Compares the shared client with the former one per request. The stand-in
+    server is plain HTTP, so the gain on real (TLS) APIs is larger.
+    """
+
+    REQUESTS = 500
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> AsyncGenerator[None]:
+        self._client = await container.get(AsyncClient)
+        self._settings = await container.get(ExternalAPISettings)
+        # Only the connections are measured.
+        self._limiter = create_autospec(RateLimiter, instance=True)
+        self._breaker = await container.get(CircuitBreaker[RESTSession])
+        self._server = _StandInServer()
+
+        server = await asyncio.start_server(self._server.handle, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()
+        self._url = f"http://{host}:{port}/"
+        yield
+
+        # The shared client keeps its connection until the container is closed.
+        server.close()
+        server.close_clients()
+        await server.wait_closed()
+
+    async def _request(self, client: AsyncClient) -> None:
+        session = HTTPXSession(
+            _settings=self._settings,
+            _client=client,
+            _limiter=self._limiter,
+            _breaker=self._breaker,
+            _deadline=monotonic() + self._settings.deadline,
+        )
+        await session.request_json(url=self._url, method=HTTPMethod.GET)
+
+    async def _request_shared(self) -> None:
+        await self._request(self._client)
+
+    async def _request_own(self) -> None:
+        async with AsyncClient(
+            transport=AsyncHTTPTransport(retries=self._settings.retries)
+        ) as client:
+            await self._request(client)
+
+    @pytest.mark.asyncio
+    async def test_connection_reuse(self) -> None:
+        for name, request in (
+            ("Client per request", self._request_own),
+            ("Shared client", self._request_shared),
+        ):
+            self._server.connections = 0
+            start = perf_counter()
+            for _ in range(self.REQUESTS):
+                await request()
+            elapsed = (perf_counter() - start) / self.REQUESTS
+
+            print(  # noqa: T201 # Is the result of the benchmark.
+                f"{name}: {elapsed * 1e6:.0f} µs per request, "
+                f"{self._server.connections} connections"
+            )
+
+        assert self._server.connections == 1
@@ -0,0 +1,184 @@
+import asyncio
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, MagicMock, create_autospec
+
+import asyncpg
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import AsyncAdapt_asyncpg_dbapi
+from sqlalchemy.exc import InterfaceError
+
+from src.core.db.sessions import DBSession, SQLAlchemySession, is_conn_error
+from src.core.errors import CircuitOpenError, DBConnError
+from src.core.schemas import CircuitState
+from src.core.settings import BreakerSettings, DBSettings
+from src.core.utils.breakers import CircuitBreaker, WindowCircuitBreaker
+from src.core.utils.loggers import Logger
+
+
+class TestWindowCircuitBreaker:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._settings = await container.get(BreakerSettings)
+        self._logger = await container.get(Logger)
+        self._breaker = self._get_breaker(self._settings)
+        self._func = AsyncMock(side_effect=ConnectionError)
+
+    def _get_breaker(
+        self, settings: BreakerSettings
+    ) -> WindowCircuitBreaker[object]:
+        return WindowCircuitBreaker[object](
+            _settings=settings,
+            _logger=self._logger,
+            _name="the stand-in",
+            _is_failure=lambda exc: isinstance(exc, ConnectionError),
+        )
+
+    async def _fail(
+        self, breaker: WindowCircuitBreaker[object], calls: int
+    ) -> None:
+        for _ in range(calls):
+            with pytest.raises(ConnectionError):
+                await breaker.run(self._func)
+
+    @pytest.mark.asyncio
+    async def test_run_opens(self) -> None:
+        await self._fail(self._breaker, self._settings.min_calls)
+
+        with pytest.raises(CircuitOpenError):
+            await self._breaker.run(self._func)
+        assert self._func.await_count == self._settings.min_calls
+        assert self._breaker.state == CircuitState.OPEN
+        assert self._breaker.stats["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_run_below_rate(self) -> None:
+        self._func.side_effect = None
+        for _ in range(self._settings.min_calls):
+            await self._breaker.run(self._func)
+
+        self._func.side_effect = ConnectionError
+        await self._fail(self._breaker, self._settings.min_calls - 1)
+
+        assert self._breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_run_other_errors(self) -> None:
+        self._func.side_effect = ValueError
+
+        for _ in range(self._settings.min_calls * 2):
+            with pytest.raises(ValueError):  # noqa: PT011
+                await self._breaker.run(self._func)
+
+        assert self._breaker.state == CircuitState.CLOSED
+        assert not self._breaker.stats["failures"]
+
+    @pytest.mark.asyncio
+    async def test_run_trial_closes(self) -> None:
+        breaker = self._get_breaker(
+            self._settings.model_copy(update={"open_time": 0})
+        )
+        await self._fail(breaker, self._settings.min_calls)
+
+        self._func.side_effect = None
+        await breaker.run(self._func)
+
+        assert breaker.state == CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_run_trial_reopens(self) -> None:
+        breaker = self._get_breaker(
+            self._settings.model_copy(update={"open_time": 0})
+        )
+        await self._fail(breaker, self._settings.min_calls + 1)
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.stats["opened"] == 2  # noqa: PLR2004
+
+    @pytest.mark.asyncio
+    async def test_run_late(self) -> None:
+        breaker = self._get_breaker(
+            self._settings.model_copy(update={"open_time": 0})
+        )
+        is_released = asyncio.Event()
+
+        async def call(*, is_failed: bool) -> None:
+            await is_released.wait()
+            if is_failed:
+                raise ConnectionError
+
+        late = asyncio.create_task(breaker.run(call, is_failed=True))
+        await asyncio.sleep(0)
+        await self._fail(breaker, self._settings.min_calls)
+        trial = asyncio.create_task(breaker.run(call, is_failed=False))
+        await asyncio.sleep(0)
+
+        is_released.set()
+        with pytest.raises(ConnectionError):
+            await late
+        await trial
+
+        # The late failure has neither reopened the breaker nor been counted.
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.stats["late"] == 1
+
+
+class TestIsConnError:
+    def test_wrapped(self) -> None:
+        adapted = AsyncAdapt_asyncpg_dbapi.InterfaceError("Closed.")
+        adapted.__cause__ = asyncpg.ConnectionDoesNotExistError()
+
+        assert is_conn_error(InterfaceError(None, None, adapted))
+        assert not is_conn_error(
+            InterfaceError(
+                None, None, AsyncAdapt_asyncpg_dbapi.InterfaceError("Bad.")
+            )
+        )
+
+
+class TestSQLAlchemySession:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._settings = await container.get(DBSettings)
+        self._breaker = WindowCircuitBreaker[DBSession](
+            _settings=await container.get(BreakerSettings),
+            _logger=await container.get(Logger),
+            _name="the DB",
+            _is_failure=is_conn_error,
+        )
+
+    @pytest.mark.asyncio
+    async def test_rollback_circuit_open(self) -> None:
+        breaker = create_autospec(CircuitBreaker, instance=True)
+        breaker.run.side_effect = CircuitOpenError("the DB")
+        session = SQLAlchemySession(self._settings, breaker)
+
+        with pytest.raises(DBConnError):
+            await session.flush()
+        calls = breaker.run.await_count
+        # The connection is still released.
+        await session.rollback()
+
+        assert breaker.run.await_count == calls
+
+    @pytest.mark.asyncio
+    async def test_stream_partitions_failed(self) -> None:
+        expected = MagicMock()
+
+        async def partitions() -> AsyncIterator[MagicMock]:
+            yield expected
+            raise asyncpg.ConnectionDoesNotExistError
+
+        result = MagicMock()
+        result.partitions.return_value = partitions()
+        session = SQLAlchemySession(self._settings, self._breaker)
+        session.stream = AsyncMock(return_value=result)  # type: ignore[method-assign] # Stands in for the DB.
+        actual = session.stream_partitions(select(1))
+
+        assert await anext(actual) is expected
+        # Fails while the cursor is fetched rather than when it is opened.
+        with pytest.raises(DBConnError):
+            await anext(actual)
+        assert self._breaker.stats["failures"] == 1
@@ -0,0 +1,238 @@
+# mypy: disable-error-code="attr-defined"
+# pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
+# Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
+
+import asyncio
+import zlib
+from http import HTTPMethod, HTTPStatus
+from time import monotonic, time
+from typing import Any
+from unittest.mock import ANY, AsyncMock, MagicMock, create_autospec
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from httpx import AsyncClient, ConnectError, Response
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.core.errors import ExternalAPIConnError
+from src.core.external_api import (
+    CONN_ERRORS,
+    HTTPXSession,
+    RedisResponseCache,
+    RESTSession,
+)
+from src.core.schemas import CircuitState, Priority
+from src.core.settings import (
+    BreakerSettings,
+    ExternalAPISettings,
+    ResponseCacheSettings,
+)
+from src.core.utils.breakers import WindowCircuitBreaker
+from src.core.utils.limiters import RateLimiter
+from src.core.utils.loggers import Logger
+
+
+class TestHTTPXSession:
+    URL = "https://api-fns.ru/api/egr"
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._settings = await container.get(ExternalAPISettings)
+        self._client = create_autospec(AsyncClient, instance=True)
+        self._limiter = create_autospec(RateLimiter, instance=True)
+        self._breaker_settings = await container.get(BreakerSettings)
+        self._breaker = WindowCircuitBreaker[RESTSession](
+            _settings=self._breaker_settings,
+            _logger=await container.get(Logger),
+            _name="the external API",
+            _is_failure=lambda exc: isinstance(exc, CONN_ERRORS),
+        )
+
+    def _get_session(self, remaining: float) -> HTTPXSession:
+        return HTTPXSession(
+            _settings=self._settings,
+            _client=self._client,
+            _limiter=self._limiter,
+            _breaker=self._breaker,
+            _deadline=monotonic() + remaining,
+        )
+
+    @pytest.mark.asyncio
+    async def test_request_bounded(self) -> None:
+        remaining = self._settings.timeout / 2
+
+        await self._get_session(remaining).request(HTTPMethod.GET, self.URL)
+
+        self._client.request.assert_awaited_once_with(
+            HTTPMethod.GET, self.URL, timeout=ANY
+        )
+        assert self._client.request.call_args.kwargs["timeout"] <= remaining
+
+    @pytest.mark.asyncio
+    async def test_request_deadline_exceeded(self) -> None:
+        with pytest.raises(ExternalAPIConnError):
+            await self._get_session(0).request(HTTPMethod.GET, self.URL)
+        self._client.request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_request_deadline_exceeded_waiting(self) -> None:
+        remaining = 0.05
+
+        async def acquire(*_: Any) -> None:
+            await asyncio.sleep(remaining)
+
+        self._limiter.acquire.side_effect = acquire
+
+        with pytest.raises(ExternalAPIConnError):
+            await self._get_session(remaining).request(HTTPMethod.GET, self.URL)
+        self._client.request.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_request_circuit_open(self) -> None:
+        self._client.request.side_effect = ConnectError("Refused.")
+        session = self._get_session(self._settings.deadline)
+        calls = self._breaker_settings.min_calls
+
+        for _ in range(calls + 1):
+            with pytest.raises(ExternalAPIConnError):
+                await session.request(HTTPMethod.GET, self.URL)
+
+        # The last call has failed at once.
+        assert self._client.request.await_count == calls
+        assert self._breaker.state == CircuitState.OPEN
+
+
+class TestRedisResponseCache:
+    URL = "https://api-fns.ru/api/egr?req=1027700132195"
+    BODY = b'{"items":[]}'
+    ETAG = '"1"'
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._redis = create_autospec(Redis, instance=True)
+        self._pipeline = MagicMock()
+        self._redis.pipeline.return_value = self._pipeline
+        for method in ("delete", "hset", "expire"):
+            getattr(self._pipeline, method).return_value = self._pipeline
+        self._pipeline.execute = AsyncMock()
+        # Commands are not coroutine functions, but return awaitables.
+        self._redis.hgetall = AsyncMock(return_value={})
+        self._redis.set = AsyncMock(return_value=True)
+        self._redis.delete = AsyncMock()
+
+        self._fetch = AsyncMock(
+            return_value=Response(
+                HTTPStatus.OK, content=self.BODY, headers={"ETag": self.ETAG}
+            )
+        )
+        self._cache = RedisResponseCache(
+            _redis=self._redis,
+            _settings=await container.get(ResponseCacheSettings),
+            _logger=await container.get(Logger),
+        )
+
+    def _cache_body(self, fresh_until: float) -> None:
+        self._redis.hgetall.return_value = {
+            b"body": zlib.compress(self.BODY),
+            b"fresh_until": str(fresh_until).encode(),
+            b"etag": self.ETAG.encode(),
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_miss(self) -> None:
+        actual = await self._cache.get_or_fetch(self.URL, self._fetch)
+
+        self._fetch.assert_awaited_once_with({}, Priority.INTERACTIVE)
+        mapping = self._pipeline.hset.call_args.kwargs["mapping"]
+        assert self.BODY == actual == zlib.decompress(mapping["body"])
+        assert mapping["etag"] == self.ETAG
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_hit(self) -> None:
+        self._cache_body(time() + 60)
+
+        actual = await self._cache.get_or_fetch(self.URL, self._fetch)
+
+        self._fetch.assert_not_awaited()
+        assert actual == self.BODY
+        assert dict(self._cache.stats) == {"hits": 1}
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_stale(self) -> None:
+        self._cache_body(time() - 60)
+        self._fetch.return_value = Response(HTTPStatus.NOT_MODIFIED)
+
+        actual = await self._cache.get_or_fetch(self.URL, self._fetch)
+        # Lets the refresh run in the background.
+        await asyncio.sleep(0)
+
+        assert actual == self.BODY
+        self._fetch.assert_awaited_once_with(
+            {"If-None-Match": self.ETAG}, Priority.BACKGROUND
+        )
+        self._pipeline.hset.assert_called_once_with(ANY, "fresh_until", ANY)
+        assert dict(self._cache.stats) == {"stale_hits": 1, "revalidations": 1}
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_stale_locked(self) -> None:
+        self._cache_body(time() - 60)
+        self._redis.set.return_value = None
+
+        for _ in range(2):
+            assert (
+                await self._cache.get_or_fetch(self.URL, self._fetch)
+                == self.BODY
+            )
+        await asyncio.sleep(0)
+
+        self._redis.set.assert_awaited_once()
+        self._fetch.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_unavailable(self) -> None:
+        self._redis.hgetall.side_effect = RedisError
+        self._pipeline.execute.side_effect = RedisError
+
+        assert (
+            await self._cache.get_or_fetch(self.URL, self._fetch) == self.BODY
+        )
+        self._fetch.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_concurrent(self) -> None:
+        response: Response = self._fetch.return_value
+
+        async def fetch(*_: object) -> Response:
+            await asyncio.sleep(0.1)
+            return response
+
+        self._fetch.side_effect = fetch
+        size = 5
+
+        actual = await asyncio.gather(
+            *(
+                self._cache.get_or_fetch(self.URL, self._fetch)
+                for _ in range(size)
+            )
+        )
+
+        self._fetch.assert_awaited_once()
+        assert actual == [self.BODY] * size
+        assert self._cache.stats["coalesced"] == size - 1
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_other_worker(self) -> None:
+        self._redis.set.return_value = None
+        self._cache_body(time() + 60)
+        self._redis.hgetall.side_effect = [
+            {},
+            self._redis.hgetall.return_value,
+        ]
+
+        actual = await self._cache.get_or_fetch(self.URL, self._fetch)
+
+        self._fetch.assert_not_awaited()
+        assert actual == self.BODY
+        assert self._cache.stats["remote_coalesced"] == 1
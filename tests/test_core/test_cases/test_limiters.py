@@ -0,0 +1,110 @@
+# mypy: disable-error-code="attr-defined"
+# pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
+# Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
+
+from time import monotonic
+from unittest.mock import AsyncMock
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from redis.exceptions import RedisError
+
+from src.core.errors import ExternalAPIConnError
+from src.core.schemas import Priority
+from src.core.settings import RateLimitSettings
+from src.core.utils.limiters import RedisRateLimiter
+
+
+class TestRedisRateLimiter:
+    KEY = "api-fns.ru"
+    REQUEST_TIME = 0.1
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._settings = await container.get(RateLimitSettings)
+        self._script = AsyncMock(return_value=[1, b"0"])
+        self._limiter = RedisRateLimiter(
+            _script=self._script,
+            _settings=self._settings,
+            _request_time=self.REQUEST_TIME,
+        )
+        self._deadline = monotonic() + 1
+
+    def _get_level(self) -> float:
+        return float(self._script.call_args.kwargs["args"][2])
+
+    @pytest.mark.asyncio
+    async def test_acquire_interactive(self) -> None:
+        await self._limiter.acquire(
+            self.KEY, Priority.INTERACTIVE, self._deadline
+        )
+
+        self._script.assert_awaited_once()
+        # A future token may be reserved until the deadline, except for the
+        # time of the request itself.
+        assert (
+            -self._settings.rate * (1 - self.REQUEST_TIME)
+            <= self._get_level()
+            < 0
+        )
+        assert self._limiter.stats["acquired"] == 1
+
+    @pytest.mark.asyncio
+    async def test_acquire_interactive_late(self) -> None:
+        self._script.return_value = [0, b"2"]
+
+        with pytest.raises(ExternalAPIConnError):
+            await self._limiter.acquire(
+                self.KEY, Priority.INTERACTIVE, self._deadline
+            )
+        self._script.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_acquire_no_time_left(self) -> None:
+        with pytest.raises(ExternalAPIConnError):
+            await self._limiter.acquire(
+                self.KEY,
+                Priority.INTERACTIVE,
+                monotonic() + self.REQUEST_TIME / 2,
+            )
+        # No token is taken.
+        self._script.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_acquire_background(self) -> None:
+        results = [[0, b"0.01"], [1, b"0"]]
+        self._script.side_effect = results
+
+        await self._limiter.acquire(
+            self.KEY, Priority.BACKGROUND, self._deadline
+        )
+
+        assert self._script.await_count == len(results)
+        assert self._get_level() == (
+            self._settings.burst * self._settings.reserve
+        )
+
+    @pytest.mark.asyncio
+    async def test_acquire_queue_full(self) -> None:
+        limiter = RedisRateLimiter(
+            _script=self._script,
+            _settings=self._settings.model_copy(update={"queue_size": 0}),
+            _request_time=self.REQUEST_TIME,
+        )
+
+        with pytest.raises(ExternalAPIConnError):
+            await limiter.acquire(
+                self.KEY, Priority.INTERACTIVE, self._deadline
+            )
+        self._script.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_acquire_unavailable(self) -> None:
+        self._script.side_effect = RedisError
+
+        await self._limiter.acquire(
+            self.KEY, Priority.INTERACTIVE, self._deadline
+        )
+
+        assert self._limiter.stats["unlimited"] == 1
@@ -0,0 +1,48 @@
+import asyncio
+from unittest.mock import create_autospec
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+
+from src.core.settings import StatsSettings
+from src.core.utils.executors import Executor
+from src.core.utils.loggers import Logger
+from src.core.utils.reporters import LoggingStatsReporter
+
+
+class TestLoggingStatsReporter:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._settings = await container.get(StatsSettings)
+        self._logger = create_autospec(Logger, instance=True)
+        self._executor = await container.get(Executor)
+
+    def _get_reporter(self, interval: float) -> LoggingStatsReporter:
+        return LoggingStatsReporter(
+            _settings=self._settings.model_copy(update={"interval": interval}),
+            _logger=self._logger,
+            _sources={"the executor": self._executor},
+        )
+
+    @pytest.mark.asyncio
+    async def test_start(self) -> None:
+        reporter = self._get_reporter(0.01)
+
+        await reporter.start()
+        await asyncio.sleep(0.05)
+        await reporter.stop()
+
+        self._logger.info.assert_called_with(
+            "Stats of %s: %s.", "the executor", dict(self._executor.stats)
+        )
+
+    @pytest.mark.asyncio
+    async def test_start_disabled(self) -> None:
+        reporter = self._get_reporter(0)
+
+        await reporter.start()
+        await asyncio.sleep(0.05)
+        await reporter.stop()
+
+        self._logger.info.assert_not_called()
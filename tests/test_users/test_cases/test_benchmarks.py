@@ -0,0 +1,139 @@
+# mypy: disable-error-code="attr-defined"
+# pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
+# Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
+
+import subprocess
+import sys
+from time import perf_counter
+from unittest.mock import create_autospec
+
+import pytest
+import pytest_asyncio
+from fastapi import status
+from httpx import AsyncClient
+
+from src.core.asgi import Architecture, ExtendedFastAPI
+from src.core.schemas import OrderBy
+from src.core.settings import DocsSettings
+from src.users.db.models import SQLAlchemyUser
+from src.users.deps import get_authenticated, get_fastapi_users
+from src.users.service import UserManager
+from src.users.utils.strategies import CachedRedisStrategy
+from tests.test_users.factories import SQLAlchemyUserFactory
+
+
+@pytest.mark.benchmark
+class TestAuthBenchmark:
+    """
+    Measures the fixed cost of authentication itself, so Redis and the DB are
+    stubbed out.
+    """
+
+    URL = (
+        f"/{Architecture.JSON_API}/"
+        f"{DocsSettings.load().version.major}/companies/my"
+    )
+    REQUESTS = 500
+    ROUNDS = 5
+
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, app: ExtendedFastAPI, client: AsyncClient) -> None:
+        self._app = app
+        self._client = client
+        self._user = SQLAlchemyUserFactory.build(
+            is_active=True, is_verified=True
+        )
+
+        strategy = create_autospec(CachedRedisStrategy, instance=True)
+        strategy.read_token.return_value = self._user
+        user_manager = create_autospec(UserManager, instance=True)
+
+        fastapi_users = get_fastapi_users()
+        (backend,) = fastapi_users.authenticator.backends
+        self._overrides = {
+            backend.get_strategy: lambda: strategy,
+            fastapi_users.get_user_manager: lambda: user_manager,
+        }
+
+    async def _measure(self) -> float:
+        elapsed = float("inf")
+        for _ in range(self.ROUNDS):
+            start = perf_counter()
+            for _ in range(self.REQUESTS):
+                response = await self._client.get(
+                    self.URL,
+                    params={"size": 1, "orderBy": OrderBy.DESC},
+                    headers={"Authorization": "Bearer token"},
+                )
+            elapsed = min(elapsed, perf_counter() - start)
+            assert response.status_code == status.HTTP_200_OK
+
+        return elapsed / self.REQUESTS
+
+    @pytest.mark.asyncio
+    async def test_authenticated(self) -> None:
+        async def get_authenticated_override() -> SQLAlchemyUser:
+            return self._user
+
+        self._app.dependency_overrides[get_authenticated()] = (
+            get_authenticated_override
+        )
+        unauthenticated = await self._measure()
+
+        self._app.dependency_overrides.clear()
+        self._app.dependency_overrides.update(self._overrides)
+        authenticated = await self._measure()
+        self._app.dependency_overrides.clear()
+
+        start = perf_counter()
+        for _ in range(self.REQUESTS):
+            get_fastapi_users().current_user(active=True, verified=True)
+        built = (perf_counter() - start) / self.REQUESTS
+
+        print(  # noqa: T201 # Is the result of the benchmark.
+            f"Overhead: {(authenticated - unauthenticated) * 1e6:.0f} µs, "
+            f"building the dependency: {built * 1e6:.0f} µs per request"
+        )
+
+
+@pytest.mark.benchmark
+class TestZXCVBNBenchmark:
+    """
+    Measures a fresh worker, since the dictionaries stay loaded once imported.
+    """
+
+    # The resident set size of the process (in pages) is Linux-specific.
+    STARTUP = """
+import os
+from pathlib import Path
+from time import perf_counter
+
+start = perf_counter()
+from src.main import get_app
+
+get_app()
+{code}
+pages = int(Path("/proc/self/statm").read_text().split()[1])
+print(perf_counter() - start, pages * os.sysconf("SC_PAGE_SIZE"))
+"""
+    VALIDATION = """
+from src.users.utils.password_validators import ZXCVBNValidator
+
+ZXCVBNValidator().validate("password")
+"""
+
+    def _start(self, code: str = "") -> tuple[float, float]:
+        result = subprocess.run(  # noqa: S603 # The input is trusted.
+            (sys.executable, "-c", self.STARTUP.format(code=code)),
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        elapsed, rss = result.stdout.split()
+
+        return float(elapsed), int(rss) / 2**20
+
+    def test_startup(self) -> None:
+        for name, code in (("Startup", ""), ("Validation", self.VALIDATION)):
+            elapsed, rss = self._start(code)
+            print(f"{name}: {elapsed * 1000:.0f} ms, {rss:.1f} MB")  # noqa: T201 # Is the result of the benchmark.
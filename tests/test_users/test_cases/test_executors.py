@@ -0,0 +1,69 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.utils.executors import PoolExecutor
+
+
+class TestPoolExecutor:
+    CONCURRENCY = 2
+
+    @pytest.mark.asyncio
+    async def test_run_admits(self) -> None:
+        size = self.CONCURRENCY * 3
+        is_released = threading.Event()
+
+        with ThreadPoolExecutor(size) as pool:
+            executor = PoolExecutor(
+                _pool=pool, _semaphore=asyncio.Semaphore(self.CONCURRENCY)
+            )
+            tasks = [
+                asyncio.create_task(executor.run(is_released.wait))
+                for _ in range(size)
+            ]
+            # Lets every task reach the pool or the queue.
+            await asyncio.sleep(0)
+
+            assert {
+                "waiting": size - self.CONCURRENCY,
+                "running": self.CONCURRENCY,
+            } == dict(executor.stats)
+
+            is_released.set()
+            await asyncio.gather(*tasks)
+
+        assert {
+            "waiting": 0,
+            "running": 0,
+            "completed": size,
+        } == dict(executor.stats)
+
+    @pytest.mark.asyncio
+    async def test_run_cancelled(self) -> None:
+        is_released = threading.Event()
+
+        with ThreadPoolExecutor(self.CONCURRENCY * 2) as pool:
+            executor = PoolExecutor(
+                _pool=pool, _semaphore=asyncio.Semaphore(self.CONCURRENCY)
+            )
+            tasks = [
+                asyncio.create_task(executor.run(is_released.wait))
+                for _ in range(self.CONCURRENCY)
+            ]
+            await asyncio.sleep(0)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # The cancelled tasks still occupy the pool.
+            waiting = asyncio.create_task(executor.run(is_released.wait))
+            await asyncio.sleep(0)
+            try:
+                assert executor.stats["waiting"] == 1
+            finally:
+                is_released.set()
+            await waiting
+
+        assert executor.stats["completed"] == self.CONCURRENCY + 1
@@ -0,0 +1,149 @@
+# mypy: disable-error-code="attr-defined"
+# pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
+# Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
+
+from typing import Any
+from unittest.mock import create_autospec
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from fastapi import Request
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi_users import BaseUserManager
+from fastapi_users.db import BaseUserDatabase
+from fastapi_users.jwt import generate_jwt
+from fastapi_users.password import PasswordHelperProtocol
+
+from src.core.settings import AuthSettings
+from src.core.utils.executors import Executor
+from src.users.errors import AuthenticationError
+from src.users.schemas import UserCreate
+from src.users.service import UserManager
+from src.users.utils.password_validators import PasswordValidator
+from src.users.utils.strategies import UserInvalidator
+from tests.test_users.factories import SQLAlchemyUserFactory
+
+
+class TestUserManager:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._user_db = create_autospec(BaseUserDatabase, instance=True)
+        self._invalidator = create_autospec(UserInvalidator, instance=True)
+        self._executor = create_autospec(Executor, instance=True)
+        self._executor.run.side_effect = self._run
+        self._password_helper = create_autospec(
+            PasswordHelperProtocol, instance=True
+        )
+        self._password_helper.hash.return_value = "hashed"
+        self._user_manager = UserManager(
+            self._user_db,
+            await container.get(AuthSettings),
+            create_autospec(PasswordValidator, instance=True),
+            self._invalidator,
+            self._executor,
+            self._password_helper,
+        )
+
+    @staticmethod
+    async def _run(func: Any, *args: Any, **kwargs: Any) -> Any:
+        return func(*args, **kwargs)
+
+    @pytest.mark.asyncio
+    async def test_create_follows_lib(self) -> None:
+        user_create = UserCreate(
+            nickname="Ivan Ivanov",
+            email="ivanov@mail.ru",
+            password=uuid4().hex,
+        )
+        self._user_db.get_by_email.return_value = None
+
+        for create in (BaseUserManager.create, UserManager.create):
+            await create(
+                self._user_manager,
+                user_create,
+                safe=True,
+                request=create_autospec(Request, instance=True),
+            )
+
+        # The lib is followed, except for hashing in the executor.
+        expected, actual = self._user_db.create.await_args_list
+        assert expected == actual
+        self._executor.run.assert_any_await(
+            self._password_helper.hash, user_create.password
+        )
+
+    @pytest.mark.asyncio
+    async def test_authenticate_follows_lib(self) -> None:
+        user = SQLAlchemyUserFactory.build(
+            id=1, is_active=True, is_verified=True
+        )
+        self._user_db.get_by_email.return_value = user
+        self._password_helper.verify_and_update.return_value = (True, "new")
+        credentials = OAuth2PasswordRequestForm(
+            username=user.email, password=uuid4().hex
+        )
+
+        for authenticate in (
+            BaseUserManager.authenticate,
+            UserManager.authenticate,
+        ):
+            assert await authenticate(self._user_manager, credentials) == user
+
+        expected, actual = self._user_db.update.await_args_list
+        assert expected == actual
+        self._executor.run.assert_awaited_once_with(
+            self._password_helper.verify_and_update,
+            credentials.password,
+            user.hashed_password,
+        )
+
+    @pytest.mark.asyncio
+    async def test_authenticate_not_found_follows_lib(self) -> None:
+        self._user_db.get_by_email.return_value = None
+        credentials = OAuth2PasswordRequestForm(
+            username="ivanov@mail.ru", password=uuid4().hex
+        )
+
+        assert (
+            await BaseUserManager.authenticate(self._user_manager, credentials)
+            is None
+        )
+        with pytest.raises(AuthenticationError):
+            await self._user_manager.authenticate(credentials)
+
+        # Both take as much time as for an existing user.
+        assert self._password_helper.hash.call_count == 2  # noqa: PLR2004
+        self._executor.run.assert_awaited_once_with(
+            self._password_helper.hash, credentials.password
+        )
+
+    @pytest.mark.asyncio
+    async def test_verify_invalidates(self) -> None:
+        user = SQLAlchemyUserFactory.build(id=1, is_verified=False)
+        verified = SQLAlchemyUserFactory.build(id=1, is_verified=True)
+        self._user_db.get_by_email.return_value = user
+        self._user_db.update.return_value = verified
+        token = generate_jwt(
+            {
+                "sub": str(user.id),
+                "email": user.email,
+                "aud": self._user_manager.verification_token_audience,
+            },
+            self._user_manager.verification_token_secret,
+        )
+
+        await self._user_manager.verify(token)
+
+        # Cached copies would be rejected as unverified otherwise.
+        self._invalidator.invalidate.assert_awaited_once_with(verified)
+
+    @pytest.mark.asyncio
+    async def test_delete_invalidates(self) -> None:
+        user = SQLAlchemyUserFactory.build(id=1)
+
+        await self._user_manager.delete(user)
+
+        self._user_db.delete.assert_awaited_once_with(user)
+        self._invalidator.invalidate.assert_awaited_once_with(user)
@@ -0,0 +1,174 @@
+# mypy: disable-error-code="attr-defined"
+# pyright: reportAttributeAccessIssue=false, reportUninitializedInstanceVariable=false
+# Mocks are not supported: https://github.com/python/mypy/issues/1188, https://github.com/microsoft/pyright/discussions/5311.
+
+from unittest.mock import AsyncMock, MagicMock, create_autospec
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from dishka import AsyncContainer
+from redis.asyncio import Redis
+
+from src.core.settings import AuthSettings, UserCacheSettings
+from src.core.utils.loggers import Logger
+from src.users.schemas import CachedUser
+from src.users.service import UserManager
+from src.users.utils.strategies import CachedRedisStrategy, StatelessStrategy
+from tests.test_users.factories import SQLAlchemyUserFactory
+
+
+class TestCachedRedisStrategy:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._redis = create_autospec(Redis, instance=True)
+        self._pipeline = MagicMock()
+        self._redis.pipeline.return_value = self._pipeline
+        for method in ("get", "set", "sadd", "expire", "delete", "srem"):
+            getattr(self._pipeline, method).return_value = self._pipeline
+        self._pipeline.execute = AsyncMock()
+        # Commands are not coroutine functions, but return awaitables.
+        self._redis.smembers = AsyncMock()
+        self._redis.delete = AsyncMock()
+
+        self._user = SQLAlchemyUserFactory.build(id=1)
+        self._user_manager = create_autospec(UserManager, instance=True)
+        self._user_manager.get.return_value = self._user
+
+        self._strategy = CachedRedisStrategy(
+            self._redis, await container.get(UserCacheSettings)
+        )
+        self._token = uuid4().hex
+
+    @pytest.mark.asyncio
+    async def test_read_token_local(self) -> None:
+        self._pipeline.execute.return_value = [b"1", None]
+
+        first = await self._strategy.read_token(self._token, self._user_manager)
+        second = await self._strategy.read_token(
+            self._token, self._user_manager
+        )
+
+        self._user_manager.get.assert_awaited_once()
+        assert self._user == first
+        assert (
+            CachedUser.model_validate(self._user).model_copy(
+                update={"hashed_password": ""}
+            )
+            == second
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_token_without_hash(self) -> None:
+        self._pipeline.execute.return_value = [b"1", None]
+
+        await self._strategy.read_token(self._token, self._user_manager)
+
+        cached = self._pipeline.set.call_args.args[1]
+        assert self._user.hashed_password.encode() not in cached
+        assert b"hashed_password" not in cached
+
+    @pytest.mark.asyncio
+    async def test_read_token_remote(self) -> None:
+        expected = CachedUser.model_validate(self._user)
+        self._pipeline.execute.return_value = [
+            b"1",
+            expected.model_dump_json().encode(),
+        ]
+
+        actual = await self._strategy.read_token(
+            self._token, self._user_manager
+        )
+
+        self._user_manager.get.assert_not_awaited()
+        assert expected.model_copy(update={"hashed_password": ""}) == actual
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self) -> None:
+        self._pipeline.execute.return_value = [b"1", None]
+        self._redis.smembers.return_value = {self._token.encode()}
+        rounds = 2
+
+        for _ in range(rounds):
+            await self._strategy.read_token(self._token, self._user_manager)
+            await self._strategy.invalidate(self._user)
+
+        self._redis.delete.assert_awaited_with(
+            f"fastapi_users_tokens:{self._user.id}",
+            f"fastapi_users_user:{self._token}",
+        )
+        assert self._user_manager.get.await_count == rounds
+
+
+class TestStatelessStrategy:
+    @pytest_asyncio.fixture(autouse=True)
+    async def _setup(self, container: AsyncContainer) -> None:
+        self._redis = create_autospec(Redis, instance=True)
+        self._pipeline = MagicMock()
+        self._redis.pipeline.return_value = self._pipeline
+        for method in ("zremrangebyscore", "zadd", "publish"):
+            getattr(self._pipeline, method).return_value = self._pipeline
+        self._pipeline.execute = AsyncMock()
+        self._redis.set = AsyncMock()
+        self._redis.get = AsyncMock(return_value=b"1")
+        self._redis.delete = AsyncMock()
+
+        self._user = SQLAlchemyUserFactory.build(
+            id=1, is_active=True, is_verified=True
+        )
+        self._user_manager = create_autospec(UserManager, instance=True)
+        self._user_manager.get.return_value = self._user
+
+        settings = await container.get(AuthSettings)
+        self._strategy = StatelessStrategy(
+            self._redis,
+            settings.model_copy(
+                update={"is_stateless": True, "access_token_secret": "secret"}
+            ),
+            await container.get(Logger),
+        )
+
+    @pytest.mark.asyncio
+    async def test_read_token(self) -> None:
+        token = await self._strategy.write_token(self._user)
+
+        actual = await self._strategy.read_token(token, self._user_manager)
+
+        self._user_manager.get.assert_not_awaited()
+        assert (
+            CachedUser.model_validate(self._user).model_copy(
+                update={"hashed_password": ""}
+            )
+            == actual
+        )
+
+    @pytest.mark.asyncio
+    async def test_destroy_token(self) -> None:
+        token = await self._strategy.write_token(self._user)
+
+        await self._strategy.destroy_token(token, self._user)
+
+        self._pipeline.publish.assert_called_once()
+        assert (
+            await self._strategy.read_token(token, self._user_manager) is None
+        )
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self) -> None:
+        token = await self._strategy.write_token(self._user)
+
+        await self._strategy.invalidate(self._user)
+        refreshed = await self._strategy.refresh(token, self._user_manager)
+
+        assert (
+            await self._strategy.read_token(token, self._user_manager) is None
+        )
+        assert refreshed is not None
+        assert await self._strategy.read_token(refreshed, self._user_manager)
+
+    @pytest.mark.asyncio
+    async def test_refresh_ended(self) -> None:
+        token = await self._strategy.write_token(self._user)
+        self._redis.get.return_value = None
+
+        assert await self._strategy.refresh(token, self._user_manager) is None